@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Time    : 2026/10/18
+@File    : action_node_fill_benchmark.py
+@Desc    : Compare the wall-clock time of filling the PRD and design nodes child by child (`complex`) and concurrently
+    (`parallel`), with a local LLM answering with the format example after a fixed latency.
+"""
+
+import asyncio
+import copy
+import time
+
+from metagpt.actions.action_node import ActionNode
+from metagpt.actions.design_api_an import DESIGN_API_NODE
+from metagpt.actions.write_prd_an import WRITE_PRD_NODE
+from metagpt.logs import logger
+
+
+class LatencyLLM:
+    """Answer with the format example of the prompt after `latency` seconds, as a remote LLM would"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def aask(self, msg, system_msgs=None, images=None, timeout=None):
+        await asyncio.sleep(self.latency)
+        return msg.split("## format example\n")[1].split("\n\n## nodes")[0]
+
+
+async def measure(root: ActionNode, strgy: str, latency: float, max_concurrency: int) -> float:
+    node = copy.deepcopy(root)
+    start = time.perf_counter()
+    await node.fill(context="Create a 2048 game", llm=LatencyLLM(latency), strgy=strgy, max_concurrency=max_concurrency)
+    return time.perf_counter() - start
+
+
+async def main(latency: float = 0.5, max_concurrency: int = 4):
+    for name, root in {"WritePRD": WRITE_PRD_NODE, "WriteDesign": DESIGN_API_NODE}.items():
+        complex_ = await measure(root, "complex", latency, max_concurrency)
+        parallel = await measure(root, "parallel", latency, max_concurrency)
+        logger.info(
+            f"{name}: {len(root.children)} children, complex {complex_:.2f}s, "
+            f"parallel {parallel:.2f}s ({complex_ / parallel:.1f}x) at {latency}s per LLM call"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : offline benchmark of the fusions of SimpleHybridRetriever over FAISS+BM25, with a local fake embedding
+
+import asyncio
+import string
+import time
+import zlib
+
+import faiss
+import numpy as np
+from llama_index.core import StorageContext, VectorStoreIndex
+from llama_index.core.embeddings import BaseEmbedding
+from llama_index.core.schema import TextNode
+from llama_index.vector_stores.faiss import FaissVectorStore
+
+from metagpt.logs import logger
+from metagpt.rag.factories import get_retriever
+from metagpt.rag.retrievers import SimpleHybridRetriever
+from metagpt.rag.retrievers.fusion import fuse
+from metagpt.rag.schema import (
+    BM25RetrieverConfig,
+    DedupFusionConfig,
+    FAISSRetrieverConfig,
+    RRFFusionConfig,
+    WeightedFusionConfig,
+)
+
+DIMENSIONS = 256
+
+
+class TrigramEmbedding(BaseEmbedding):
+    """A local embedding hashing the character trigrams of the text, close for texts with typos."""
+
+    def _embed(self, text: str) -> list[float]:
+        vector = np.zeros(DIMENSIONS, dtype=np.float32)
+        for word in text.lower().split():
+            word = f"#{word}#"
+            for i in range(len(word) - 2):
+                vector[zlib.crc32(word[i : i + 3].encode()) % DIMENSIONS] += 1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def _get_query_embedding(self, query: str) -> list[float]:
+        return self._embed(query)
+
+    async def _aget_query_embedding(self, query: str) -> list[float]:
+        return self._embed(query)
+
+    def _get_text_embedding(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+def synthetic_corpus(count: int, vocabulary: int = 2000, words: int = 12) -> tuple[list[TextNode], list[str]]:
+    """Documents of random words, and a query for each of them, with typos in half of its words"""
+    rng = np.random.default_rng(0)
+    letters = list(string.ascii_lowercase)
+    vocab = ["".join(rng.choice(letters, size=7)) for _ in range(vocabulary)]
+
+    nodes, queries = [], []
+    for i in range(count):
+        doc_words = list(rng.choice(vocab, size=words, replace=False))
+        nodes.append(TextNode(id_=f"doc{i}", text=" ".join(doc_words)))
+
+        query_words = list(rng.choice(doc_words, size=4, replace=False))
+        for j in range(0, len(query_words), 2):  # drop a letter, which BM25 does not match but trigrams do
+            pos = rng.integers(1, len(query_words[j]) - 1)
+            query_words[j] = query_words[j][:pos] + query_words[j][pos + 1 :]
+        queries.append(" ".join(query_words + list(rng.choice(vocab, size=2))))
+    return nodes, queries
+
+
+def build_retrievers(nodes: list[TextNode], k: int):
+    embed_model = TrigramEmbedding()
+    # inner product on normalized vectors, so that the FAISS scores are similarities, higher is better
+    vector_store = FaissVectorStore(faiss_index=faiss.IndexFlatIP(DIMENSIONS))
+    index = VectorStoreIndex(
+        nodes=nodes,
+        storage_context=StorageContext.from_defaults(vector_store=vector_store),
+        embed_model=embed_model,
+    )
+    faiss_config = FAISSRetrieverConfig(index=index, dimensions=DIMENSIONS, similarity_top_k=k)
+    faiss_retriever = get_retriever(configs=[faiss_config])
+    bm25_retriever = get_retriever(configs=[BM25RetrieverConfig(similarity_top_k=k)], nodes=nodes)
+    return faiss_retriever, bm25_retriever
+
+
+async def sequential_aretrieve(retrievers, query: str):
+    """The hybrid retrieval before the children ran concurrently"""
+    return fuse([await r.aretrieve(query) for r in retrievers])
+
+
+async def measure(retrieve, queries: list[str], k: int) -> tuple[float, float]:
+    """The mean latency in ms, and the recall@k of the query for doc i in queries[i]"""
+    hits = 0
+    start = time.perf_counter()
+    for i, query in enumerate(queries):
+        nodes = await retrieve(query)
+        hits += f"doc{i}" in [n.node.node_id for n in nodes[:k]]
+    return (time.perf_counter() - start) / len(queries) * 1000, hits / len(queries)
+
+
+async def main(count: int = 2000, queries: int = 200, k: int = 5):
+    nodes, all_queries = synthetic_corpus(count)
+    queries = all_queries[:queries]
+    faiss_retriever, bm25_retriever = build_retrievers(nodes, k)
+
+    candidates = {
+        "faiss": faiss_retriever.aretrieve,
+        "bm25": bm25_retriever.aretrieve,
+    }
+    for name, fusion_config in {
+        "dedup": DedupFusionConfig(top_k=k),
+        "rrf": RRFFusionConfig(top_k=k),
+        "weighted": WeightedFusionConfig(weights=[0.5, 0.5], top_k=k),
+    }.items():
+        hybrid = SimpleHybridRetriever(faiss_retriever, bm25_retriever, fusion_config=fusion_config)
+        candidates[f"hybrid {name}"] = hybrid.aretrieve
+
+    logger.info(f"{count} docs, {len(queries)} queries, recall@{k}")
+    for name, retrieve in candidates.items():
+        latency, recall = await measure(retrieve, queries, k)
+        logger.info(f"{name:>16}: {latency:6.2f}ms per query, recall@{k} {recall:.3f}")
+
+    sequential, _ = await measure(lambda q: sequential_aretrieve([faiss_retriever, bm25_retriever], q), queries, k)
+    concurrent, _ = await measure(SimpleHybridRetriever(faiss_retriever, bm25_retriever).aretrieve, queries, k)
+    logger.info(f"children sequential: {sequential:.2f}ms per query, concurrent: {concurrent:.2f}ms per query")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
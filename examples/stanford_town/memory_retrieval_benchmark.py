@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : micro-benchmark of the retrieval of Stanford Town agents over synthetic memories
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from metagpt.ext.stanford_town.memory.agent_memory import AgentMemory
+from metagpt.ext.stanford_town.memory.retrieve import cos_sim, normalize_list_floats
+from metagpt.logs import logger
+
+NOW = datetime(2024, 1, 10)
+
+
+def synthetic_memory(count: int, dim: int = 1536) -> AgentMemory:
+    rng = np.random.default_rng(0)
+    agent_memory = AgentMemory()
+    for i in range(count):
+        embedding_pair = (f"memory {i}", rng.normal(size=dim).tolist())
+        created = NOW - timedelta(hours=i)
+        agent_memory.add_event(created, None, "s", "p", "o", f"memory {i}", [], i % 10, embedding_pair, [])
+    return agent_memory
+
+
+def per_node_top_k(agent_memory: AgentMemory, query: list[float], k: int) -> list[str]:
+    """The per-node scoring of the memories before the memory matrix"""
+    nodes = agent_memory.event_list
+    importance = normalize_list_floats([i.poignancy for i in nodes], 0, 1)
+    recency = normalize_list_floats([0.99 ** (NOW - i.created).days for i in nodes], 0, 1)
+    relevance = normalize_list_floats([cos_sim(agent_memory.embeddings[i.embedding_key], query) for i in nodes], 0, 1)
+    scores = {node.memory_id: sum(i) for node, *i in zip(nodes, importance, recency, relevance)}
+    return sorted(scores, key=scores.get, reverse=True)[:k]
+
+
+def main(count: int = 3000, focal_points: int = 3, k: int = 30, agents: int = 25):
+    agent_memory = synthetic_memory(count)
+    queries = np.random.default_rng(1).normal(size=(focal_points, 1536))
+
+    start = time.perf_counter()
+    for query in queries:
+        ids = per_node_top_k(agent_memory, query.tolist(), k)
+        for memory_id in ids:  # the lookup of the retrieved memories by id
+            next(i for i in agent_memory.storage if i.memory_id == memory_id)
+    per_node = time.perf_counter() - start
+
+    matrix = agent_memory.matrix
+    start = time.perf_counter()
+    matrix.top_k(queries, NOW, 0.99, k)
+    vectorized = time.perf_counter() - start
+
+    logger.info(f"{count} memories, {focal_points} focal points, top {k}")
+    logger.info(f"per node: {per_node * 1000:.1f}ms per agent step, {per_node * agents:.2f}s for {agents} agents")
+    logger.info(f"matrix: {vectorized * 1000:.1f}ms per agent step, {vectorized * agents:.2f}s for {agents} agents")
+
+
+if __name__ == "__main__":
+    main()
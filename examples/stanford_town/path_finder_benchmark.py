@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : benchmark of the pathfinding of the personas on the bundled the_ville maze
+
+import random
+import time
+
+from metagpt.environment.stanford_town.stanford_town_ext_env import StanfordTownExtEnv
+from metagpt.ext.stanford_town.utils.const import MAZE_ASSET_PATH
+from metagpt.ext.stanford_town.utils.utils import path_finder_v2
+from metagpt.logs import logger
+
+
+def main(routes: int = 50, targets: int = 4):
+    ext_env = StanfordTownExtEnv(maze_asset_path=MAZE_ASSET_PATH)
+    collision_maze, block = ext_env.collision_maze, ext_env.collision_block_id
+    address_tiles = [list(i) for i in ext_env.address_tiles.values()]
+    random.seed(0)
+    starts = [random.choice(random.choice(address_tiles)) for _ in range(routes)]
+    goals = [random.sample(i, min(len(i), targets)) for i in random.choices(address_tiles, k=routes)]
+
+    start = time.perf_counter()
+    for (x, y), tiles in zip(starts, goals):
+        for end_x, end_y in tiles:  # one wavefront search per target tile
+            path_finder_v2(collision_maze, (y, x), (end_y, end_x), block)
+    wavefront = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for curr_tile, tiles in zip(starts, goals):
+        ext_env.find_nearest_path(curr_tile, tiles)
+    nearest = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for curr_tile, tiles in zip(starts, goals):
+        for tile in tiles:
+            ext_env.find_path(curr_tile, tile)
+    a_star = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for curr_tile, tiles in zip(starts, goals):
+        for tile in tiles:
+            ext_env.find_path(curr_tile, tile)
+    cached = time.perf_counter() - start
+
+    logger.info(f"{routes} moves to the nearest of up to {targets} tiles of an address on the_ville")
+    logger.info(f"wavefront per target: {wavefront * 1000 / routes:.2f}ms per move")
+    logger.info(f"multi-target BFS: {nearest * 1000 / routes:.2f}ms per move")
+    logger.info(f"A* per target: {a_star * 1000 / routes:.2f}ms per move")
+    logger.info(f"A* per target, cached routes: {cached * 1000 / routes:.2f}ms per move")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Time    : 2026/10/18
+@File    : web_browser_benchmark.py
+@Desc    : Compare scraping a local stand-in site with a browser launched per run, with the shared browser pool, and
+    with the plain HTTP fast path. Requires playwright and its chromium browser.
+"""
+
+import asyncio
+import time
+
+import aiohttp.web
+
+from metagpt.logs import logger
+from metagpt.tools.web_browser_engine_playwright import PlaywrightWrapper
+from metagpt.tools.web_browser_pool import BrowserPool
+
+PAGE = """<!DOCTYPE html><html><head><title>Page {i}</title></head>
+<body><h1>Page {i}</h1>{paragraphs}<img src="/image.png"></body></html>"""
+
+JS_PAGE = """<!DOCTYPE html><html><head><title>JS</title></head>
+<body><script>document.body.innerText = "Rendered by javascript. ".repeat(50)</script></body></html>"""
+
+
+async def start_server():
+    async def handler(request: aiohttp.web.Request):
+        if request.path == "/image.png":
+            await asyncio.sleep(0.2)  # a slow resource that a text-only scraper does not need
+            return aiohttp.web.Response(body=b"\x89PNG", content_type="image/png")
+        if request.path == "/js":
+            return aiohttp.web.Response(text=JS_PAGE, content_type="text/html")
+        paragraphs = "".join(f"<p>Paragraph {j} of {request.path}.</p>" for j in range(50))
+        return aiohttp.web.Response(text=PAGE.format(i=request.path, paragraphs=paragraphs), content_type="text/html")
+
+    runner = aiohttp.web.ServerRunner(aiohttp.web.Server(handler))
+    await runner.setup()
+    site = aiohttp.web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    _, port, *_ = site._server.sockets[0].getsockname()
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def bench(name: str, runs: int, scrape):
+    start = time.perf_counter()
+    for _ in range(runs):
+        pages = await scrape()
+        assert all("Fail to load" not in i.inner_text for i in pages)
+    logger.info(f"{name}: {(time.perf_counter() - start) / runs:.3f}s per run")
+
+
+async def main(runs: int = 5, pages: int = 12):
+    runner, base = await start_server()
+    urls = [f"{base}/{i}" for i in range(pages)] + [f"{base}/js"]
+
+    async def cold():
+        async with BrowserPool() as pool:  # a browser launched per run, loading every resource
+            return await PlaywrightWrapper(pool=pool, blocked_resources=[]).run(*urls)
+
+    async with BrowserPool() as pool:
+        pooled = PlaywrightWrapper(pool=pool)
+        fast = PlaywrightWrapper(pool=pool, fast_path=True)
+        await pooled.run(urls[0])  # launch the browser before timing
+
+        await bench("browser per run", runs, cold)
+        await bench("browser pool", runs, lambda: pooled.run(*urls))
+        await bench("browser pool + fast path", runs, lambda: fast.run(*urls))
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,18 +1,20 @@
+import json
 from typing import Optional
-from fastapi import APIRouter, Security
-from metagpt.software_company import generate_repo, ProjectRepo
+from fastapi import APIRouter, Header, HTTPException, Security
+from fastapi.responses import StreamingResponse
+from starlette import status
 
 from ...schemas.fields import (
    GenerateProgramRequest,
    GenerateProgramResponse
 )
-from ...config import config, config_env
-from ...const import ROOT_PATH
 from ...logs import logger
 from ...auth import get_api_key
+from ...jobs import Job, JobQueueFull, create_job_manager
 
 
 router = APIRouter()
+job_manager = create_job_manager()
 
 
 # class MetaGPTIntegration:
@@ -43,12 +45,41 @@ router = APIRouter()
 #             return None
 
 
-@router.post('/gen_prog/', response_model=GenerateProgramResponse, dependencies=[Security(get_api_key)])
-def generate_program(data: GenerateProgramRequest, dependencies=[Security(get_api_key)]):
-    local_dir = ROOT_PATH / config.WORKSPACE
+@router.post('/gen_prog/', response_model=GenerateProgramResponse, status_code=status.HTTP_202_ACCEPTED,
+             dependencies=[Security(get_api_key)])
+async def generate_program(data: GenerateProgramRequest):
     logger.info(f'Idea: {data.idea}')
-    repo: ProjectRepo = generate_repo(idea=data.idea, project_name=data.project_name, inc=data.incremental, n_round=data.n_rounds, code_review=True)
-    logger.info(f'Workdir: {repo.workdir.name}')
-    logger.info(f'Github repo: {repo.git_repo}')
-    logger.info(f'Source path: {repo._srcs_path}')
-    return {'repo_name':  repo.workdir.name, 'n_rounds': data.n_rounds}
+    try:
+        job = await job_manager.submit(data.idea, data.project_name, data.n_rounds, data.incremental)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=f'Too many jobs: {e}')
+    return {'job_id': job.id, 'status': job.status.value, 'n_rounds': job.n_rounds}
+
+
+@router.get('/gen_prog/{job_id}', response_model=Job, dependencies=[Security(get_api_key)])
+async def get_program_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Job {job_id} not found')
+    return job
+
+
+@router.get('/gen_prog/{job_id}/events', dependencies=[Security(get_api_key)])
+async def stream_program_job_events(job_id: str, last_event_id: int = Header(0)):
+    """Streams the status changes and the role messages of the job as server-sent events, until it is finished."""
+    if job_manager.get(job_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Job {job_id} not found')
+
+    async def event_stream():
+        async for event in job_manager.events(job_id, after=last_event_id):
+            yield f'id: {event.seq}\nevent: {event.type}\ndata: {json.dumps(event.data, ensure_ascii=False)}\n\n'
+
+    return StreamingResponse(event_stream(), media_type='text/event-stream')
+
+
+@router.delete('/gen_prog/{job_id}', response_model=Job, dependencies=[Security(get_api_key)])
+async def cancel_program_job(job_id: str):
+    try:
+        return await job_manager.cancel(job_id)
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Job {job_id} not found')
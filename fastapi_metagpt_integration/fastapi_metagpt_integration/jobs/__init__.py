@@ -0,0 +1,37 @@
+import os
+
+from .manager import JobManager, JobQueueFull, JobRunner, generate_program
+from .store import Job, JobEvent, JobStatus, JobStore, MemoryJobStore, SQLiteJobStore
+
+
+def create_job_manager(runner: JobRunner = generate_program) -> JobManager:
+    """
+    Creates the job manager configured by the environment variables.
+
+    JOB_DB_PATH: the SQLite file of the jobs, the jobs are kept in memory if not set.
+    JOB_MAX_CONCURRENCY: the max number of jobs running at once, defaults to 2.
+    JOB_MAX_QUEUED: the max number of jobs waiting for a worker, defaults to 100.
+    """
+    db_path = os.getenv('JOB_DB_PATH', '')
+    store = SQLiteJobStore(db_path) if db_path else MemoryJobStore()
+    return JobManager(
+        store,
+        runner=runner,
+        max_concurrency=int(os.getenv('JOB_MAX_CONCURRENCY', '2')),
+        max_queued=int(os.getenv('JOB_MAX_QUEUED', '100')),
+    )
+
+
+__all__ = [
+    'Job',
+    'JobEvent',
+    'JobManager',
+    'JobQueueFull',
+    'JobRunner',
+    'JobStatus',
+    'JobStore',
+    'MemoryJobStore',
+    'SQLiteJobStore',
+    'create_job_manager',
+    'generate_program',
+]
@@ -0,0 +1,174 @@
+import asyncio
+import time
+import uuid
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from ..logs import logger
+from .store import Job, JobEvent, JobStatus, JobStore
+
+Emit = Callable[[str, dict[str, Any]], None]
+# Run the job, report its progress with `emit(type, data)`, and return the name of the generated repo
+JobRunner = Callable[[Job, Emit], Awaitable[str]]
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+async def generate_program(job: Job, emit: Emit) -> str:
+    """Run the software company of MetaGPT on the event loop of the server"""
+    from metagpt.software_company import agenerate_repo
+
+    def on_message(message):
+        emit('message', {
+            'role': message.role,
+            'sent_from': message.sent_from,
+            'cause_by': message.cause_by,
+            'content': message.content,
+        })
+
+    repo = await agenerate_repo(
+        idea=job.idea,
+        project_name=job.project_name,
+        inc=job.incremental,
+        n_round=job.n_rounds,
+        code_review=True,
+        on_message=on_message,
+    )
+    logger.info(f'Job {job.id} workdir: {repo.workdir}')
+    return repo.workdir.name
+
+
+class JobManager:
+    """A bounded pool of workers running the queued jobs on the event loop of the server.
+
+    At most `max_concurrency` jobs run at once, and at most `max_queued` jobs wait for a worker. The unfinished jobs
+    of the store, left by a previous server, are recovered on start: queued jobs are queued again, and running jobs,
+    interrupted halfway, are failed.
+    """
+
+    def __init__(self, store: JobStore, runner: JobRunner = generate_program, max_concurrency: int = 2,
+                 max_queued: int = 100):
+        self.store = store
+        self.runner = runner
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._running: dict[str, asyncio.Task] = {}
+        self._changed: Optional[asyncio.Event] = None  # replaced by a new one on each event, to wake up the streams
+
+    async def start(self):
+        """Start the workers in the running event loop, if not started yet"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._changed = asyncio.Event()
+        self._recover()
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.max_concurrency)]
+
+    async def stop(self):
+        """Cancel the running jobs and stop the workers"""
+        for task in list(self._running.values()):
+            task.cancel()
+        await asyncio.gather(*self._running.values(), return_exceptions=True)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def submit(self, idea: str, project_name: str, n_rounds: int = 1, incremental: bool = False) -> Job:
+        """Queue a job and return it at once. Raise JobQueueFull if too many jobs are waiting."""
+        await self.start()
+        if self._queue.qsize() >= self.max_queued:
+            raise JobQueueFull(f'{self._queue.qsize()} jobs are waiting')
+        job = Job(id=uuid.uuid4().hex, idea=idea, project_name=project_name, n_rounds=n_rounds,
+                  incremental=incremental)
+        self.store.add(job)
+        self._emit(job.id, 'status', {'status': job.status.value})
+        self._queue.put_nowait(job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.store.get(job_id)
+
+    async def cancel(self, job_id: str) -> Job:
+        """Cancel a queued or running job and return it. Raise KeyError if no such job."""
+        await self.start()
+        job = self.store.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        task = self._running.get(job_id)
+        if task:
+            task.cancel()
+            await asyncio.wait([task])
+        self._mark_cancelled(job_id)  # a queued job is skipped by the worker
+        return self.store.get(job_id)
+
+    async def events(self, job_id: str, after: int = 0) -> AsyncIterator[JobEvent]:
+        """Yield the events of the job after the seq `after` as they come, until the job is finished"""
+        await self.start()
+        while True:
+            changed = self._changed
+            events = self.store.get_events(job_id, after)
+            if not events:
+                job = self.store.get(job_id)
+                if job is None or job.status.finished:
+                    return
+                await changed.wait()
+                continue
+            for event in events:
+                yield event
+                after = event.seq
+
+    def _recover(self):
+        for job in self.store.list_unfinished():
+            if job.status == JobStatus.QUEUED:
+                logger.info(f'Job {job.id} queued again')
+                self._queue.put_nowait(job.id)
+            else:
+                logger.info(f'Job {job.id} interrupted by a restart')
+                self._set_status(job.id, JobStatus.FAILED, error='interrupted by a restart', finished_at=time.time())
+
+    async def _work(self):
+        while True:
+            job_id = await self._queue.get()
+            job = self.store.get(job_id)
+            if job is None or job.status != JobStatus.QUEUED:
+                continue
+            task = asyncio.create_task(self._run(job))
+            self._running[job_id] = task
+            try:
+                # a cancelled job does not cancel the worker
+                await asyncio.wait([task])
+                self._mark_cancelled(job_id)  # cancelled before it started
+            finally:
+                self._running.pop(job_id, None)
+
+    async def _run(self, job: Job):
+        self._set_status(job.id, JobStatus.RUNNING, started_at=time.time())
+        try:
+            repo_name = await self.runner(job, partial(self._emit, job.id))
+        except asyncio.CancelledError:
+            logger.info(f'Job {job.id} cancelled')
+            self._set_status(job.id, JobStatus.CANCELLED, finished_at=time.time())
+        except Exception as e:
+            logger.exception(f'Job {job.id} failed: {e}')
+            self._set_status(job.id, JobStatus.FAILED, error=str(e), finished_at=time.time())
+        else:
+            self._set_status(job.id, JobStatus.SUCCEEDED, repo_name=repo_name, finished_at=time.time())
+
+    def _mark_cancelled(self, job_id: str):
+        if not self.store.get(job_id).status.finished:
+            self._set_status(job_id, JobStatus.CANCELLED, finished_at=time.time())
+
+    def _set_status(self, job_id: str, status: JobStatus, **fields):
+        self.store.update(job_id, status=status, **fields)
+        self._emit(job_id, 'status', {'status': status.value, **fields})
+
+    def _emit(self, job_id: str, type: str, data: dict[str, Any]):
+        self.store.add_event(job_id, type, data)
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
@@ -0,0 +1,168 @@
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from enum import Enum
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from pydantic import BaseModel, Field
+
+
+class JobStatus(str, Enum):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    @property
+    def finished(self) -> bool:
+        return self in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class Job(BaseModel):
+    """A program generation run, from the request to its result"""
+    id: str
+    idea: str
+    project_name: str
+    n_rounds: int = 1
+    incremental: bool = False
+    status: JobStatus = JobStatus.QUEUED
+    repo_name: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = Field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+class JobEvent(BaseModel):
+    """A progress event of a job: a status change, or a message published by a role of the team"""
+    job_id: str
+    seq: int  # 1-based, in the order of the events of the job
+    type: str
+    data: dict[str, Any] = {}
+    created_at: float = Field(default_factory=time.time)
+
+
+class JobStore(ABC):
+    """Where the jobs and their events are kept"""
+
+    @abstractmethod
+    def add(self, job: Job):
+        ...
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        ...
+
+    @abstractmethod
+    def list_unfinished(self) -> list[Job]:
+        """The queued and running jobs, in the order they were created"""
+
+    def update(self, job_id: str, **fields) -> Job:
+        """Update the fields of the job and return it. Raise KeyError if no such job."""
+        job = self.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        job = job.model_copy(update=fields)
+        self._put(job)
+        return job
+
+    @abstractmethod
+    def add_event(self, job_id: str, type: str, data: dict[str, Any]) -> JobEvent:
+        ...
+
+    @abstractmethod
+    def get_events(self, job_id: str, after: int = 0) -> list[JobEvent]:
+        """The events of the job whose seq is greater than `after`"""
+
+    @abstractmethod
+    def _put(self, job: Job):
+        ...
+
+
+class MemoryJobStore(JobStore):
+    """Jobs kept in the memory of the process, lost on restart"""
+
+    def __init__(self):
+        self._jobs: dict[str, Job] = {}
+        self._events: dict[str, list[JobEvent]] = {}
+
+    def add(self, job: Job):
+        self._jobs[job.id] = job
+        self._events[job.id] = []
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list_unfinished(self) -> list[Job]:
+        return sorted((job for job in self._jobs.values() if not job.status.finished), key=lambda job: job.created_at)
+
+    def add_event(self, job_id: str, type: str, data: dict[str, Any]) -> JobEvent:
+        events = self._events.setdefault(job_id, [])
+        event = JobEvent(job_id=job_id, seq=len(events) + 1, type=type, data=data)
+        events.append(event)
+        return event
+
+    def get_events(self, job_id: str, after: int = 0) -> list[JobEvent]:
+        return self._events.get(job_id, [])[after:]
+
+    def _put(self, job: Job):
+        self._jobs[job.id] = job
+
+
+class SQLiteJobStore(JobStore):
+    """Jobs kept in a SQLite file, which survive restarts"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS job_events '
+            '(job_id TEXT NOT NULL, seq INTEGER NOT NULL, value TEXT NOT NULL, PRIMARY KEY (job_id, seq))'
+        )
+
+    def add(self, job: Job):
+        self._put(job)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return Job.model_validate_json(row[0]) if row else None
+
+    def list_unfinished(self) -> list[Job]:
+        with self._lock:
+            rows = self._conn.execute('SELECT value FROM jobs').fetchall()
+        jobs = [Job.model_validate_json(row[0]) for row in rows]
+        return sorted((job for job in jobs if not job.status.finished), key=lambda job: job.created_at)
+
+    def add_event(self, job_id: str, type: str, data: dict[str, Any]) -> JobEvent:
+        with self._lock:
+            seq = self._conn.execute(
+                'SELECT COALESCE(MAX(seq), 0) + 1 FROM job_events WHERE job_id = ?', (job_id,)
+            ).fetchone()[0]
+            event = JobEvent(job_id=job_id, seq=seq, type=type, data=data)
+            self._conn.execute(
+                'INSERT INTO job_events (job_id, seq, value) VALUES (?, ?, ?)',
+                (job_id, seq, event.model_dump_json()),
+            )
+        return event
+
+    def get_events(self, job_id: str, after: int = 0) -> list[JobEvent]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT value FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq', (job_id, after)
+            ).fetchall()
+        return [JobEvent.model_validate(json.loads(row[0])) for row in rows]
+
+    def _put(self, job: Job):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO jobs (id, value) VALUES (?, ?)', (job.id, job.model_dump_json())
+            )
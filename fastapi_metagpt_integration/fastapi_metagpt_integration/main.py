@@ -83,6 +83,17 @@ app.include_router(github_intergration.router, prefix=config.PREFIX)
 app.include_router(program_generation.router, prefix=config.PREFIX)
 
 
+@app.on_event("startup")
+async def start_program_jobs():
+    # run the jobs left queued by a previous server
+    await program_generation.job_manager.start()
+
+
+@app.on_event("shutdown")
+async def stop_program_jobs():
+    await program_generation.job_manager.stop()
+
+
 def run_app():
     uvicorn.run('fastapi_metagpt_integration.main:app', host=config_env.get('UVICORN_HOST', '0.0.0.0'), port=int(config_env.get('UVICORN_PORT', '8000')), reload=True)
 
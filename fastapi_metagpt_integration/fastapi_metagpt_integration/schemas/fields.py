@@ -31,5 +31,6 @@ class GenerateProgramRequest(BaseModel):
 
 
 class GenerateProgramResponse(BaseModel):
-    repo_name: str
-    n_rounds: int
\ No newline at end of file
+    job_id: str
+    status: str
+    n_rounds: int
@@ -0,0 +1,174 @@
+import asyncio
+
+import pytest
+
+from fastapi_metagpt_integration.jobs import (
+    Job,
+    JobManager,
+    JobQueueFull,
+    JobStatus,
+    MemoryJobStore,
+    SQLiteJobStore,
+)
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryJobStore()
+    return SQLiteJobStore(tmp_path / 'jobs.sqlite')
+
+
+class FakeTeam:
+    """Runs a job like a team of roles, without LLM: each role publishes a message, then the job waits to be released"""
+
+    def __init__(self, roles=('ProductManager', 'Architect', 'Engineer')):
+        self.roles = roles
+        self.running = 0
+        self.max_running = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, job, emit):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            for role in self.roles:
+                await asyncio.sleep(0)
+                emit('message', {'role': role, 'content': f'{role} works on {job.idea}'})
+            await self.release.wait()
+            if job.idea == 'fail':
+                raise ValueError('bad idea')
+            return job.project_name
+        finally:
+            self.running -= 1
+
+
+async def wait_finished(manager, job_id):
+    async for _ in manager.events(job_id):
+        pass
+    return manager.get(job_id)
+
+
+def test_job_succeeds_with_events(store):
+    async def main():
+        team = FakeTeam()
+        manager = JobManager(store, runner=team)
+        job = await manager.submit('a snake game', 'snake')
+        assert job.status == JobStatus.QUEUED
+
+        team.release.set()
+        events = [event async for event in manager.events(job.id)]
+        assert [(e.type, e.data.get('status') or e.data['role']) for e in events] == [
+            ('status', 'queued'),
+            ('status', 'running'),
+            ('message', 'ProductManager'),
+            ('message', 'Architect'),
+            ('message', 'Engineer'),
+            ('status', 'succeeded'),
+        ]
+        assert [e.seq for e in events] == list(range(1, 7))
+
+        job = manager.get(job.id)
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.repo_name == 'snake'
+        assert job.started_at <= job.finished_at
+
+        # resumed after the last event seen
+        assert [e.seq async for e in manager.events(job.id, after=4)] == [5, 6]
+        await manager.stop()
+
+    asyncio.run(main())
+
+
+def test_job_fails(store):
+    async def main():
+        team = FakeTeam()
+        team.release.set()
+        manager = JobManager(store, runner=team)
+        job = await manager.submit('fail', 'failed')
+        job = await wait_finished(manager, job.id)
+        assert job.status == JobStatus.FAILED
+        assert job.error == 'bad idea'
+        await manager.stop()
+
+    asyncio.run(main())
+
+
+def test_max_concurrency_and_cancel(store):
+    async def main():
+        team = FakeTeam()
+        manager = JobManager(store, runner=team, max_concurrency=2, max_queued=1)
+        running = []
+        for i in range(2):
+            running.append(await manager.submit(f'idea {i}', f'project_{i}'))
+            await asyncio.sleep(0.01)  # taken by a worker
+        queued = await manager.submit('idea 2', 'project_2')
+        with pytest.raises(JobQueueFull):
+            await manager.submit('idea 3', 'project_3')
+        assert team.running == 2
+        assert manager.get(queued.id).status == JobStatus.QUEUED
+
+        # a cancelled running job frees its worker, a cancelled queued job never runs
+        assert (await manager.cancel(running[0].id)).status == JobStatus.CANCELLED
+        assert (await manager.cancel(queued.id)).status == JobStatus.CANCELLED
+        team.release.set()
+        assert (await wait_finished(manager, running[1].id)).status == JobStatus.SUCCEEDED
+        await asyncio.sleep(0.01)
+        assert manager.get(queued.id).started_at is None
+        assert team.max_running == 2
+
+        with pytest.raises(KeyError):
+            await manager.cancel('unknown')
+        await manager.stop()
+
+    asyncio.run(main())
+
+
+def test_sqlite_store_survives_restart(tmp_path):
+    async def main():
+        team = FakeTeam()
+        team.release.set()
+        manager = JobManager(SQLiteJobStore(tmp_path / 'jobs.sqlite'), runner=team)
+        job = await manager.submit('a snake game', 'snake')
+        await wait_finished(manager, job.id)
+        await manager.stop()
+        return job.id
+
+    job_id = asyncio.run(main())
+    store = SQLiteJobStore(tmp_path / 'jobs.sqlite')
+    assert store.get(job_id).status == JobStatus.SUCCEEDED
+    assert len(store.get_events(job_id)) == 6
+
+
+def test_cancel_before_start(store):
+    async def main():
+        team = FakeTeam()
+        store.add(Job(id='queued', idea='a snake game', project_name='snake'))
+        manager = JobManager(store, runner=team)
+        assert (await manager.cancel('queued')).status == JobStatus.CANCELLED
+        await asyncio.sleep(0.01)
+        assert team.max_running == 0
+        await manager.stop()
+
+    asyncio.run(main())
+
+
+def test_sqlite_store_recovers_unfinished_jobs(tmp_path):
+    # the jobs left by a server which died with a job running and another queued
+    store = SQLiteJobStore(tmp_path / 'jobs.sqlite')
+    store.add(Job(id='running', idea='a snake game', project_name='snake', status=JobStatus.RUNNING))
+    store.add(Job(id='queued', idea='a 2048 game', project_name='game_2048'))
+    async def restarted():
+        team = FakeTeam()
+        team.release.set()
+        manager = JobManager(SQLiteJobStore(tmp_path / 'jobs.sqlite'), runner=team)
+        # the events of a job interrupted by the restart end instead of waiting forever
+        running = await asyncio.wait_for(wait_finished(manager, 'running'), timeout=5)
+        assert running.status == JobStatus.FAILED
+        assert running.error == 'interrupted by a restart'
+        queued = await asyncio.wait_for(wait_finished(manager, 'queued'), timeout=5)
+        assert queued.status == JobStatus.SUCCEEDED
+        assert queued.repo_name == 'game_2048'
+        await manager.stop()
+
+    asyncio.run(restarted())
@@ -8,10 +8,11 @@
 NOTE: You should use typing.List instead of list to do type annotation. Because in the markdown extraction process,
   we can use typing to extract the type of the node, but we cannot use built-in list to extract.
 """
+import asyncio
 import json
 import typing
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 from pydantic import BaseModel, Field, create_model, model_validator
 from tenacity import retry, stop_after_attempt, wait_random_exponential
@@ -120,6 +121,10 @@ def dict_to_markdown(d, prefix="- ", kv_sep="\n", postfix="\n"):
     return markdown_str
 
 
+# the fields of a node which its compiled prompts and output classes depend on
+SIGNATURE_FIELDS = ("key", "expected_type", "instruction", "example")
+
+
 class ActionNode:
     """ActionNode is a tree of nodes."""
 
@@ -167,6 +172,38 @@ class ActionNode:
         self.prevs = []
         self.nexts = []
 
+    def __setattr__(self, name, value):
+        if name in SIGNATURE_FIELDS:
+            self.__dict__.pop("_signature", None)
+        super().__setattr__(name, value)
+
+    @property
+    def signature(self) -> tuple:
+        """The structural signature of the node itself, computed once until its fields are reassigned"""
+        signature = self.__dict__.get("_signature")
+        if signature is None:
+            signature = (self.key, str(self.expected_type), self.instruction, repr(self.example))
+            self.__dict__["_signature"] = signature
+        return signature
+
+    def tree_signature(self, exclude=None) -> tuple:
+        """The structural signature of the node and its children, excluding the keys in `exclude` at any level"""
+        exclude = exclude or ()
+        children = tuple(child.tree_signature(exclude) for key, child in self.children.items() if key not in exclude)
+        return self.signature, children
+
+    def _memoized(self, name: str, args: tuple, exclude, build: Callable[[], Any]) -> Any:
+        """Return the result of `build` for the args, memoized on the node until the structure of the tree changes"""
+        memo = self.__dict__.setdefault("_memo", {})
+        key = (name, args, tuple(exclude or ()))
+        signature = self.tree_signature(exclude)
+        cached = memo.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        value = build()
+        memo[key] = (signature, value)
+        return value
+
     def __str__(self):
         return (
             f"{self.key}, {repr(self.expected_type)}, {self.instruction}, {self.example}"
@@ -262,16 +299,23 @@ class ActionNode:
         new_class = create_model(class_name, __validators__=validators, **new_fields)
         return new_class
 
+    def get_output_class(self, class_name: str, mode: str = "auto", exclude=None) -> Tuple[Dict, Type[BaseModel]]:
+        """get the mapping under mode and its model class, cached by the structural signature of the node tree"""
+
+        def _build():
+            mapping = self.get_mapping(mode=mode, exclude=exclude)
+            return mapping, self.create_model_class(class_name, mapping)
+
+        return self._memoized("output_class", (class_name, mode), exclude, _build)
+
     def create_class(self, mode: str = "auto", class_name: str = None, exclude=None):
         class_name = class_name if class_name else f"{self.key}_AN"
-        mapping = self.get_mapping(mode=mode, exclude=exclude)
-        return self.create_model_class(class_name, mapping)
+        return self.get_output_class(class_name, mode=mode, exclude=exclude)[1]
 
     def _create_children_class(self, exclude=None):
         """使用object内有的字段直接生成model_class"""
         class_name = f"{self.key}_AN"
-        mapping = self._get_children_mapping(exclude=exclude)
-        return self.create_model_class(class_name, mapping)
+        return self.get_output_class(class_name, mode="children", exclude=exclude)[1]
 
     def to_dict(self, format_func=None, mode="auto", exclude=None) -> Dict:
         """将当前节点与子节点都按照node: format的格式组织成字典"""
@@ -350,7 +394,12 @@ class ActionNode:
     def compile_instruction(self, schema="markdown", mode="children", tag="", exclude=None) -> str:
         """compile to raw/json/markdown template with all/root/children nodes"""
         format_func = lambda i: f"{i.expected_type}  # {i.instruction}"
-        return self._compile_f(schema, mode, tag, format_func, kv_sep=": ", exclude=exclude)
+        return self._memoized(
+            "instruction",
+            (schema, mode, tag),
+            exclude,
+            lambda: self._compile_f(schema, mode, tag, format_func, kv_sep=": ", exclude=exclude),
+        )
 
     def compile_example(self, schema="json", mode="children", tag="", exclude=None) -> str:
         """compile to raw/json/markdown examples with all/root/children nodes"""
@@ -358,7 +407,12 @@ class ActionNode:
         # 这里不能使用f-string，因为转译为str后再json.dumps会额外加上引号，无法作为有效的example
         # 错误示例："File list": "['main.py', 'const.py', 'game.py']", 注意这里值不是list，而是str
         format_func = lambda i: i.example
-        return self._compile_f(schema, mode, tag, format_func, kv_sep="\n", exclude=exclude)
+        return self._memoized(
+            "example",
+            (schema, mode, tag),
+            exclude,
+            lambda: self._compile_f(schema, mode, tag, format_func, kv_sep="\n", exclude=exclude),
+        )
 
     def compile(self, context, schema="json", mode="children", template=SIMPLE_TEMPLATE, exclude=[]) -> str:
         """
@@ -415,11 +469,12 @@ class ActionNode:
         system_msgs: Optional[list[str]] = None,
         schema="markdown",  # compatible to original format
         timeout=USE_CONFIG_TIMEOUT,
+        output_class: Type[BaseModel] = None,
     ) -> (str, BaseModel):
         """Use ActionOutput to wrap the output of aask"""
         content = await self.llm.aask(prompt, system_msgs, images=images, timeout=timeout)
         logger.debug(f"llm raw output:\n{content}")
-        output_class = self.create_model_class(output_class_name, output_data_mapping)
+        output_class = output_class or self.create_model_class(output_class_name, output_data_mapping)
 
         if schema == "json":
             parsed_data = llm_output_postprocess(
@@ -451,10 +506,10 @@ class ActionNode:
     ):
         prompt = self.compile(context=self.context, schema=schema, mode=mode, exclude=exclude)
         if schema != "raw":
-            mapping = self.get_mapping(mode, exclude=exclude)
             class_name = f"{self.key}_AN"
+            mapping, output_class = self.get_output_class(class_name, mode=mode, exclude=exclude)
             content, scontent = await self._aask_v1(
-                prompt, class_name, mapping, images=images, schema=schema, timeout=timeout
+                prompt, class_name, mapping, images=images, schema=schema, timeout=timeout, output_class=output_class
             )
             self.content = content
             self.instruct_content = scontent
@@ -474,6 +529,7 @@ class ActionNode:
         images: Optional[Union[str, list[str]]] = None,
         timeout=USE_CONFIG_TIMEOUT,
         exclude=[],
+        max_concurrency: int = 5,
     ):
         """Fill the node(s) with mode.
 
@@ -487,12 +543,14 @@ class ActionNode:
          - auto: automated fill children's nodes and gather outputs, if no children, fill itself
          - children: fill children's nodes and gather outputs
          - root: fill root's node and gather output
-        :param strgy: simple/complex
+        :param strgy: simple/complex/parallel
          - simple: run only once
          - complex: run each node
+         - parallel: run each node concurrently, a node after its previous nodes (`prevs`) among the children
         :param images: the list of image url or base64 for gpt4-v
         :param timeout: Timeout for llm invocation.
         :param exclude: The keys of ActionNode to exclude.
+        :param max_concurrency: The max nodes running at the same time with the parallel strategy.
         :return: self
         """
         self.set_llm(llm)
@@ -502,18 +560,44 @@ class ActionNode:
 
         if strgy == "simple":
             return await self.simple_fill(schema=schema, mode=mode, images=images, timeout=timeout, exclude=exclude)
-        elif strgy == "complex":
+        elif strgy in ("complex", "parallel"):
             # 这里隐式假设了拥有children
+            children = [i for i in self.children.values() if not (exclude and i.key in exclude)]
+
+            async def _fill(node):
+                return await node.simple_fill(schema=schema, mode=mode, images=images, timeout=timeout, exclude=exclude)
+
+            if strgy == "complex":
+                filled = [await _fill(i) for i in children]
+            else:
+                filled = await self._gather_children(children, _fill, max_concurrency)
             tmp = {}
-            for _, i in self.children.items():
-                if exclude and i.key in exclude:
-                    continue
-                child = await i.simple_fill(schema=schema, mode=mode, images=images, timeout=timeout, exclude=exclude)
+            for child in filled:
                 tmp.update(child.instruct_content.model_dump())
             cls = self._create_children_class()
             self.instruct_content = cls(**tmp)
             return self
 
+    @staticmethod
+    async def _gather_children(children: List["ActionNode"], fill: Callable, max_concurrency: int) -> list:
+        """Fill the children concurrently in waves, a child after its previous nodes among the children.
+        Return the filled children in the order of `children`."""
+        semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+        async def _fill(node):
+            async with semaphore:
+                return await fill(node)
+
+        filled = {}
+        pending = list(children)
+        while pending:
+            ready = [i for i in pending if all(p.key in filled or p not in children for p in i.prevs)]
+            ready = ready or pending[:1]  # a cycle among the children, fill them one by one
+            for node, result in zip(ready, await asyncio.gather(*[_fill(i) for i in ready])):
+                filled[node.key] = result
+            pending = [i for i in pending if i not in ready]
+        return [filled[i.key] for i in children]
+
     async def human_review(self) -> dict[str, str]:
         review_comments = HumanInteraction().interact_with_instruct_content(
             instruct_content=self.instruct_content, interact_type="review"
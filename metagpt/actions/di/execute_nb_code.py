@@ -6,25 +6,49 @@
 """
 from __future__ import annotations
 
-import asyncio
 import base64
 import re
-from typing import Literal, Tuple
+from typing import Literal, Optional, Tuple
 
 import nbformat
 from nbclient import NotebookClient
 from nbclient.exceptions import CellTimeoutError, DeadKernelError
 from nbformat import NotebookNode
 from nbformat.v4 import new_code_cell, new_markdown_cell, new_output
+from pydantic import PrivateAttr
 from rich.box import MINIMAL
 from rich.console import Console, Group
 from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.syntax import Syntax
+from traitlets import Callable
 
 from metagpt.actions import Action
 from metagpt.logs import logger
+from metagpt.utils.kernel_pool import KernelPool, PooledKernel, get_kernel_pool
+
+
+class StreamingNotebookClient(NotebookClient):
+    """NotebookClient passing each output of a cell to `on_output` as soon as it arrives, and notifying
+    `on_clear_output` when the outputs of the cell are cleared"""
+
+    on_output = Callable(default_value=None, allow_none=True)
+    on_clear_output = Callable(default_value=None, allow_none=True)
+
+    def output(self, outs, msg, display_id, cell_index):
+        clear_pending = self.clear_before_next_output
+        out = super().output(outs, msg, display_id, cell_index)
+        if clear_pending and not self.clear_before_next_output and self.on_clear_output:
+            self.on_clear_output()
+        if out is not None and self.on_output:
+            self.on_output(out)
+        return out
+
+    def clear_output(self, outs, msg, cell_index):
+        super().clear_output(outs, msg, cell_index)
+        if not msg["content"].get("wait") and self.on_clear_output:
+            self.on_clear_output()
 
 
 class ExecuteNbCode(Action):
@@ -35,54 +59,51 @@ class ExecuteNbCode(Action):
     console: Console
     interaction: str
     timeout: int = 600
+    pool: Optional[KernelPool] = None  # the kernel pool to lease kernels from, `get_kernel_pool()` if None
+
+    _kernel: Optional[PooledKernel] = PrivateAttr(default=None)
+    _kernel_pool: Optional[KernelPool] = PrivateAttr(default=None)
+    _parsed_outputs: list[Tuple[bool, str]] = PrivateAttr(default_factory=list)
 
-    def __init__(
-        self,
-        nb=nbformat.v4.new_notebook(),
-        timeout=600,
-    ):
+    def __init__(self, nb=None, timeout=600, pool: Optional[KernelPool] = None):
+        nb = nb if nb is not None else nbformat.v4.new_notebook()
         super().__init__(
             nb=nb,
-            nb_client=NotebookClient(nb, timeout=timeout),
+            nb_client=self._new_client(nb, timeout),
             timeout=timeout,
+            pool=pool,
             console=Console(),
             interaction=("ipython" if self.is_ipython() else "terminal"),
         )
 
+    def _new_client(self, nb: NotebookNode, timeout: int) -> NotebookClient:
+        # outputs are parsed as soon as they arrive instead of after the cell completes
+        return StreamingNotebookClient(
+            nb, timeout=timeout, on_output=self._on_output, on_clear_output=self._on_clear_output
+        )
+
     async def build(self):
+        """lease a kernel from the kernel pool, a new one if the kernel leased has died"""
         if self.nb_client.kc is None or not await self.nb_client.kc.is_alive():
-            self.nb_client.create_kernel_manager()
-            self.nb_client.start_new_kernel()
-            self.nb_client.start_new_kernel_client()
+            if self._kernel:
+                await self._kernel_pool.discard(self._kernel)
+            self._kernel_pool = self.pool or get_kernel_pool()
+            self._kernel = await self._kernel_pool.acquire()
+            self.nb_client.km, self.nb_client.kc = self._kernel.km, self._kernel.kc
 
     async def terminate(self):
-        """kill NotebookClient"""
-        if self.nb_client.km is not None and await self.nb_client.km.is_alive():
-            await self.nb_client.km.shutdown_kernel(now=True)
-            await self.nb_client.km.cleanup_resources()
-
-            channels = [
-                self.nb_client.kc.stdin_channel,  # The channel for handling standard input to the kernel.
-                self.nb_client.kc.hb_channel,  # The channel for heartbeat communication between the kernel and client.
-                self.nb_client.kc.control_channel,  # The channel for controlling the kernel.
-            ]
-
-            # Stops all the running channels for this kernel
-            for channel in channels:
-                if channel.is_alive():
-                    channel.stop()
-
-            self.nb_client.kc = None
-            self.nb_client.km = None
+        """return the kernel to the kernel pool, where it is reset for the next lease or shut down"""
+        if self._kernel is not None:
+            await self._kernel_pool.release(self._kernel)
+            self._kernel = None
+        self.nb_client.kc = None
+        self.nb_client.km = None
 
     async def reset(self):
         """reset NotebookClient"""
+        # the kernel pool checks the health of kernels instead of sleeping for them to be cleaned up
         await self.terminate()
-
-        # sleep 1s to wait for the kernel to be cleaned up completely
-        await asyncio.sleep(1)
-        await self.build()
-        self.nb_client = NotebookClient(self.nb, timeout=self.timeout)
+        self.nb_client = self._new_client(self.nb, self.timeout)
 
     def add_code_cell(self, code: str):
         self.nb.cells.append(new_code_cell(source=code))
@@ -109,38 +130,56 @@ class ExecuteNbCode(Action):
     def parse_outputs(self, outputs: list[str], keep_len: int = 2000) -> Tuple[bool, str]:
         """Parses the outputs received from notebook execution."""
         assert isinstance(outputs, list)
-        parsed_output, is_success = [], True
+        parsed_outputs, is_success = [], True
         for i, output in enumerate(outputs):
-            output_text = ""
-            if output["output_type"] == "stream" and not any(
-                tag in output["text"]
-                for tag in ["| INFO     | metagpt", "| ERROR    | metagpt", "| WARNING  | metagpt", "DEBUG"]
-            ):
-                output_text = output["text"]
-            elif output["output_type"] == "display_data":
-                if "image/png" in output["data"]:
-                    self.show_bytes_figure(output["data"]["image/png"], self.interaction)
-                else:
-                    logger.info(
-                        f"{i}th output['data'] from nbclient outputs dont have image/png, continue next output ..."
-                    )
-            elif output["output_type"] == "execute_result":
-                output_text = output["data"]["text/plain"]
-            elif output["output_type"] == "error":
-                output_text, is_success = "\n".join(output["traceback"]), False
-
-            # handle coroutines that are not executed asynchronously
-            if output_text.strip().startswith("<coroutine object"):
-                output_text = "Executed code failed, you need use key word 'await' to run a async code."
-                is_success = False
-
-            output_text = remove_escape_and_color_codes(output_text)
-            # The useful information of the exception is at the end,
-            # the useful information of normal output is at the begining.
-            output_text = output_text[:keep_len] if is_success else output_text[-keep_len:]
-
-            parsed_output.append(output_text)
-        return is_success, ",".join(parsed_output)
+            is_success, output_text = self.parse_output(output, i, keep_len, is_success)
+            parsed_outputs.append(output_text)
+        return is_success, ",".join(parsed_outputs)
+
+    def parse_output(
+        self, output: NotebookNode, index: int = 0, keep_len: int = 2000, is_success: bool = True
+    ) -> Tuple[bool, str]:
+        """Parses an output received from notebook execution, `is_success` is the success of the previous outputs."""
+        output_text = ""
+        if output["output_type"] == "stream" and not any(
+            tag in output["text"]
+            for tag in ["| INFO     | metagpt", "| ERROR    | metagpt", "| WARNING  | metagpt", "DEBUG"]
+        ):
+            output_text = output["text"]
+        elif output["output_type"] == "display_data":
+            if "image/png" in output["data"]:
+                self.show_bytes_figure(output["data"]["image/png"], self.interaction)
+            else:
+                logger.info(
+                    f"{index}th output['data'] from nbclient outputs dont have image/png, continue next output ..."
+                )
+        elif output["output_type"] == "execute_result":
+            output_text = output["data"]["text/plain"]
+        elif output["output_type"] == "error":
+            output_text, is_success = "\n".join(output["traceback"]), False
+
+        # handle coroutines that are not executed asynchronously
+        if output_text.strip().startswith("<coroutine object"):
+            output_text = "Executed code failed, you need use key word 'await' to run a async code."
+            is_success = False
+
+        output_text = remove_escape_and_color_codes(output_text)
+        # The useful information of the exception is at the end,
+        # the useful information of normal output is at the begining.
+        output_text = output_text[:keep_len] if is_success else output_text[-keep_len:]
+        return is_success, output_text
+
+    @staticmethod
+    def _join_parsed_outputs(parsed_outputs: list[Tuple[bool, str]]) -> Tuple[bool, str]:
+        is_success = parsed_outputs[-1][0] if parsed_outputs else True
+        return is_success, ",".join(text for _, text in parsed_outputs)
+
+    def _on_output(self, output: NotebookNode):
+        is_success = self._parsed_outputs[-1][0] if self._parsed_outputs else True
+        self._parsed_outputs.append(self.parse_output(output, len(self._parsed_outputs), is_success=is_success))
+
+    def _on_clear_output(self):
+        self._parsed_outputs.clear()
 
     def show_bytes_figure(self, image_base64: str, interaction_type: Literal["ipython", None]):
         image_bytes = base64.b64decode(image_base64)
@@ -172,20 +211,23 @@ class ExecuteNbCode(Action):
         """set timeout for run code.
         returns the success or failure of the cell execution, and an optional error message.
         """
+        self._parsed_outputs = []
         try:
             await self.nb_client.async_execute_cell(cell, cell_index)
-            return self.parse_outputs(self.nb.cells[-1].outputs)
+            return self._join_parsed_outputs(self._parsed_outputs)
         except CellTimeoutError:
             assert self.nb_client.km is not None
             await self.nb_client.km.interrupt_kernel()
-            await asyncio.sleep(1)
+            # wait for the kernel to respond after the interruption, instead of sleeping for a fixed time
+            if not await self._kernel_pool.is_healthy(self._kernel):
+                await self.reset()
             error_msg = "Cell execution timed out: Execution exceeded the time limit and was stopped; consider optimizing your code for better performance."
             return False, error_msg
         except DeadKernelError:
             await self.reset()
             return False, "DeadKernelError"
         except Exception:
-            return self.parse_outputs(self.nb.cells[-1].outputs)
+            return self._join_parsed_outputs(self._parsed_outputs)
 
     async def run(self, code: str, language: Literal["python", "markdown"] = "python") -> Tuple[str, bool]:
         """
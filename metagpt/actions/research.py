@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Callable, Optional, Union
+from typing import Any, AsyncIterator, Callable, Optional, Union
 
-from pydantic import TypeAdapter, model_validator
+from pydantic import PrivateAttr, TypeAdapter, model_validator
 
 from metagpt.actions import Action
 from metagpt.config2 import config
@@ -187,6 +187,10 @@ class WebBrowseAndSummarize(Action):
     desc: str = "Explore the web and provide summaries of articles and webpages."
     browse_func: Union[Callable[[list[str]], None], None] = None
     web_browser_engine: Optional[WebBrowserEngine] = None
+    max_concurrency: int = 8
+    reduce_fan_in: int = 4
+
+    _semaphore: Optional[asyncio.Semaphore] = PrivateAttr(default=None)
 
     @model_validator(mode="after")
     def validate_engine_and_run_func(self):
@@ -216,35 +220,70 @@ class WebBrowseAndSummarize(Action):
         Returns:
             A dictionary containing the URLs as keys and their summaries as values.
         """
+        summaries = {u: s async for u, s in self.run_stream(url, *urls, query=query, system_text=system_text)}
+        return {u: summaries[u] for u in [url, *urls]}
+
+    async def run_stream(
+        self,
+        url: str,
+        *urls: str,
+        query: str,
+        system_text: str = RESEARCH_BASE_SYSTEM,
+    ) -> AsyncIterator[tuple[str, Optional[str]]]:
+        """Browse the web and yield the summary of each URL as soon as it is done.
+
+        The chunks of all the URLs are summarized concurrently, at most `max_concurrency` LLM calls at the same time
+        shared by all the runs of the action, and the chunk summaries of a URL are reduced as a tree of `reduce_fan_in`
+        summaries per LLM call, so the latency is about the depth of the tree instead of the number of chunks.
+
+        Args:
+            url: The main URL to browse.
+            urls: Additional URLs to browse.
+            query: The research question.
+            system_text: The system text.
+
+        Yields:
+            The URL and its summary, None if the content is not relevant.
+        """
         contents = await self.web_browser_engine.run(url, *urls)
         if not urls:
             contents = [contents]
 
-        summaries = {}
+        async def _summarize_url(u: str, content: str) -> tuple[str, Optional[str]]:
+            return u, await self._summarize_content(content, query, system_text)
+
+        tasks = [_summarize_url(u, content.inner_text) for u, content in zip([url, *urls], contents)]
+        for future in asyncio.as_completed(tasks):
+            yield await future
+
+    async def _summarize_content(self, content: str, query: str, system_text: str) -> Optional[str]:
+        # map: summarize the chunks concurrently, dropping the irrelevant ones as soon as they are answered
         prompt_template = WEB_BROWSE_AND_SUMMARIZE_PROMPT.format(query=query, content="{}")
-        for u, content in zip([url, *urls], contents):
-            content = content.inner_text
-            chunk_summaries = []
-            for prompt in generate_prompt_chunk(content, prompt_template, self.llm.model, system_text, 4096):
-                logger.debug(prompt)
-                summary = await self._aask(prompt, [system_text])
-                if summary == "Not relevant.":
-                    continue
-                chunk_summaries.append(summary)
-
-            if not chunk_summaries:
-                summaries[u] = None
-                continue
-
-            if len(chunk_summaries) == 1:
-                summaries[u] = chunk_summaries[0]
-                continue
-
-            content = "\n".join(chunk_summaries)
-            prompt = WEB_BROWSE_AND_SUMMARIZE_PROMPT.format(query=query, content=content)
+        prompts = generate_prompt_chunk(content, prompt_template, self.llm.model, system_text, 4096)
+        summaries = await asyncio.gather(*(self._summarize(prompt, system_text) for prompt in prompts))
+        summaries = [i for i in summaries if i is not None]
+
+        # reduce: summarize `reduce_fan_in` summaries at a time, level by level, until one is left
+        while len(summaries) > 1:
+            groups = [summaries[i : i + self.reduce_fan_in] for i in range(0, len(summaries), self.reduce_fan_in)]
+            summaries = await asyncio.gather(*(self._reduce(group, query, system_text) for group in groups))
+            summaries = [i for i in summaries if i is not None]
+        return summaries[0] if summaries else None
+
+    async def _summarize(self, prompt: str, system_text: str) -> Optional[str]:
+        """Summarize with a LLM call, None if not relevant"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        logger.debug(prompt)
+        async with self._semaphore:
             summary = await self._aask(prompt, [system_text])
-            summaries[u] = summary
-        return summaries
+        return None if summary.strip() == "Not relevant." else summary
+
+    async def _reduce(self, summaries: list[str], query: str, system_text: str) -> Optional[str]:
+        if len(summaries) == 1:
+            return summaries[0]
+        prompt = WEB_BROWSE_AND_SUMMARIZE_PROMPT.format(query=query, content="\n".join(summaries))
+        return await self._summarize(prompt, system_text)
 
 
 class ConductResearch(Action):
@@ -15,16 +15,15 @@
             5. Merged the `Config` class of send18:dev branch to take over the set/get operations of the Environment
             class.
 """
-import subprocess
-from pathlib import Path
-from typing import Tuple
+import asyncio
+from typing import AsyncIterator, Iterable, Optional, Tuple
 
 from pydantic import Field
 
 from metagpt.actions.action import Action
 from metagpt.logs import logger
 from metagpt.schema import RunCodeContext, RunCodeResult
-from metagpt.utils.exceptions import handle_exception
+from metagpt.utils.code_executor import get_code_executor
 
 PROMPT_TEMPLATE = """
 Role: You are a senior development and qa engineer, your role is summarize the code running result.
@@ -89,7 +88,9 @@ class RunCode(Action):
             return "", str(e)
         return namespace.get("result", ""), ""
 
-    async def run_script(self, working_directory, additional_python_paths=[], command=[]) -> Tuple[str, str]:
+    async def run_script(
+        self, working_directory, additional_python_paths=[], command=[], timeout: Optional[float] = None
+    ) -> Tuple[str, str]:
         working_directory = str(working_directory)
         additional_python_paths = [str(path) for path in additional_python_paths]
 
@@ -100,22 +101,14 @@ class RunCode(Action):
         additional_python_paths = [working_directory] + additional_python_paths
         additional_python_paths = ":".join(additional_python_paths)
         env["PYTHONPATH"] = additional_python_paths + ":" + env.get("PYTHONPATH", "")
-        RunCode._install_dependencies(working_directory=working_directory, env=env)
 
-        # Start the subprocess
-        process = subprocess.Popen(
-            command, cwd=working_directory, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env
-        )
-        logger.info(" ".join(command))
+        # Dependencies are installed once into the virtualenv cached by the hash of requirements.txt
+        executor = get_code_executor()
+        env = await executor.prepare_env(working_directory, env)
 
-        try:
-            # Wait for the process to complete, with a timeout
-            stdout, stderr = process.communicate(timeout=10)
-        except subprocess.TimeoutExpired:
-            logger.info("The command did not complete within the given timeout.")
-            process.kill()  # Kill the process if it times out
-            stdout, stderr = process.communicate()
-        return stdout.decode("utf-8"), stderr.decode("utf-8")
+        # Run the command without blocking the event loop, killed if it times out
+        result = await executor.run(command, cwd=working_directory, env=env, timeout=timeout)
+        return result.stdout, result.stderr
 
     async def run(self, *args, **kwargs) -> RunCodeResult:
         logger.info(f"Running {' '.join(self.i_context.command)}")
@@ -145,29 +138,27 @@ class RunCode(Action):
         rsp = await self._aask(prompt)
         return RunCodeResult(summary=rsp, stdout=outs, stderr=errs)
 
-    @staticmethod
-    @handle_exception(exception_type=subprocess.CalledProcessError)
-    def _install_via_subprocess(cmd, check, cwd, env):
-        return subprocess.run(cmd, check=check, cwd=cwd, env=env)
-
-    @staticmethod
-    def _install_requirements(working_directory, env):
-        file_path = Path(working_directory) / "requirements.txt"
-        if not file_path.exists():
-            return
-        if file_path.stat().st_size == 0:
-            return
-        install_command = ["python", "-m", "pip", "install", "-r", "requirements.txt"]
-        logger.info(" ".join(install_command))
-        RunCode._install_via_subprocess(install_command, check=True, cwd=working_directory, env=env)
-
-    @staticmethod
-    def _install_pytest(working_directory, env):
-        install_pytest_command = ["python", "-m", "pip", "install", "pytest"]
-        logger.info(" ".join(install_pytest_command))
-        RunCode._install_via_subprocess(install_pytest_command, check=True, cwd=working_directory, env=env)
-
-    @staticmethod
-    def _install_dependencies(working_directory, env):
-        RunCode._install_requirements(working_directory, env)
-        RunCode._install_pytest(working_directory, env)
+    @classmethod
+    async def run_many(
+        cls, i_contexts: Iterable[RunCodeContext], **kwargs
+    ) -> AsyncIterator[Tuple[RunCodeContext, RunCodeResult]]:
+        """Run several tests in parallel, e.g. one test file each, and yield each context with its result as soon as
+        it finishes. At most `max_workers` commands of the shared code executor run at the same time.
+
+        Example:
+            >>> async for i_context, result in RunCode.run_many(i_contexts, context=context, llm=llm):
+            ...     print(i_context.test_filename, result.summary)
+        """
+
+        async def _run(i_context: RunCodeContext):
+            return i_context, await cls(i_context=i_context, **kwargs).run()
+
+        tasks = [asyncio.ensure_future(_run(i)) for i in i_contexts]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            # the tests still running are cancelled if one raises or the iteration stops
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -164,7 +164,7 @@ class WriteCode(Action):
         if not task_doc:
             return ""
         if not task_doc.content:
-            task_doc = project_repo.docs.task.get(filename=task_doc.filename)
+            task_doc = await project_repo.docs.task.get(filename=task_doc.filename)
         m = json.loads(task_doc.content)
         code_filenames = m.get(TASK_LIST.key, []) if not use_inc else m.get(REFINED_TASK_LIST.key, [])
         codes = []
@@ -178,6 +178,8 @@ class WriteCode(Action):
             old_files = old_file_repo.all_files
             # Get the union of the files in the src and old workspaces
             union_files_list = list(set(src_files) | set(old_files))
+            src_docs = await src_file_repo.get_many([i for i in union_files_list if i != exclude])
+            src_docs = {doc.filename: doc for doc in src_docs if doc}
             for filename in union_files_list:
                 # Exclude the current file from the all code snippets
                 if filename == exclude:
@@ -193,7 +195,7 @@ class WriteCode(Action):
                     codes.insert(0, f"-----Now, {filename} to be rewritten\n```{doc.content}```\n=====")
                 # The code snippets are generated from the src workspace
                 else:
-                    doc = await src_file_repo.get(filename=filename)
+                    doc = src_docs.get(filename)
                     # If the file does not exist in the src workspace, skip it
                     if not doc:
                         continue
@@ -201,13 +203,11 @@ class WriteCode(Action):
 
         # Normal scenario
         else:
-            for filename in code_filenames:
-                # Exclude the current file to get the code snippets for generating the current file
-                if filename == exclude:
-                    continue
-                doc = await src_file_repo.get(filename=filename)
+            # Exclude the current file to get the code snippets for generating the current file
+            docs = await src_file_repo.get_many([i for i in code_filenames if i != exclude])
+            for doc in docs:
                 if not doc:
                     continue
-                codes.append(f"----- {filename}\n```{doc.content}```")
+                codes.append(f"----- {doc.filename}\n```{doc.content}```")
 
         return "\n".join(codes)
@@ -15,6 +15,7 @@ from metagpt.actions import WriteCode
 from metagpt.actions.action import Action
 from metagpt.const import REQUIREMENT_FILENAME
 from metagpt.logs import logger
+from metagpt.provider.rate_limiter import LLMPriority, llm_priority
 from metagpt.schema import CodingContext
 from metagpt.utils.common import CodeParser
 
@@ -133,7 +134,8 @@ class WriteCodeReview(Action):
 
     @retry(wait=wait_random_exponential(min=1, max=60), stop=stop_after_attempt(6))
     async def write_code_review_and_rewrite(self, context_prompt, cr_prompt, filename):
-        cr_rsp = await self._aask(context_prompt + cr_prompt)
+        with llm_priority(LLMPriority.LOW):
+            cr_rsp = await self._aask(context_prompt + cr_prompt)
         result = CodeParser.parse_block("Code Review Result", cr_rsp)
         if "LGTM" in result:
             return result, None
@@ -149,14 +151,16 @@ class WriteCodeReview(Action):
         k = self.context.config.code_review_k_times or 1
 
         for i in range(k):
-            format_example = FORMAT_EXAMPLE.format(filename=self.i_context.code_doc.filename)
-            task_content = self.i_context.task_doc.content if self.i_context.task_doc else ""
+            # Refetched on every pass, as the other files may be written meanwhile by a parallel Engineer. Unchanged
+            # files are served from the content cache of the reaction.
             code_context = await WriteCode.get_codes(
                 self.i_context.task_doc,
                 exclude=self.i_context.filename,
                 project_repo=self.repo.with_src_path(self.context.src_workspace),
                 use_inc=self.config.inc,
             )
+            format_example = FORMAT_EXAMPLE.format(filename=self.i_context.code_doc.filename)
+            task_content = self.i_context.task_doc.content if self.i_context.task_doc else ""
 
             ctx_list = [
                 "## System Design\n" + str(self.i_context.design_doc) + "\n",
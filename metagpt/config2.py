@@ -69,6 +69,7 @@ class Config(CLIParams, YamlModel):
     workspace: WorkspaceConfig = WorkspaceConfig()
     enable_longterm_memory: bool = False
     code_review_k_times: int = 2
+    llm_max_concurrency: int = 0  # max in-flight llm requests of the process, across all providers. 0 means unlimited
     agentops_api_key: str = ""
 
     # Will be removed in the future
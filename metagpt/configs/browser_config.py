@@ -18,3 +18,6 @@ class BrowserConfig(YamlModel):
     browser_type: Literal["chromium", "firefox", "webkit", "chrome", "firefox", "edge", "ie"] = "chromium"
     """If the engine is Playwright, the value should be one of "chromium", "firefox", or "webkit". If it is Selenium, the value
     should be either "chrome", "firefox", "edge", or "ie"."""
+    fast_path: bool = False
+    """If the engine is Playwright, fetch the pages by plain HTTP first, and load them by the browser only if they seem to
+    need javascript."""
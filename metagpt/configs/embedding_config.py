@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import field_validator
 
@@ -46,6 +46,12 @@ class EmbeddingConfig(YamlModel):
     embed_batch_size: Optional[int] = None
     dimensions: Optional[int] = None  # output dimension of embedding model
 
+    # the embeddings of the same model and text are cached, `sqlite` keeps them across runs
+    cache_backend: Literal["off", "memory", "sqlite"] = "memory"
+    cache_path: str = ""  # sqlite file path, default to ~/.metagpt/embedding_cache.sqlite
+    cache_max_size: int = 10000  # max number of cached embeddings, the least recently used are evicted first
+    batch_window: float = 0.01  # seconds to wait for more texts to embed in the same call
+
     @field_validator("api_type", mode="before")
     @classmethod
     def check_api_type(cls, v):
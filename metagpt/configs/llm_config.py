@@ -6,7 +6,7 @@
 @File    : llm_config.py
 """
 from enum import Enum
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import field_validator
 
@@ -39,6 +39,20 @@ class LLMType(Enum):
         return self.OPENAI
 
 
+class LLMCacheConfig(YamlModel):
+    """Config for the LLM response cache
+
+    mode: `off` disables the cache; `record` serves cached responses and records new ones;
+        `replay` serves cached responses only and fails on a miss, for deterministic offline reruns.
+    """
+
+    mode: Literal["off", "record", "replay"] = "off"
+    backend: Literal["memory", "sqlite"] = "memory"
+    path: str = ""  # sqlite file path, default to ~/.metagpt/llm_response_cache.sqlite
+    max_size: int = 4096  # max number of cached responses, the least recently used are evicted first
+    ttl: float = 0  # seconds, 0 means never expire
+
+
 class LLMConfig(YamlModel):
     """Config for LLM
 
@@ -86,10 +100,22 @@ class LLMConfig(YamlModel):
 
     # For Network
     proxy: Optional[str] = None
+    max_connections: Optional[int] = None  # connection pool size of the shared client
+    max_keepalive_connections: Optional[int] = None
+    keepalive_expiry: Optional[float] = None  # seconds
+
+    # Rate Limit, shared by all llm instances of the same provider/model. 0 means unlimited.
+    rpm: int = 0  # max requests per minute
+    tpm: int = 0  # max input tokens per minute
+    max_concurrency: int = 0  # max in-flight requests
+    rate_limit_max_retries: int = 3  # retries on rate limit errors, respecting the `Retry-After` header
 
     # Cost Control
     calc_usage: bool = True
 
+    # Response Cache
+    cache: LLMCacheConfig = LLMCacheConfig()
+
     @field_validator("api_key")
     @classmethod
     def check_llm_key(cls, v):
@@ -13,7 +13,9 @@ from metagpt.utils.yaml_model import YamlModel
 class MermaidConfig(YamlModel):
     """Config for Mermaid"""
 
-    engine: Literal["nodejs", "ink", "playwright", "pyppeteer", "none"] = "nodejs"
+    engine: Literal["nodejs", "ink", "playwright", "pyppeteer", "fake", "none"] = "nodejs"
     path: str = "mmdc"  # mmdc
     puppeteer_config: str = ""
     pyppeteer_path: str = "/usr/bin/google-chrome-stable"
+    cache: bool = True  # cache the rendered diagrams on disk by the hash of the mermaid code and the render config
+    cache_dir: str = ""  # default ~/.metagpt/mermaid_cache
@@ -14,7 +14,7 @@ from pydantic import BaseModel, ConfigDict
 from metagpt.config2 import Config
 from metagpt.configs.llm_config import LLMConfig, LLMType
 from metagpt.provider.base_llm import BaseLLM
-from metagpt.provider.llm_provider_registry import create_llm_instance
+from metagpt.provider.llm_provider_registry import get_llm_instance
 from metagpt.utils.cost_manager import (
     CostManager,
     FireworksCostManager,
@@ -88,17 +88,15 @@ class Context(BaseModel):
             return self.cost_manager
 
     def llm(self) -> BaseLLM:
-        """Return a LLM instance, fixme: support cache"""
-        # if self._llm is None:
-        self._llm = create_llm_instance(self.config.llm)
+        """Return a LLM instance sharing the cached client of `config.llm`"""
+        self._llm = get_llm_instance(self.config.llm)
         if self._llm.cost_manager is None:
             self._llm.cost_manager = self._select_costmanager(self.config.llm)
         return self._llm
 
     def llm_with_cost_manager_from_llm_config(self, llm_config: LLMConfig) -> BaseLLM:
-        """Return a LLM instance, fixme: support cache"""
-        # if self._llm is None:
-        llm = create_llm_instance(llm_config)
+        """Return a LLM instance sharing the cached client of `llm_config`"""
+        llm = get_llm_instance(llm_config)
         if llm.cost_manager is None:
             llm.cost_manager = self._select_costmanager(llm_config)
         return llm
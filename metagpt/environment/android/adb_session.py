@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : A persistent `adb shell` session of a device. Shell commands are written to one long-lived shell process and
+#           their outputs are delimited by markers, so an agent step costs no process spawn per command. Binary outputs,
+#           such as screenshots, are streamed with `adb exec-out` straight into memory.
+
+import queue
+import shlex
+import subprocess
+import threading
+import uuid
+from typing import Optional, Union
+
+from metagpt.logs import logger
+
+
+class AdbSession:
+    """Run shell commands of the device `device_id` in a persistent `adb shell` process.
+
+    The commands of concurrent callers are serialized on the session, the commands of a batch are written at once and
+    their outputs read back in order. The shell is restarted on the next command after it dies or times out.
+
+    Example:
+        >>> session = AdbSession("emulator-5554")
+        >>> session.shell("wm size")
+        (0, 'Physical size: 1080x2340')
+        >>> session.batch(["input tap 100 200", "input keyevent KEYCODE_BACK"])
+        [(0, ''), (0, '')]
+    """
+
+    def __init__(self, device_id: str, adb_path: Union[str, list[str]] = "adb", timeout: float = 30):
+        self.device_id = device_id
+        self.adb = shlex.split(adb_path) if isinstance(adb_path, str) else list(adb_path)
+        self.timeout = timeout
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: Optional[queue.Queue] = None
+        self._lock = threading.Lock()
+        self._marker = f"__METAGPT_ADB_{uuid.uuid4().hex}__"
+
+    @property
+    def adb_args(self) -> list[str]:
+        return [*self.adb, "-s", self.device_id]
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def shell(self, cmd: str) -> tuple[int, str]:
+        """Run a shell command, return its exit code and its stdout. The exit code is -1 if the shell failed."""
+        return self.batch([cmd])[0]
+
+    def batch(self, cmds: list[str]) -> list[tuple[int, str]]:
+        """Run shell commands in order within one write to the shell, e.g. the steps of a multi-step gesture"""
+        if not cmds:
+            return []
+        with self._lock:
+            try:
+                self._ensure_started()
+                script = "".join(f"{cmd} </dev/null\necho {self._marker}$?\n" for cmd in cmds)
+                self._proc.stdin.write(script)
+                self._proc.stdin.flush()
+                return [self._read_result() for _ in cmds]
+            except (OSError, TimeoutError, EOFError) as e:
+                logger.warning(f"adb shell of {self.device_id} failed: {e}, restart it on the next command")
+                self._stop()
+                return [(-1, "")] * len(cmds)
+
+    def exec_out(self, cmd: str) -> Optional[bytes]:
+        """Run a command with `adb exec-out` and return its raw stdout, None if failed"""
+        try:
+            res = subprocess.run(
+                [*self.adb_args, "exec-out", *shlex.split(cmd)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=self.timeout,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"adb exec-out `{cmd}` failed: {e}")
+            return None
+        if res.returncode:
+            logger.warning(f"adb exec-out `{cmd}` failed: {res.stderr.decode(errors='ignore').strip()}")
+            return None
+        return res.stdout
+
+    def close(self):
+        with self._lock:
+            self._stop()
+
+    def __enter__(self) -> "AdbSession":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _ensure_started(self):
+        if self.alive:
+            return
+        self._stop()
+        self._proc = subprocess.Popen(
+            [*self.adb_args, "shell"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        self._lines = queue.Queue()
+        # a reader thread, so that a hanging device times out instead of blocking the caller forever
+        threading.Thread(target=_pump, args=(self._proc.stdout, self._lines), daemon=True).start()
+
+    def _read_result(self) -> tuple[int, str]:
+        output = []
+        while True:
+            try:
+                line = self._lines.get(timeout=self.timeout)
+            except queue.Empty:
+                raise TimeoutError(f"no output in {self.timeout}s")
+            if line is None:
+                raise EOFError("the shell exited")
+            text, sep, code = line.partition(self._marker)
+            if sep:
+                output.append(text)  # the output may not end with a newline
+                return int(code.strip() or -1), "".join(output).strip()
+            output.append(line)
+
+    def _stop(self):
+        if self._proc is None:
+            return
+        try:
+            self._proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+        self._proc = None
+        self._lines = None
+
+
+def _pump(stream, lines: queue.Queue):
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 # @Desc   : The Android external environment to integrate with Android apps
 import subprocess
-import time
+from io import BytesIO
 from pathlib import Path
 from typing import Any, Optional
 
@@ -10,9 +10,10 @@ import clip
 from modelscope.pipelines import pipeline
 from modelscope.utils.constant import Tasks
 from PIL import Image
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from metagpt.const import DEFAULT_WORKSPACE_ROOT
+from metagpt.environment.android.adb_session import AdbSession
 from metagpt.environment.android.const import ADB_EXEC_FAIL
 from metagpt.environment.android.env_space import (
     EnvAction,
@@ -52,6 +53,9 @@ class AndroidExtEnv(ExtEnv):
     ocr_detection: any = Field(default=None, description="ocr detection model")
     ocr_recognition: any = Field(default=None, description="ocr recognition model")
     groundingdino_model: any = Field(default=None, description="clip groundingdino model")
+    adb_path: str = Field(default="adb", description="adb executable, or the command line to run it")
+
+    _adb_session: Optional[AdbSession] = PrivateAttr(default=None)
 
     def __init__(self, **data: Any):
         super().__init__(**data)
@@ -134,23 +138,49 @@ class AndroidExtEnv(ExtEnv):
         """adb cmd prefix with `device_id`"""
         return f"adb -s {self.device_id} "
 
+    @property
+    def adb_session(self) -> AdbSession:
+        """The persistent `adb shell` session of the device"""
+        if self._adb_session is None:
+            self._adb_session = AdbSession(self.device_id, adb_path=self.adb_path)
+        return self._adb_session
+
     def execute_adb_with_cmd(self, adb_cmd: str) -> str:
         adb_cmd = adb_cmd.replace("\\", "/")
+        if self.device_id and adb_cmd.startswith(self.adb_prefix_shell):
+            # shell commands run in the persistent session instead of a new adb process
+            code, output = self.adb_session.shell(adb_cmd[len(self.adb_prefix_shell) :].strip())
+            return ADB_EXEC_FAIL if code else output
+        if adb_cmd.startswith("adb "):
+            adb_cmd = self.adb_path + adb_cmd[3:]
         res = subprocess.run(adb_cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
         exec_res = ADB_EXEC_FAIL
         if not res.returncode:
             exec_res = res.stdout.strip()
         return exec_res
 
+    def execute_adb_batch(self, shell_cmds: list[str]) -> list[str]:
+        """Run shell commands in order in one round trip to the device, the output of each or `ADB_EXEC_FAIL`"""
+        return [ADB_EXEC_FAIL if code else output for code, output in self.adb_session.batch(shell_cmds)]
+
+    def execute_adb_exec_out(self, cmd: str) -> Optional[bytes]:
+        """Run a command with `adb exec-out`, the raw stdout or None if failed"""
+        return self.adb_session.exec_out(cmd)
+
+    def close(self):
+        if self._adb_session is not None:
+            self._adb_session.close()
+            self._adb_session = None
+
     def create_device_path(self, folder_path: Path):
-        adb_cmd = f"{self.adb_prefix_shell} mkdir {folder_path} -p"
+        adb_cmd = f"{self.adb_prefix_shell}mkdir {folder_path} -p"
         res = self.execute_adb_with_cmd(adb_cmd)
         if res == ADB_EXEC_FAIL:
             raise RuntimeError(f"create device path: {folder_path} failed")
 
     @property
     def device_shape(self) -> tuple[int, int]:
-        adb_cmd = f"{self.adb_prefix_shell} wm size"
+        adb_cmd = f"{self.adb_prefix_shell}wm size"
         shape = (0, 0)
         shape_res = self.execute_adb_with_cmd(adb_cmd)
         if shape_res != ADB_EXEC_FAIL:
@@ -166,75 +196,70 @@ class AndroidExtEnv(ExtEnv):
             devices = [device.split()[0] for device in devices]
         return devices
 
+    def capture_screenshot(self) -> Optional[Image.Image]:
+        """The screenshot streamed into memory, None if failed"""
+        png = self.execute_adb_exec_out("screencap -p")
+        if not png:
+            return None
+        image = Image.open(BytesIO(png))
+        image.load()
+        return image
+
+    def dump_xml(self) -> str:
+        """The xml of the UI hierarchy streamed from uiautomator, or `ADB_EXEC_FAIL`"""
+        res = self.execute_adb_with_cmd(f"{self.adb_prefix_shell}uiautomator dump /dev/tty")
+        end = res.rfind("</hierarchy>")
+        if res == ADB_EXEC_FAIL or end < 0:
+            return ADB_EXEC_FAIL
+        # followed by `UI hierchary dumped to: /dev/tty`
+        return res[res.find("<") : end + len("</hierarchy>")]
+
     @mark_as_readable
     def get_screenshot(self, ss_name: str, local_save_dir: Path) -> Path:
         """
         ss_name: screenshot file name
         local_save_dir: local dir to store image from virtual machine
         """
-        assert self.screenshot_dir
-        ss_remote_path = Path(self.screenshot_dir).joinpath(f"{ss_name}.png")
-        ss_cmd = f"{self.adb_prefix_shell} screencap -p {ss_remote_path}"
-        ss_res = self.execute_adb_with_cmd(ss_cmd)
-        time.sleep(0.1)
-        res = ADB_EXEC_FAIL
-        if ss_res != ADB_EXEC_FAIL:
-            ss_local_path = Path(local_save_dir).joinpath(f"{ss_name}.png")
-            pull_cmd = f"{self.adb_prefix} pull {ss_remote_path} {ss_local_path}"
-            pull_res = self.execute_adb_with_cmd(pull_cmd)
-            time.sleep(0.1)
-            if pull_res != ADB_EXEC_FAIL:
-                res = ss_local_path
-        else:
-            ss_cmd = f"{self.adb_prefix_shell} rm /sdcard/{ss_name}.png"
-            ss_res = self.execute_adb_with_cmd(ss_cmd)
-            time.sleep(0.1)
-            ss_cmd = f"{self.adb_prefix_shell} screencap -p /sdcard/{ss_name}.png"
-            ss_res = self.execute_adb_with_cmd(ss_cmd)
-            time.sleep(0.1)
-            ss_cmd = f"{self.adb_prefix} pull /sdcard/{ss_name}.png {self.screenshot_dir}"
-            ss_res = self.execute_adb_with_cmd(ss_cmd)
-            image_path = Path(f"{self.screenshot_dir}/{ss_name}.png")
-            res = image_path
-        return Path(res)
+        png = self.execute_adb_exec_out("screencap -p")
+        if not png:
+            return Path(ADB_EXEC_FAIL)
+        ss_local_path = Path(local_save_dir).joinpath(f"{ss_name}.png")
+        ss_local_path.parent.mkdir(parents=True, exist_ok=True)
+        ss_local_path.write_bytes(png)
+        return ss_local_path
 
     @mark_as_readable
     def get_xml(self, xml_name: str, local_save_dir: Path) -> Path:
-        xml_remote_path = Path(self.xml_dir).joinpath(f"{xml_name}.xml")
-        dump_cmd = f"{self.adb_prefix_shell} uiautomator dump {xml_remote_path}"
-        xml_res = self.execute_adb_with_cmd(dump_cmd)
-
-        res = ADB_EXEC_FAIL
-        if xml_res != ADB_EXEC_FAIL:
-            xml_local_path = Path(local_save_dir).joinpath(f"{xml_name}.xml")
-            pull_cmd = f"{self.adb_prefix} pull {xml_remote_path} {xml_local_path}"
-            pull_res = self.execute_adb_with_cmd(pull_cmd)
-            if pull_res != ADB_EXEC_FAIL:
-                res = xml_local_path
-        return Path(res)
+        xml = self.dump_xml()
+        if xml == ADB_EXEC_FAIL:
+            return Path(ADB_EXEC_FAIL)
+        xml_local_path = Path(local_save_dir).joinpath(f"{xml_name}.xml")
+        xml_local_path.parent.mkdir(parents=True, exist_ok=True)
+        xml_local_path.write_text(xml, encoding="utf-8")
+        return xml_local_path
 
     @mark_as_writeable
     def system_back(self) -> str:
-        adb_cmd = f"{self.adb_prefix_si} keyevent KEYCODE_BACK"
+        adb_cmd = f"{self.adb_prefix_si}keyevent KEYCODE_BACK"
         back_res = self.execute_adb_with_cmd(adb_cmd)
         return back_res
 
     @mark_as_writeable
     def system_tap(self, x: int, y: int) -> str:
-        adb_cmd = f"{self.adb_prefix_si} tap {x} {y}"
+        adb_cmd = f"{self.adb_prefix_si}tap {x} {y}"
         tap_res = self.execute_adb_with_cmd(adb_cmd)
         return tap_res
 
     @mark_as_writeable
     def user_input(self, input_txt: str) -> str:
         input_txt = input_txt.replace(" ", "%s").replace("'", "")
-        adb_cmd = f"{self.adb_prefix_si} text {input_txt}"
+        adb_cmd = f"{self.adb_prefix_si}text {input_txt}"
         input_res = self.execute_adb_with_cmd(adb_cmd)
         return input_res
 
     @mark_as_writeable
     def user_longpress(self, x: int, y: int, duration: int = 500) -> str:
-        adb_cmd = f"{self.adb_prefix_si} swipe {x} {y} {x} {y} {duration}"
+        adb_cmd = f"{self.adb_prefix_si}swipe {x} {y} {x} {y} {duration}"
         press_res = self.execute_adb_with_cmd(adb_cmd)
         return press_res
 
@@ -258,19 +283,24 @@ class AndroidExtEnv(ExtEnv):
             return ADB_EXEC_FAIL
 
         duration = 100 if if_quick else 400
-        adb_cmd = f"{self.adb_prefix_si} swipe {x} {y} {x + offset[0]} {y + offset[1]} {duration}"
+        adb_cmd = f"{self.adb_prefix_si}swipe {x} {y} {x + offset[0]} {y + offset[1]} {duration}"
         swipe_res = self.execute_adb_with_cmd(adb_cmd)
         return swipe_res
 
     @mark_as_writeable
     def user_swipe_to(self, start: tuple[int, int], end: tuple[int, int], duration: int = 400) -> str:
-        adb_cmd = f"{self.adb_prefix_si} swipe {start[0]} {start[1]} {end[0]} {end[1]} {duration}"
+        adb_cmd = f"{self.adb_prefix_si}swipe {start[0]} {start[1]} {end[0]} {end[1]} {duration}"
         swipe_res = self.execute_adb_with_cmd(adb_cmd)
         return swipe_res
 
+    @mark_as_writeable
+    def user_batch_input(self, input_cmds: list[str]) -> list[str]:
+        """Run `input` commands, e.g. ["tap 100 200", "text hello", "keyevent KEYCODE_ENTER"], in one round trip"""
+        return self.execute_adb_batch([f"input {cmd}" for cmd in input_cmds])
+
     @mark_as_writeable
     def user_exit(self) -> str:
-        adb_cmd = f"{self.adb_prefix_shell} am start -a android.intent.action.MAIN -c android.intent.category.HOME"
+        adb_cmd = f"{self.adb_prefix_shell}am start -a android.intent.action.MAIN -c android.intent.category.HOME"
         exit_res = self.execute_adb_with_cmd(adb_cmd)
         return exit_res
 
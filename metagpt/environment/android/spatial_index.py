@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : Spatial helpers of the UI elements and detected boxes of a screenshot: a grid-bucket index for the
+#           min-distance suppression of element centers, and the non-maximum suppression of boxes over NumPy arrays.
+
+import math
+from collections import defaultdict
+from typing import Sequence
+
+import numpy as np
+
+Point = tuple[int, int]
+
+
+class GridIndex:
+    """Points bucketed in square cells of `cell_size`, so that the points near a point are found in the few cells
+    around it instead of among all the points"""
+
+    def __init__(self, cell_size: float):
+        self.cell_size = max(cell_size, 1)
+        self._cells: dict[tuple[int, int], list[Point]] = defaultdict(list)
+
+    def __len__(self):
+        return sum(len(i) for i in self._cells.values())
+
+    def add(self, point: Point):
+        self._cells[self._cell(point)].append(point)
+
+    def has_near(self, point: Point, radius: float) -> bool:
+        """Whether a point of the index is within `radius` of the point, bounds included"""
+        x, y = point
+        cell_x, cell_y = self._cell(point)
+        reach = math.ceil(radius / self.cell_size)
+        for i in range(cell_x - reach, cell_x + reach + 1):
+            for j in range(cell_y - reach, cell_y + reach + 1):
+                for x_, y_ in self._cells.get((i, j), ()):
+                    if (x - x_) ** 2 + (y - y_) ** 2 <= radius**2:
+                        return True
+        return False
+
+    def _cell(self, point: Point) -> tuple[int, int]:
+        return int(point[0] // self.cell_size), int(point[1] // self.cell_size)
+
+
+def nms_boxes(boxes: Sequence[Sequence[float]], iou_threshold: float = 0.5) -> np.ndarray:
+    """Greedy non-maximum suppression in the order of the boxes, the earlier box is kept. Boxes are (x1, y1, x2, y2).
+    Return the indices of the kept boxes."""
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = np.arange(len(boxes))
+    keep = []
+    while order.size:
+        i, rest = order[0], order[1:]
+        keep.append(i)
+        inter_w = np.maximum(0, np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]))
+        inter_h = np.maximum(0, np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]))
+        inter = inter_w * inter_h
+        union = areas[i] + areas[rest] - inter
+        with np.errstate(divide="ignore", invalid="ignore"):
+            iou = np.where(union > 0, inter / union, 0)
+        order = rest[iou < iou_threshold]
+    return np.asarray(keep, dtype=int)
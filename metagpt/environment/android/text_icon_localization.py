@@ -14,6 +14,8 @@ from groundingdino.util.slconfig import SLConfig
 from groundingdino.util.utils import clean_state_dict, get_phrases_from_posmap
 from PIL import Image
 
+from metagpt.environment.android.spatial_index import nms_boxes
+
 ################################## text_localization using ocr #######################
 
 
@@ -308,25 +310,12 @@ def get_grounding_output(
 
 
 def remove_boxes(boxes_filt: any, size: any, iou_threshold: float = 0.5) -> any:
-    boxes_to_remove = set()
-
-    for i in range(len(boxes_filt)):
-        if calculate_size(boxes_filt[i]) > 0.05 * size[0] * size[1]:
-            boxes_to_remove.add(i)
-        for j in range(len(boxes_filt)):
-            if calculate_size(boxes_filt[j]) > 0.05 * size[0] * size[1]:
-                boxes_to_remove.add(j)
-            if i == j:
-                continue
-            if i in boxes_to_remove or j in boxes_to_remove:
-                continue
-            iou = calculate_iou(boxes_filt[i], boxes_filt[j])
-            if iou >= iou_threshold:
-                boxes_to_remove.add(j)
-
-    boxes_filt = [box for idx, box in enumerate(boxes_filt) if idx not in boxes_to_remove]
-
-    return boxes_filt
+    """Drop the boxes larger than 5% of the image, then suppress the overlapping ones in their order"""
+    boxes = np.asarray(boxes_filt, dtype=np.float64).reshape(-1, 4)
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    small = np.flatnonzero(areas <= 0.05 * size[0] * size[1])
+    keep = small[nms_boxes(boxes[small], iou_threshold)]
+    return [boxes_filt[i] for i in keep]
 
 
 def det(
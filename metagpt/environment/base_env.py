@@ -4,13 +4,23 @@
 
 import asyncio
 from abc import abstractmethod
+from collections import deque
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Set, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Set, Union
 
 from gymnasium import spaces
 from gymnasium.core import ActType, ObsType
-from pydantic import BaseModel, ConfigDict, Field, SerializeAsAny, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    SerializeAsAny,
+    computed_field,
+    model_validator,
+)
 
+from metagpt.const import MESSAGE_ROUTE_TO_ALL
 from metagpt.context import Context
 from metagpt.environment.api.env_api import (
     EnvAPIAbstract,
@@ -18,9 +28,10 @@ from metagpt.environment.api.env_api import (
     WriteAPIRegistry,
 )
 from metagpt.environment.base_env_space import BaseEnvAction, BaseEnvObsParams
+from metagpt.environment.scheduler import RoleScheduler
 from metagpt.logs import logger
 from metagpt.schema import Message
-from metagpt.utils.common import get_function_schema, is_coroutine_func, is_send_to
+from metagpt.utils.common import get_function_schema, is_coroutine_func
 
 if TYPE_CHECKING:
     from metagpt.roles.role import Role  # noqa: F401
@@ -131,9 +142,17 @@ class Environment(ExtEnv):
     desc: str = Field(default="")  # 环境描述
     roles: dict[str, SerializeAsAny["Role"]] = Field(default_factory=dict, validate_default=True)
     member_addrs: Dict["Role", Set] = Field(default_factory=dict, exclude=True)
-    history: str = ""  # For debug
+    history_maxlen: int = Field(default=1000, exclude=True)  # max messages kept in `history`, 0 for no limit
+    event_driven: bool = Field(default=False, exclude=True)  # only run the roles woken up by new messages in a round
+    max_concurrency: int = Field(default=0, exclude=True)  # max roles running at the same time if event driven
     context: Context = Field(default_factory=Context, exclude=True)
 
+    _addr_index: dict[str, dict["Role", None]] = PrivateAttr(default_factory=dict)  # address -> roles, ordered set
+    _history: deque = PrivateAttr(default_factory=deque)  # the most recent published messages
+    _loaded_history: str = PrivateAttr(default="")  # `history` deserialized from the older format
+    _scheduler: RoleScheduler = PrivateAttr(default_factory=RoleScheduler)
+    _listeners: list[Callable[[Message], None]] = PrivateAttr(default_factory=list)  # notified of published messages
+
     def reset(
         self,
         *,
@@ -148,11 +167,34 @@ class Environment(ExtEnv):
     def step(self, action: BaseEnvAction) -> tuple[dict[str, Any], float, bool, bool, dict[str, Any]]:
         pass
 
+    @model_validator(mode="wrap")
+    @classmethod
+    def load_history(cls, data: Any, handler):
+        history = ""
+        if isinstance(data, dict) and "history" in data:
+            data = dict(data)
+            history = data.pop("history") or ""
+        env = handler(data)
+        env._loaded_history = history
+        env._history = deque(env._history, maxlen=env.history_maxlen or None)
+        return env
+
     @model_validator(mode="after")
     def init_roles(self):
         self.add_roles(self.roles.values())
         return self
 
+    @computed_field
+    @property
+    def history(self) -> str:
+        """For debug, the text of the most recent `history_maxlen` published messages"""
+        return self._loaded_history + "".join(f"\n{message}" for message in self._history)
+
+    @property
+    def history_messages(self) -> list[Message]:
+        """The most recent `history_maxlen` published messages"""
+        return list(self._history)
+
     def add_role(self, role: "Role"):
         """增加一个在当前环境的角色
         Add a role in the current environment
@@ -181,23 +223,39 @@ class Environment(ExtEnv):
         route the message to the message recipient is a problem addressed by the transport framework designed
         in RFC 113.
         """
-        logger.debug(f"publish_message: {message.dump()}")
-        found = False
+        logger.opt(lazy=True).debug("publish_message: {}", message.dump)
         # According to the routing feature plan in Chapter 2.2.3.2 of RFC 113
-        for role, addrs in self.member_addrs.items():
-            if is_send_to(message, addrs):
-                role.put_message(message)
-                found = True
-        if not found:
+        if MESSAGE_ROUTE_TO_ALL in message.send_to:
+            recipients = self.member_addrs.keys()
+        else:
+            recipients = {}
+            for addr in message.send_to:
+                recipients.update(self._addr_index.get(addr, {}))
+        for role in recipients:
+            role.put_message(message)
+            self._scheduler.wake_up(role)
+        if not recipients:
             logger.warning(f"Message no recipients: {message.dump()}")
-        self.history += f"\n{message}"  # For debug
+        self._history.append(message)  # For debug
+        for listener in self._listeners:
+            listener(message)
 
         return True
 
+    def add_listener(self, listener: Callable[[Message], None]):
+        """Call the listener with each message published in the environment, e.g. to report the progress of a team"""
+        self._listeners.append(listener)
+
     async def run(self, k=1):
         """处理一次所有信息的运行
         Process all Role runs at once
         """
+        if self.event_driven:
+            self._scheduler.max_concurrency = self.max_concurrency
+            for _ in range(k):
+                await self._scheduler.run_round()
+            return
+
         for _ in range(k):
             futures = []
             for role in self.roles.values():
@@ -225,6 +283,8 @@ class Environment(ExtEnv):
     @property
     def is_idle(self):
         """If true, all actions have been executed."""
+        if self.event_driven:
+            return self._scheduler.is_idle
         for r in self.roles.values():
             if not r.is_idle:
                 return False
@@ -236,7 +296,15 @@ class Environment(ExtEnv):
 
     def set_addresses(self, obj, addresses):
         """Set the addresses of the object"""
+        for addr in self.member_addrs.get(obj, set()):
+            roles = self._addr_index.get(addr, {})
+            roles.pop(obj, None)
+            if not roles:
+                self._addr_index.pop(addr, None)
         self.member_addrs[obj] = addresses
+        for addr in addresses:
+            self._addr_index.setdefault(addr, {})[obj] = None
+        self._scheduler.add(obj)
 
     def archive(self, auto_archive=True):
         if auto_archive and self.context.git_repo:
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Time    : 2026/10/18
+@File    : scheduler.py
+@Desc    : Event-driven scheduler of the roles in an environment. A role is woken up when messages are delivered to
+    its msg_buffer, and only the woken roles run in a round, so the cost of a round scales with the active roles
+    instead of all the roles.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from metagpt.logs import logger
+
+if TYPE_CHECKING:
+    from metagpt.roles.role import Role
+
+
+class RoleScheduler:
+    """Run the woken roles round by round. Messages published in a round wake their recipients for the next round,
+    the same as running all the roles in every round. The roles woken first are started first, and at most
+    `max_concurrency` roles run at the same time, 0 for no limit.
+    """
+
+    def __init__(self, max_concurrency: int = 0):
+        self.max_concurrency = max_concurrency
+        self._events: dict["Role", asyncio.Event] = {}
+        self._ready: dict["Role", None] = {}  # woken roles in the order of wake-up, an ordered set
+
+    def add(self, role: "Role"):
+        """Track a role, which is woken up at once if it has pending work, e.g. recovered from serialization"""
+        self._events.setdefault(role, asyncio.Event())
+        if not role.is_idle or role.recovered:
+            self.wake_up(role)
+
+    def remove(self, role: "Role"):
+        self._events.pop(role, None)
+        self._ready.pop(role, None)
+
+    def wake_up(self, role: "Role"):
+        event = self._events.get(role)
+        if event is None or event.is_set():
+            return
+        event.set()
+        self._ready[role] = None
+
+    def is_ready(self, role: "Role") -> bool:
+        event = self._events.get(role)
+        return bool(event and event.is_set())
+
+    @property
+    def is_idle(self) -> bool:
+        """If true, no role has been woken up"""
+        return not self._ready
+
+    async def run_round(self) -> int:
+        """Run the woken roles once, and return the number of roles run"""
+        roles = list(self._ready)
+        self._ready.clear()
+        for role in roles:
+            self._events[role].clear()
+        if not roles:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.max_concurrency or len(roles))
+
+        async def _run(role: "Role"):
+            async with semaphore:
+                await role.run()
+
+        logger.debug(f"run {len(roles)} woken roles: {[role.name for role in roles]}")
+        await asyncio.gather(*[_run(role) for role in roles])
+        return len(roles)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : Pathfinding on the collision maze of StanfordTownExtEnv. The walkable grid is built once, routes are found with
+#           A* or a multi-target BFS, and the routes already found are cached until the collision maze changes.
+
+import heapq
+from collections import OrderedDict, deque
+from typing import Iterable, Optional
+
+import numpy as np
+
+Tile = tuple[int, int]  # (x, y)
+
+
+class MazePathFinder:
+    """Shortest 4-connected paths between the walkable tiles of a collision maze.
+
+    Paths are lists of (x, y) tiles from the start tile to the end tile, both included. An unreachable end tile gives
+    `[end]`, as the path finder of generative agents does.
+    """
+
+    def __init__(self, collision_maze: list[list], collision_block_char: str, cache_size: int = 4096):
+        self.collision_maze = collision_maze
+        self.collision_block_char = collision_block_char
+        self.cache_size = cache_size
+        self.walkable: np.ndarray = np.array(collision_maze) != collision_block_char  # indexed by [y, x]
+        self.height, self.width = self.walkable.shape
+        self._walkable = self.walkable.ravel().tolist()  # flat python list, faster to index in the search loops
+        self._routes: OrderedDict[tuple[Tile, Tile], tuple[Tile, ...]] = OrderedDict()
+
+    def invalidate(self):
+        """Rebuild the walkable grid and drop the cached routes, after the collision maze is changed in place"""
+        self.walkable = np.array(self.collision_maze) != self.collision_block_char
+        self.height, self.width = self.walkable.shape
+        self._walkable = self.walkable.ravel().tolist()
+        self._routes.clear()
+
+    def find_path(self, start: Iterable[int], end: Iterable[int]) -> list[Tile]:
+        """A* with a binary heap and the manhattan distance as heuristic"""
+        start, end = _tile(start), _tile(end)
+        route = self._cached(start, end)
+        if route is not None:
+            return list(route)
+        if start == end:
+            return [start]
+
+        width, walkable = self.width, self._walkable
+        source, target = self._index(start), self._index(end)
+        end_x, end_y = end
+        g_scores = {source: 0}
+        parents = {source: -1}
+        heap = [(abs(start[0] - end_x) + abs(start[1] - end_y), 0, source)]
+        while heap:
+            _, g, current = heapq.heappop(heap)
+            if current == target:
+                path = self._backtrack(parents, target)
+                self._cache(path)
+                return path
+            if g > g_scores[current]:
+                continue  # a stale entry of the heap
+            for neighbor in self._neighbors(current):
+                if not walkable[neighbor] or g + 1 >= g_scores.get(neighbor, g + 2):
+                    continue
+                g_scores[neighbor] = g + 1
+                parents[neighbor] = current
+                y, x = divmod(neighbor, width)
+                heapq.heappush(heap, (g + 1 + abs(x - end_x) + abs(y - end_y), g + 1, neighbor))
+        return [end]
+
+    def find_nearest_path(self, start: Iterable[int], targets: Iterable[Iterable[int]]) -> Optional[list[Tile]]:
+        """Multi-target BFS, the shortest path to the nearest of the target tiles, None if none is reachable"""
+        start = _tile(start)
+        targets = {self._index(_tile(i)) for i in targets}
+        if not targets:
+            return None
+        source = self._index(start)
+        if source in targets:
+            return [start]
+
+        walkable = self._walkable
+        parents = {source: -1}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            for neighbor in self._neighbors(current):
+                if neighbor in parents or not walkable[neighbor]:
+                    continue
+                parents[neighbor] = current
+                if neighbor in targets:
+                    path = self._backtrack(parents, neighbor)
+                    self._cache(path)
+                    return path
+                queue.append(neighbor)
+        return None
+
+    def _neighbors(self, index: int) -> list[int]:
+        y, x = divmod(index, self.width)
+        neighbors = []
+        if y > 0:
+            neighbors.append(index - self.width)
+        if x > 0:
+            neighbors.append(index - 1)
+        if y < self.height - 1:
+            neighbors.append(index + self.width)
+        if x < self.width - 1:
+            neighbors.append(index + 1)
+        return neighbors
+
+    def _index(self, tile: Tile) -> int:
+        return tile[1] * self.width + tile[0]
+
+    def _backtrack(self, parents: dict[int, int], index: int) -> list[Tile]:
+        path = []
+        while index != -1:
+            y, x = divmod(index, self.width)
+            path.append((x, y))
+            index = parents[index]
+        path.reverse()
+        return path
+
+    def _cached(self, start: Tile, end: Tile) -> Optional[tuple[Tile, ...]]:
+        route = self._routes.get((start, end))
+        if route is not None:
+            self._routes.move_to_end((start, end))
+        return route
+
+    def _cache(self, path: list[Tile]):
+        if not self.cache_size:
+            return
+        self._routes[(path[0], path[-1])] = tuple(path)
+        self._routes[(path[-1], path[0])] = tuple(reversed(path))  # the reversed route is a shortest path too
+        while len(self._routes) > self.cache_size:
+            self._routes.popitem(last=False)
+
+
+def _tile(tile: Iterable[int]) -> Tile:
+    x, y = tile
+    return int(x), int(y)
@@ -7,7 +7,7 @@ import math
 from pathlib import Path
 from typing import Any, Optional
 
-from pydantic import ConfigDict, Field, model_validator
+from pydantic import ConfigDict, Field, PrivateAttr, model_validator
 
 from metagpt.environment.base_env import ExtEnv, mark_as_readable, mark_as_writeable
 from metagpt.environment.stanford_town.env_space import (
@@ -19,6 +19,7 @@ from metagpt.environment.stanford_town.env_space import (
     get_action_space,
     get_observation_space,
 )
+from metagpt.environment.stanford_town.maze_path_finder import MazePathFinder
 from metagpt.utils.common import read_csv_to_list, read_json_file
 
 
@@ -35,6 +36,9 @@ class StanfordTownExtEnv(ExtEnv):
     tiles: list[list[dict]] = Field(default=[])
     address_tiles: dict[str, set] = Field(default=dict())
     collision_maze: list[list] = Field(default=[])
+    collision_block_id: str = Field(default="32125", description="the collision block id in the collision maze")
+
+    _path_finder: Optional[MazePathFinder] = PrivateAttr(default=None)
 
     @model_validator(mode="before")
     @classmethod
@@ -291,6 +295,41 @@ class StanfordTownExtEnv(ExtEnv):
     def get_address_tiles(self) -> dict:
         return self.address_tiles
 
+    @property
+    def path_finder(self) -> MazePathFinder:
+        """The path finder of the collision maze, rebuilt when the collision maze is replaced"""
+        if self._path_finder is None or self._path_finder.collision_maze is not self.collision_maze:
+            self._path_finder = MazePathFinder(self.collision_maze, self.collision_block_id)
+        return self._path_finder
+
+    @mark_as_readable
+    def find_path(self, start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
+        """
+        Returns the shortest path between two tiles in (x, y) form, both included. The routes found are cached
+        until the collision maze changes.
+        """
+        return self.path_finder.find_path(start, end)
+
+    @mark_as_readable
+    def find_nearest_path(
+        self, start: tuple[int, int], targets: list[tuple[int, int]]
+    ) -> Optional[list[tuple[int, int]]]:
+        """
+        Returns the shortest path from the start tile to the nearest of the target tiles, None if none is reachable.
+        """
+        return self.path_finder.find_nearest_path(start, targets)
+
+    @mark_as_writeable
+    def set_collision(self, tile: tuple[int, int], collision: bool) -> None:
+        """
+        Block or unblock a tile, and invalidate the cached routes.
+        """
+        x, y = tile
+        self.collision_maze[y][x] = self.collision_block_id if collision else "0"
+        self.tiles[y][x]["collision"] = collision
+        if self._path_finder is not None:
+            self._path_finder.invalidate()
+
     @mark_as_readable
     def access_tile(self, tile: tuple[int, int]) -> dict:
         """
@@ -41,8 +41,8 @@ from metagpt.ext.android_assistant.utils.utils import (
     draw_bbox_multi,
     draw_grid,
     elem_bbox_to_xy,
+    elem_list_from_xml_tree,
     screenshot_parse_extract,
-    traverse_xml_tree,
 )
 from metagpt.logs import logger
 from metagpt.utils.common import encode_image
@@ -113,24 +113,7 @@ next action. You should always prioritize these documented elements for interact
         if not screenshot_path.exists() or not xml_path.exists():
             return AndroidActionOutput(action_state=RunState.FAIL)
 
-        clickable_list = []
-        focusable_list = []
-        traverse_xml_tree(xml_path, clickable_list, "clickable", True)
-        traverse_xml_tree(xml_path, focusable_list, "focusable", True)
-        elem_list: list[AndroidElement] = clickable_list.copy()
-        for elem in focusable_list:
-            bbox = elem.bbox
-            center = (bbox[0][0] + bbox[1][0]) // 2, (bbox[0][1] + bbox[1][1]) // 2
-            close = False
-            for e in clickable_list:
-                bbox = e.bbox
-                center_ = (bbox[0][0] + bbox[1][0]) // 2, (bbox[0][1] + bbox[1][1]) // 2
-                dist = (abs(center[0] - center_[0]) ** 2 + abs(center[1] - center_[1]) ** 2) ** 0.5
-                if dist <= extra_config.get("min_dist", 30):
-                    close = True
-                    break
-            if not close:
-                elem_list.append(elem)
+        elem_list = elem_list_from_xml_tree(xml_path, [], extra_config.get("min_dist", 30))
 
         screenshot_labeled_path = task_dir.joinpath(f"{round_count}_labeled.png")
         draw_bbox_multi(screenshot_path, screenshot_labeled_path, elem_list)
@@ -11,6 +11,7 @@ import cv2
 import pyshine as ps
 
 from metagpt.config2 import config
+from metagpt.environment.android.spatial_index import GridIndex
 from metagpt.ext.android_assistant.utils.schema import (
     ActionOp,
     AndroidElement,
@@ -32,9 +33,7 @@ from metagpt.logs import logger
 
 
 def get_id_from_element(elem: Element) -> str:
-    bounds = elem.attrib["bounds"][1:-1].split("][")
-    x1, y1 = map(int, bounds[0].split(","))
-    x2, y2 = map(int, bounds[1].split(","))
+    (x1, y1), (x2, y2) = _parse_bounds(elem.attrib["bounds"])
     elem_w, elem_h = x2 - x1, y2 - y1
     if "resource-id" in elem.attrib and elem.attrib["resource-id"]:
         elem_id = elem.attrib["resource-id"].replace(":", ".").replace("/", "_")
@@ -46,64 +45,76 @@ def get_id_from_element(elem: Element) -> str:
     return elem_id
 
 
-def traverse_xml_tree(xml_path: Path, elem_list: list[AndroidElement], attrib: str, add_index=False):
+def _parse_bounds(bounds: str) -> tuple[tuple[int, int], tuple[int, int]]:
+    """`[x1,y1][x2,y2]` of uiautomator to ((x1, y1), (x2, y2))"""
+    top_left, bottom_right = bounds[1:-1].split("][")
+    x1, y1 = map(int, top_left.split(","))
+    x2, y2 = map(int, bottom_right.split(","))
+    return (x1, y1), (x2, y2)
+
+
+def _center(bbox: tuple[tuple[int, int], tuple[int, int]]) -> tuple[int, int]:
+    return (bbox[0][0] + bbox[1][0]) // 2, (bbox[0][1] + bbox[1][1]) // 2
+
+
+def extract_elements_from_xml_tree(
+    xml_path: Path, elem_lists: dict[str, list[AndroidElement]], min_dist: int, add_index=False
+):
+    """Collect the elements whose attribs are true into the list of each attrib of `elem_lists`, in a single pass of
+    the UI tree. An element is skipped when its center is within `min_dist` of an element already in the same list."""
+    indexes = {}
+    for attrib, elem_list in elem_lists.items():
+        indexes[attrib] = GridIndex(min_dist)
+        for elem in elem_list:
+            indexes[attrib].add(_center(elem.bbox))
+
     path = []
-    extra_config = config.extra
     for event, elem in iterparse(str(xml_path), ["start", "end"]):
-        if event == "start":
-            path.append(elem)
-            if attrib in elem.attrib and elem.attrib[attrib] == "true":
-                parent_prefix = ""
-                if len(path) > 1:
-                    parent_prefix = get_id_from_element(path[-2])
-                bounds = elem.attrib["bounds"][1:-1].split("][")
-                x1, y1 = map(int, bounds[0].split(","))
-                x2, y2 = map(int, bounds[1].split(","))
-                center = (x1 + x2) // 2, (y1 + y2) // 2
+        if event == "end":
+            path.pop()
+            continue
+
+        path.append(elem)
+        attribs = [i for i in elem_lists if elem.attrib.get(i) == "true"]
+        if not attribs:
+            continue
+        bbox = _parse_bounds(elem.attrib["bounds"])
+        center = _center(bbox)
+        elem_id = None
+        for attrib in attribs:
+            if indexes[attrib].has_near(center, min_dist):
+                continue
+            if elem_id is None:
                 elem_id = get_id_from_element(elem)
-                if parent_prefix:
-                    elem_id = parent_prefix + "_" + elem_id
+                if len(path) > 1:
+                    elem_id = get_id_from_element(path[-2]) + "_" + elem_id
                 if add_index:
                     elem_id += f"_{elem.attrib['index']}"
-                close = False
-                for e in elem_list:
-                    bbox = e.bbox
-                    center_ = (bbox[0][0] + bbox[1][0]) // 2, (bbox[0][1] + bbox[1][1]) // 2
-                    dist = (abs(center[0] - center_[0]) ** 2 + abs(center[1] - center_[1]) ** 2) ** 0.5
-                    if dist <= extra_config.get("min_dist", 30):
-                        close = True
-                        break
-                if not close:
-                    elem_list.append(AndroidElement(uid=elem_id, bbox=((x1, y1), (x2, y2)), attrib=attrib))
+            indexes[attrib].add(center)
+            elem_lists[attrib].append(AndroidElement(uid=elem_id, bbox=bbox, attrib=attrib))
 
-        if event == "end":
-            path.pop()
+
+def traverse_xml_tree(xml_path: Path, elem_list: list[AndroidElement], attrib: str, add_index=False):
+    extract_elements_from_xml_tree(xml_path, {attrib: elem_list}, config.extra.get("min_dist", 30), add_index)
 
 
 def elem_list_from_xml_tree(xml_path: Path, useless_list: list[str], min_dist: int) -> list[AndroidElement]:
+    """The clickable elements, then the focusable elements not within `min_dist` of a clickable one"""
     clickable_list = []
     focusable_list = []
-    traverse_xml_tree(xml_path, clickable_list, "clickable", True)
-    traverse_xml_tree(xml_path, focusable_list, "focusable", True)
-    elem_list = []
+    extract_elements_from_xml_tree(
+        xml_path,
+        {"clickable": clickable_list, "focusable": focusable_list},
+        config.extra.get("min_dist", 30),
+        add_index=True,
+    )
+    useless = set(useless_list)
+    clickable_index = GridIndex(min_dist)
     for elem in clickable_list:
-        if elem.uid in useless_list:
-            continue
-        elem_list.append(elem)
+        clickable_index.add(_center(elem.bbox))
+    elem_list = [elem for elem in clickable_list if elem.uid not in useless]
     for elem in focusable_list:
-        if elem.uid in useless_list:
-            continue
-        bbox = elem.bbox
-        center = (bbox[0][0] + bbox[1][0]) // 2, (bbox[0][1] + bbox[1][1]) // 2
-        close = False
-        for e in clickable_list:
-            bbox = e.bbox
-            center_ = (bbox[0][0] + bbox[1][0]) // 2, (bbox[0][1] + bbox[1][1]) // 2
-            dist = (abs(center[0] - center_[0]) ** 2 + abs(center[1] - center_[1]) ** 2) ** 0.5
-            if dist <= min_dist:
-                close = True
-                break
-        if not close:
+        if elem.uid not in useless and not clickable_index.has_near(_center(elem.bbox), min_dist):
             elem_list.append(elem)
     return elem_list
 
@@ -6,8 +6,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from pydantic import Field, field_serializer, model_validator
+from pydantic import Field, PrivateAttr, field_serializer, model_validator
 
+from metagpt.ext.stanford_town.memory.memory_matrix import MemoryMatrix
 from metagpt.logs import logger
 from metagpt.memory.memory import Memory
 from metagpt.schema import Message
@@ -115,6 +116,22 @@ class AgentMemory(Memory):
     memory_saved: Optional[Path] = Field(default=None)
     embeddings: dict[str, list[float]] = dict()
 
+    _matrix: Optional[MemoryMatrix] = PrivateAttr(default=None)
+
+    @property
+    def matrix(self) -> MemoryMatrix:
+        """
+        检索使用的记忆矩阵，按storage增量同步；storage被替换时重建
+        """
+        matrix = self._matrix
+        synced = len(matrix) if matrix else 0
+        if not matrix or synced > len(self.storage) or (synced and matrix.nodes[-1] is not self.storage[synced - 1]):
+            matrix, synced = MemoryMatrix(), 0
+        for node in self.storage[synced:]:
+            matrix.add(node, self.embeddings.get(node.embedding_key))
+        self._matrix = matrix
+        return matrix
+
     def set_mem_path(self, memory_saved: Path):
         self.memory_saved = memory_saved
         self.load(memory_saved)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : 记忆矩阵，NumPy实现的AgentMemory检索列存储，一次为一批focal point打分
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from metagpt.ext.stanford_town.memory.agent_memory import BasicMemory
+
+_EPOCH = datetime(1970, 1, 1)
+_SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def _to_seconds(time: Optional[datetime]) -> float:
+    return (time - _EPOCH).total_seconds() if time else 0.0
+
+
+class MemoryMatrix:
+    """
+    记忆矩阵：每行一条记忆，包含单位化的embedding、importance、created、last_accessed以及是否参与检索
+    行按照AgentMemory.storage的顺序追加，容量按倍数增长
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.nodes: list[BasicMemory] = []
+        self.rows: dict[str, int] = {}  # memory_id -> 行号
+        self._capacity = capacity
+        self._embeddings: Optional[np.ndarray] = None  # 维度在第一条embedding加入时确定
+        self._importance = np.zeros(capacity)
+        self._created = np.zeros(capacity)
+        self._last_accessed = np.zeros(capacity)
+        self._retrievable = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        return self._embeddings[: len(self)] if self._embeddings is not None else np.zeros((0, 0))
+
+    @property
+    def importance(self) -> np.ndarray:
+        return self._importance[: len(self)]
+
+    @property
+    def created(self) -> np.ndarray:
+        return self._created[: len(self)]
+
+    @property
+    def last_accessed(self) -> np.ndarray:
+        return self._last_accessed[: len(self)]
+
+    @property
+    def retrievable(self) -> np.ndarray:
+        """event与thought中非idle的记忆参与检索"""
+        return self._retrievable[: len(self)]
+
+    def add(self, node: BasicMemory, embedding: Optional[list[float]]):
+        row = len(self)
+        if row == self._capacity:
+            self._grow()
+        if embedding is not None:
+            vector = np.asarray(embedding, dtype=np.float32)
+            if self._embeddings is None:
+                self._embeddings = np.zeros((self._capacity, vector.shape[0]), dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            self._embeddings[row] = vector / norm if norm else vector
+        self._importance[row] = node.poignancy
+        self._created[row] = _to_seconds(node.created)
+        self._last_accessed[row] = _to_seconds(node.last_accessed)
+        self._retrievable[row] = node.memory_type in ("event", "thought") and "idle" not in (node.embedding_key or "")
+        self.nodes.append(node)
+        self.rows[node.memory_id] = row
+
+    def touch(self, rows: np.ndarray, time: datetime):
+        """更新被检索到的记忆的last_accessed"""
+        self._last_accessed[rows] = _to_seconds(time)
+        for row in rows:
+            self.nodes[row].last_accessed = time
+
+    def score(
+        self, query_embeddings: np.ndarray, curr_time: datetime, memory_forget: float, rows: np.ndarray
+    ) -> np.ndarray:
+        """
+        对一批focal point打分，返回形状为(len(query_embeddings), len(rows))的总分
+        importance、recency、relevance分别归一化到[0, 1]后相加
+        """
+        importance = _normalize(self.importance[rows])
+        days = np.floor((_to_seconds(curr_time) - self.created[rows]) / _SECONDS_PER_DAY)
+        recency = _normalize(np.power(memory_forget, days))
+
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+        if self._embeddings is None:
+            relevance = np.zeros((len(queries), len(rows)))
+        else:
+            relevance = queries @ self.embeddings[rows].T  # 一次矩阵乘法得到所有余弦相似度
+        relevance = _normalize(relevance)
+        return importance + recency + relevance
+
+    def top_k(
+        self,
+        query_embeddings: np.ndarray,
+        curr_time: datetime,
+        memory_forget: float,
+        k: int,
+        rows: Optional[np.ndarray] = None,
+    ) -> list[np.ndarray]:
+        """返回每个focal point得分最高的k条记忆的行号，按得分降序排列；rows默认为所有参与检索的记忆"""
+        rows = np.flatnonzero(self.retrievable) if rows is None else np.asarray(rows, dtype=int)
+        if not len(rows):
+            return [rows for _ in np.atleast_2d(query_embeddings)]
+        scores = self.score(query_embeddings, curr_time, memory_forget, rows)
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        top = np.take_along_axis(top, np.argsort(-top_scores, axis=1, kind="stable"), axis=1)
+        return [rows[i] for i in top]
+
+    def _grow(self):
+        self._capacity *= 2
+        for name in ("_importance", "_created", "_last_accessed", "_retrievable", "_embeddings"):
+            column = getattr(self, name)
+            if column is None:
+                continue
+            grown = np.zeros((self._capacity, *column.shape[1:]), dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+
+def _normalize(scores: np.ndarray) -> np.ndarray:
+    """按最后一维归一化到[0, 1]，所有值相同时为0.5"""
+    min_val = scores.min(axis=-1, keepdims=True)
+    range_val = scores.max(axis=-1, keepdims=True) - min_val
+    return np.where(range_val == 0, 0.5, (scores - min_val) / np.where(range_val == 0, 1, range_val))
@@ -8,7 +8,7 @@ from numpy import dot
 from numpy.linalg import norm
 
 from metagpt.ext.stanford_town.memory.agent_memory import BasicMemory
-from metagpt.ext.stanford_town.utils.utils import get_embedding
+from metagpt.ext.stanford_town.utils.utils import aget_embeddings, get_embedding
 
 
 def agent_retrieve(
@@ -18,68 +18,39 @@ def agent_retrieve(
     query: str,
     nodes: list[BasicMemory],
     topk: int = 4,
-) -> list[BasicMemory]:
+) -> list[str]:
     """
     Retrieve需要集合Role使用,原因在于Role才具有AgentMemory,scratch
     逻辑:Role调用该函数,self.rc.AgentMemory,self.rc.scratch.curr_time,self.rc.scratch.memory_forget
-    输入希望查询的内容与希望回顾的条数,返回TopK条高分记忆，即List[BasicMemory]
-
-    Score_lists示例
-    {
-        "memory": memories[i],             BasicMemory类
-        "importance": memories[i].poignancy
-        "recency": 衰减因子计算结果
-        "relevance": 搜索结果
-    }
-    """
-    memories = nodes
-    agent_memory_embedding = agent_memory.embeddings
-    memories = sorted(memories, key=lambda memory_node: memory_node.last_accessed, reverse=True)
-
-    score_list = []
-    score_list = extract_importance(memories, score_list)
-    score_list = extract_recency(curr_time, memory_forget, score_list)
-    score_list = extract_relevance(agent_memory_embedding, query, score_list)
-    score_list = normalize_score_floats(score_list, 0, 1)
-
-    total_dict = {}
-    gw = [1, 1, 1]  # 三个因素的权重,重要性,近因性,相关性,
-    for i in range(len(score_list)):
-        total_score = (
-            score_list[i]["importance"] * gw[0] + score_list[i]["recency"] * gw[1] + score_list[i]["relevance"] * gw[2]
-        )
-        total_dict[score_list[i]["memory"].memory_id] = total_score
+    输入希望查询的内容与希望回顾的条数,返回TopK条高分记忆的memory_id
 
-    result = top_highest_x_values(total_dict, topk)
+    得分为归一化后的importance(poignancy)、recency(衰减因子计算结果)、relevance(余弦相似度)之和，在记忆矩阵上计算
+    """
+    matrix = agent_memory.matrix
+    rows = [matrix.rows[node.memory_id] for node in nodes]
+    query_embedding = get_embedding(query)
+    (top_rows,) = matrix.top_k([query_embedding], curr_time, memory_forget, topk, rows=rows)
 
-    return result  # 返回的是一个BasicMemory列表
+    return [matrix.nodes[row].memory_id for row in top_rows]  # 返回的是memory_id列表
 
 
-def new_agent_retrieve(role, focus_points: list, n_count=30) -> dict:
+async def new_agent_retrieve(role, focus_points: list, n_count=30) -> dict:
     """
     输入为role，关注点列表,返回记忆数量
     输出为字典，键为focus_point，值为对应的记忆列表
+    所有focal point的embedding一次获取，记忆在记忆矩阵上一次打分
     """
+    if not focus_points:
+        return dict()
+    matrix = role.memory.matrix
+    curr_time = role.scratch.curr_time
+    query_embeddings = await aget_embeddings(focus_points)
+    top_rows = matrix.top_k(query_embeddings, curr_time, role.scratch.recency_decay, n_count)
+
     retrieved = dict()
-    for focal_pt in focus_points:
-        nodes = [
-            [i.last_accessed, i]
-            for i in role.memory.event_list + role.memory.thought_list
-            if "idle" not in i.embedding_key
-        ]
-        nodes = sorted(nodes, key=lambda x: x[0])
-        nodes = [i for created, i in nodes]
-        results = agent_retrieve(
-            role.memory, role.scratch.curr_time, role.scratch.recency_decay, focal_pt, nodes, n_count
-        )
-        final_result = []
-        for n in results:
-            for i in role.memory.storage:
-                if i.memory_id == n:
-                    i.last_accessed = role.scratch.curr_time
-                    final_result.append(i)
-
-        retrieved[focal_pt] = final_result
+    for focal_pt, rows in zip(focus_points, top_rows):
+        matrix.touch(rows, curr_time)
+        retrieved[focal_pt] = [matrix.nodes[row] for row in rows]
 
     return retrieved
 
@@ -37,13 +37,13 @@ from metagpt.ext.stanford_town.memory.scratch import Scratch
 from metagpt.ext.stanford_town.memory.spatial_memory import MemoryTree
 from metagpt.ext.stanford_town.plan.st_plan import plan
 from metagpt.ext.stanford_town.reflect.reflect import generate_poig_score, role_reflect
-from metagpt.ext.stanford_town.utils.const import STORAGE_PATH, collision_block_id
+from metagpt.ext.stanford_town.utils.const import STORAGE_PATH
 from metagpt.ext.stanford_town.utils.mg_ga_transform import (
     get_role_environment,
     save_environment,
     save_movement,
 )
-from metagpt.ext.stanford_town.utils.utils import get_embedding, path_finder
+from metagpt.ext.stanford_town.utils.utils import aget_embedding
 from metagpt.logs import logger
 from metagpt.roles.role import Role, RoleContext
 from metagpt.schema import Message
@@ -217,7 +217,7 @@ class STRole(Role):
         s, p, o = await run_event_triple.run(thought, self)
         keywords = set([s, p, o])
         thought_poignancy = await generate_poig_score(self, "event", whisper)
-        thought_embedding_pair = (thought, get_embedding(thought))
+        thought_embedding_pair = (thought, await aget_embedding(thought))
         self.rc.memory.add_thought(
             created, expiration, s, p, o, thought, keywords, thought_poignancy, thought_embedding_pair, None
         )
@@ -329,7 +329,7 @@ class STRole(Role):
                 if desc_embedding_in in self.rc.memory.embeddings:
                     event_embedding = self.rc.memory.embeddings[desc_embedding_in]
                 else:
-                    event_embedding = get_embedding(desc_embedding_in)
+                    event_embedding = await aget_embedding(desc_embedding_in)
                 event_embedding_pair = (desc_embedding_in, event_embedding)
 
                 # Get event poignancy.
@@ -344,7 +344,7 @@ class STRole(Role):
                     if self.rc.scratch.act_description in self.rc.memory.embeddings:
                         chat_embedding = self.rc.memory.embeddings[self.rc.scratch.act_description]
                     else:
-                        chat_embedding = get_embedding(self.rc.scratch.act_description)
+                        chat_embedding = await aget_embedding(self.rc.scratch.act_description)
                     chat_embedding_pair = (self.rc.scratch.act_description, chat_embedding)
                     chat_poignancy = await generate_poig_score(self, "chat", self.rc.scratch.act_description)
                     chat_node = self.rc.memory.add_chat(
@@ -427,26 +427,15 @@ class STRole(Role):
             if "<persona>" in plan:
                 # Executing persona-persona interaction.
                 target_p_tile = roles[plan.split("<persona>")[-1].strip()].scratch.curr_tile
-                collision_maze = self.rc.env.observe()["collision_maze"]
-                potential_path = path_finder(
-                    collision_maze, self.rc.scratch.curr_tile, target_p_tile, collision_block_id
-                )
+                potential_path = self.rc.env.find_path(self.rc.scratch.curr_tile, target_p_tile)
                 if len(potential_path) <= 2:
                     target_tiles = [potential_path[0]]
                 else:
-                    collision_maze = self.rc.env.observe()["collision_maze"]
-                    potential_1 = path_finder(
-                        collision_maze,
-                        self.rc.scratch.curr_tile,
-                        potential_path[int(len(potential_path) / 2)],
-                        collision_block_id,
+                    potential_1 = self.rc.env.find_path(
+                        self.rc.scratch.curr_tile, potential_path[int(len(potential_path) / 2)]
                     )
-
-                    potential_2 = path_finder(
-                        collision_maze,
-                        self.rc.scratch.curr_tile,
-                        potential_path[int(len(potential_path) / 2) + 1],
-                        collision_block_id,
+                    potential_2 = self.rc.env.find_path(
+                        self.rc.scratch.curr_tile, potential_path[int(len(potential_path) / 2) + 1]
                     )
                     if len(potential_1) <= len(potential_2):
                         target_tiles = [potential_path[int(len(potential_path) / 2)]]
@@ -507,23 +496,13 @@ class STRole(Role):
             target_tiles = new_target_tiles
 
             # Now that we've identified the target tile, we find the shortest path to
-            # one of the target tiles.
+            # one of the target tiles, with a single search from the curr_tile that
+            # stops at the nearest target tile.
+            # e.g., [(0, 1), (1, 1), (1, 2), (1, 3), (1, 4)...]
             curr_tile = self.rc.scratch.curr_tile
-            closest_target_tile = None
-            path = None
-            for i in target_tiles:
-                # path_finder takes a collision_mze and the curr_tile coordinate as
-                # an input, and returns a list of coordinate tuples that becomes the
-                # path.
-                # e.g., [(0, 1), (1, 1), (1, 2), (1, 3), (1, 4)...]
-                collision_maze = self.rc.env.observe()["collision_maze"]
-                curr_path = path_finder(collision_maze, curr_tile, i, collision_block_id)
-                if not closest_target_tile:
-                    closest_target_tile = i
-                    path = curr_path
-                elif len(curr_path) < len(path):
-                    closest_target_tile = i
-                    path = curr_path
+            path = self.rc.env.find_nearest_path(curr_tile, target_tiles)
+            if path is None:  # no target tile is reachable, stay at the curr_tile
+                path = [curr_tile]
 
             # Actually setting the <planned_path> and <act_path_set>. We cut the
             # first element in the planned_path because it includes the curr_tile.
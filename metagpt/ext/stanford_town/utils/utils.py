@@ -7,14 +7,19 @@ import errno
 import json
 import os
 import shutil
-import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Union
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+from tenacity import after_log, retry, stop_after_attempt, wait_random_exponential
 
 from metagpt.config2 import config
+from metagpt.environment.stanford_town.maze_path_finder import MazePathFinder
 from metagpt.logs import logger
+from metagpt.utils.embedding_service import EmbeddingService, get_embedding_service
+
+EMBEDDING_MODEL = "text-embedding-ada-002"
 
 
 def read_csv_to_list(curr_file: str, header=False, strip_trail=True):
@@ -47,24 +52,54 @@ def read_csv_to_list(curr_file: str, header=False, strip_trail=True):
         return analysis_list[0], analysis_list[1:]
 
 
-def get_embedding(text, model: str = "text-embedding-ada-002"):
-    text = text.replace("\n", " ")
-    embedding = None
-    if not text:
-        text = "this is blank"
-    for idx in range(3):
-        try:
-            embedding = (
-                OpenAI(api_key=config.llm.api_key).embeddings.create(input=[text], model=model).data[0].embedding
-            )
-        except Exception as exp:
-            logger.info(f"get_embedding failed, exp: {exp}, will retry.")
-            time.sleep(5)
-    if not embedding:
-        raise ValueError("get_embedding failed")
+@lru_cache
+def _openai_clients(api_key: str) -> tuple[OpenAI, AsyncOpenAI]:
+    return OpenAI(api_key=api_key), AsyncOpenAI(api_key=api_key)
+
+
+def _embedding_service(model: str) -> EmbeddingService:
+    async def _embed(texts: list[str]) -> list[list[float]]:
+        _, client = _openai_clients(config.llm.api_key)
+        resp = await client.embeddings.create(input=texts, model=model)
+        return [i.embedding for i in sorted(resp.data, key=lambda x: x.index)]
+
+    return get_embedding_service(model, _embed, endpoint="stanford_town")
+
+
+def _embedding_text(text: str) -> str:
+    return text.replace("\n", " ") or "this is blank"
+
+
+async def aget_embeddings(texts: list[str], model: str = EMBEDDING_MODEL) -> list[list[float]]:
+    """批量获取embedding，同一事件循环中并发的请求合并为一次embeddings调用，结果按模型与文本缓存"""
+    return await _embedding_service(model).aembed_batch([_embedding_text(i) for i in texts])
+
+
+async def aget_embedding(text: str, model: str = EMBEDDING_MODEL) -> list[float]:
+    return (await aget_embeddings([text], model))[0]
+
+
+def get_embedding(text: str, model: str = EMBEDDING_MODEL) -> list[float]:
+    text = _embedding_text(text)
+    service = _embedding_service(model)
+    (embedding,) = service.get_cached([text])
+    if embedding is None:
+        embedding = _create_embedding(text, model)
+        service.set_cached([text], [embedding])
     return embedding
 
 
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_random_exponential(min=1, max=20),
+    after=after_log(logger, logger.level("WARNING").name),
+    reraise=True,
+)
+def _create_embedding(text: str, model: str) -> list[float]:
+    client, _ = _openai_clients(config.llm.api_key)
+    return client.embeddings.create(input=[text], model=model).data[0].embedding
+
+
 def extract_first_json_dict(data_str: str) -> Union[None, dict]:
     # Find the first occurrence of a JSON object within the string
     start_idx = data_str.find("{")
@@ -155,19 +190,11 @@ def path_finder_v2(a, start, end, collision_block_char) -> list[int]:
 
 
 def path_finder(collision_maze: list, start: list[int], end: list[int], collision_block_char: str) -> list[int]:
-    # EMERGENCY PATCH
-    start = (start[1], start[0])
-    end = (end[1], end[0])
-    # END EMERGENCY PATCH
-
-    path = path_finder_v2(collision_maze, start, end, collision_block_char)
-
-    new_path = []
-    for i in path:
-        new_path += [(i[1], i[0])]
-    path = new_path
-
-    return path
+    """
+    Find the shortest path between two tiles in (x, y) form with A*. Prefer `StanfordTownExtEnv.find_path`, which
+    builds the walkable grid once and caches the routes.
+    """
+    return MazePathFinder(collision_maze, collision_block_char, cache_size=0).find_path(start, end)
 
 
 def create_folder_if_not_there(curr_path):
@@ -6,30 +6,53 @@
 @File    : memory.py
 @Modified By: mashenquan, 2023-11-1. According to RFC 116: Updated the type of index key.
 """
+import re
 from collections import defaultdict
-from typing import DefaultDict, Iterable, Set
+from itertools import islice
+from typing import DefaultDict, Iterable, Optional, Set
 
-from pydantic import BaseModel, Field, SerializeAsAny
+from pydantic import BaseModel, Field, PrivateAttr, SerializeAsAny
 
 from metagpt.const import IGNORED_MESSAGE_ID
 from metagpt.schema import Message
 from metagpt.utils.common import any_to_str, any_to_str_set
 
+_TOKEN_PATTERN = re.compile(r"\w+")
+
 
 class Memory(BaseModel):
-    """The most basic memory: super-memory"""
+    """The most basic memory: super-memory
+
+    `storage` and `index` are the serialized state. The lookup indexes below are private, rebuilt lazily from
+    `storage`, so subclasses which append to `storage` directly still get correct results.
+    """
 
     storage: list[SerializeAsAny[Message]] = []
     index: DefaultDict[str, list[SerializeAsAny[Message]]] = Field(default_factory=lambda: defaultdict(list))
     ignore_id: bool = False
 
+    # Messages keyed by an increasing sequence number, in the order of `storage`
+    _entries: dict[int, Message] = PrivateAttr(default_factory=dict)
+    _next_seq: int = PrivateAttr(default=0)
+    # Hash buckets for the dedup, messages in a bucket are still compared by `==`
+    _buckets: dict[tuple, list[int]] = PrivateAttr(default_factory=dict)
+    # Secondary indexes, ordered sets of sequence numbers
+    _by_role: DefaultDict[str, dict[int, None]] = PrivateAttr(default_factory=lambda: defaultdict(dict))
+    _by_sent_from: DefaultDict[str, dict[int, None]] = PrivateAttr(default_factory=lambda: defaultdict(dict))
+    # Inverted index of the words in message contents
+    _postings: DefaultDict[str, set[int]] = PrivateAttr(default_factory=lambda: defaultdict(set))
+    _indexed: Optional[tuple[int, int]] = PrivateAttr(default=None)
+
     def add(self, message: Message):
         """Add a new message to storage, while updating the index"""
         if self.ignore_id:
             message.id = IGNORED_MESSAGE_ID
-        if message in self.storage:
+        self._ensure_indexed()
+        if self._lookup(message):
             return
         self.storage.append(message)
+        self._index_message(message)
+        self._mark_indexed()
         if message.cause_by:
             self.index[message.cause_by].append(message)
 
@@ -39,16 +62,30 @@ class Memory(BaseModel):
 
     def get_by_role(self, role: str) -> list[Message]:
         """Return all messages of a specified role"""
-        return [message for message in self.storage if message.role == role]
+        self._ensure_indexed()
+        return [self._entries[seq] for seq in self._by_role.get(role, ())]
+
+    def get_by_sent_from(self, sent_from) -> list[Message]:
+        """Return all messages sent from a specified role"""
+        self._ensure_indexed()
+        return [self._entries[seq] for seq in self._by_sent_from.get(any_to_str(sent_from), ())]
 
     def get_by_content(self, content: str) -> list[Message]:
         """Return all messages containing a specified content"""
-        return [message for message in self.storage if content in message.content]
+        self._ensure_indexed()
+        candidates = self._search_candidates(content)
+        if candidates is None:
+            return [message for message in self.storage if content in message.content]
+        messages = (self._entries[seq] for seq in sorted(candidates) if seq in self._entries)
+        return [message for message in messages if content in message.content]
 
     def delete_newest(self) -> "Message":
         """delete the newest message from the storage"""
         if len(self.storage) > 0:
+            self._ensure_indexed()
             newest_msg = self.storage.pop()
+            self._unindex_seq(next(reversed(self._entries)))
+            self._mark_indexed()
             if newest_msg.cause_by and newest_msg in self.index[newest_msg.cause_by]:
                 self.index[newest_msg.cause_by].remove(newest_msg)
         else:
@@ -59,7 +96,12 @@ class Memory(BaseModel):
         """Delete the specified message from storage, while updating the index"""
         if self.ignore_id:
             message.id = IGNORED_MESSAGE_ID
+        self._ensure_indexed()
         self.storage.remove(message)
+        seqs = self._lookup(message)
+        if seqs:
+            self._unindex_seq(seqs[0])
+        self._mark_indexed()
         if message.cause_by and message in self.index[message.cause_by]:
             self.index[message.cause_by].remove(message)
 
@@ -67,6 +109,7 @@ class Memory(BaseModel):
         """Clear storage and index"""
         self.storage = []
         self.index = defaultdict(list)
+        self._indexed = None
 
     def count(self) -> int:
         """Return the number of messages in storage"""
@@ -74,7 +117,7 @@ class Memory(BaseModel):
 
     def try_remember(self, keyword: str) -> list[Message]:
         """Try to recall all messages containing a specified keyword"""
-        return [message for message in self.storage if keyword in message.content]
+        return self.get_by_content(keyword)
 
     def get(self, k=0) -> list[Message]:
         """Return the most recent k memories, return all when k=0"""
@@ -82,10 +125,12 @@ class Memory(BaseModel):
 
     def find_news(self, observed: list[Message], k=0) -> list[Message]:
         """find news (previously unseen messages) from the the most recent k memories, from all memories when k=0"""
-        already_observed = self.get(k)
+        self._ensure_indexed()
+        recent = set(islice(reversed(self._entries), k)) if k else None
         news: list[Message] = []
         for i in observed:
-            if i in already_observed:
+            seqs = self._lookup(i)
+            if seqs and (recent is None or not recent.isdisjoint(seqs)):
                 continue
             news.append(i)
         return news
@@ -104,3 +149,89 @@ class Memory(BaseModel):
                 continue
             rsp += self.index[action]
         return rsp
+
+    def __contains__(self, message: Message) -> bool:
+        """Whether an equal message is in storage, i.e. `add` would skip it"""
+        if self.ignore_id and message.id != IGNORED_MESSAGE_ID:
+            message = message.model_copy(update={"id": IGNORED_MESSAGE_ID})
+        self._ensure_indexed()
+        return bool(self._lookup(message))
+
+    def __eq__(self, other) -> bool:
+        # The private indexes are derived from `storage`, and left out of the comparison
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+
+    @staticmethod
+    def _bucket_key(message: Message) -> tuple:
+        return message.id, message.role, message.cause_by, message.content
+
+    def _lookup(self, message: Message) -> list[int]:
+        """Return sequence numbers of the stored messages equal to the message"""
+        return [seq for seq in self._buckets.get(self._bucket_key(message), ()) if self._entries[seq] == message]
+
+    def _index_message(self, message: Message):
+        seq = self._next_seq
+        self._next_seq += 1
+        self._entries[seq] = message
+        self._buckets.setdefault(self._bucket_key(message), []).append(seq)
+        self._by_role[message.role][seq] = None
+        self._by_sent_from[message.sent_from][seq] = None
+        for token in set(_TOKEN_PATTERN.findall(message.content)):
+            self._postings[token].add(seq)
+
+    def _unindex_seq(self, seq: int):
+        message = self._entries.pop(seq)
+        key = self._bucket_key(message)
+        bucket = self._buckets.get(key, [])
+        if seq in bucket:
+            bucket.remove(seq)
+            if not bucket:
+                del self._buckets[key]
+        self._by_role[message.role].pop(seq, None)
+        self._by_sent_from[message.sent_from].pop(seq, None)
+        for token in set(_TOKEN_PATTERN.findall(message.content)):
+            self._postings[token].discard(seq)
+
+    def _ensure_indexed(self):
+        """Rebuild the private indexes if `storage` has been replaced or changed from outside"""
+        if self._indexed == (id(self.storage), len(self.storage)):
+            return
+        self._entries = {}
+        self._buckets = {}
+        self._by_role = defaultdict(dict)
+        self._by_sent_from = defaultdict(dict)
+        self._postings = defaultdict(set)
+        for message in self.storage:
+            self._index_message(message)
+        self._mark_indexed()
+
+    def _mark_indexed(self):
+        self._indexed = (id(self.storage), len(self.storage))
+
+    def _search_candidates(self, keyword: str) -> Optional[set[int]]:
+        """Return a superset of the sequence numbers of messages whose content contains the keyword, or None if the
+        keyword has no word to search by.
+
+        A word inside the keyword must be a whole word of the content, while the first/last word of the keyword may
+        be the tail/head of a content word, and a keyword of a single word may be any part of a content word.
+        """
+        candidates = None
+        for match in _TOKEN_PATTERN.finditer(keyword):
+            token, is_head, is_tail = match.group(), match.start() == 0, match.end() == len(keyword)
+            if not is_head and not is_tail:
+                seqs = self._postings.get(token, set())
+            else:
+                seqs = set()
+                for word, postings in self._postings.items():
+                    if (
+                        (is_head and is_tail and token in word)
+                        or (is_head and not is_tail and word.endswith(token))
+                        or (is_tail and not is_head and word.startswith(token))
+                    ):
+                        seqs |= postings
+            candidates = seqs if candidates is None else candidates & seqs
+            if not candidates:
+                break
+        return candidates
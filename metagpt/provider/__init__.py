@@ -5,20 +5,47 @@
 @Author  : alexanderwu
 @File    : __init__.py
 """
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from metagpt.provider.anthropic_api import AnthropicLLM
+    from metagpt.provider.ark_api import ArkLLM
+    from metagpt.provider.azure_openai_api import AzureOpenAILLM
+    from metagpt.provider.bedrock_api import BedrockLLM
+    from metagpt.provider.dashscope_api import DashScopeLLM
+    from metagpt.provider.google_gemini_api import GeminiLLM
+    from metagpt.provider.human_provider import HumanProvider
+    from metagpt.provider.metagpt_api import MetaGPTLLM
+    from metagpt.provider.ollama_api import OllamaLLM
+    from metagpt.provider.openai_api import OpenAILLM
+    from metagpt.provider.qianfan_api import QianFanLLM
+    from metagpt.provider.spark_api import SparkLLM
+    from metagpt.provider.zhipuai_api import ZhiPuAILLM
+
+# Each provider pulls in its own SDK, so the providers are imported on the first access of their names
+_PROVIDER_CLASSES = {
+    "GeminiLLM": "metagpt.provider.google_gemini_api",
+    "OpenAILLM": "metagpt.provider.openai_api",
+    "ZhiPuAILLM": "metagpt.provider.zhipuai_api",
+    "AzureOpenAILLM": "metagpt.provider.azure_openai_api",
+    "MetaGPTLLM": "metagpt.provider.metagpt_api",
+    "OllamaLLM": "metagpt.provider.ollama_api",
+    "HumanProvider": "metagpt.provider.human_provider",
+    "SparkLLM": "metagpt.provider.spark_api",
+    "QianFanLLM": "metagpt.provider.qianfan_api",
+    "DashScopeLLM": "metagpt.provider.dashscope_api",
+    "AnthropicLLM": "metagpt.provider.anthropic_api",
+    "BedrockLLM": "metagpt.provider.bedrock_api",
+    "ArkLLM": "metagpt.provider.ark_api",
+}
+
+
+def __getattr__(name: str):
+    if name in _PROVIDER_CLASSES:
+        return getattr(importlib.import_module(_PROVIDER_CLASSES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from metagpt.provider.google_gemini_api import GeminiLLM
-from metagpt.provider.ollama_api import OllamaLLM
-from metagpt.provider.openai_api import OpenAILLM
-from metagpt.provider.zhipuai_api import ZhiPuAILLM
-from metagpt.provider.azure_openai_api import AzureOpenAILLM
-from metagpt.provider.metagpt_api import MetaGPTLLM
-from metagpt.provider.human_provider import HumanProvider
-from metagpt.provider.spark_api import SparkLLM
-from metagpt.provider.qianfan_api import QianFanLLM
-from metagpt.provider.dashscope_api import DashScopeLLM
-from metagpt.provider.anthropic_api import AnthropicLLM
-from metagpt.provider.bedrock_api import BedrockLLM
-from metagpt.provider.ark_api import ArkLLM
 
 __all__ = [
     "GeminiLLM",
@@ -34,9 +34,9 @@ class AzureOpenAILLM(OpenAILLM):
             azure_endpoint=self.config.base_url,
         )
 
-        # to use proxy, openai v1 needs http_client
-        proxy_params = self._get_proxy_params()
-        if proxy_params:
-            kwargs["http_client"] = AsyncHttpxClientWrapper(**proxy_params)
+        # to use proxy or a customized connection pool, openai v1 needs http_client
+        http_client_params = {**self._get_proxy_params(), **self._get_pool_params()}
+        if http_client_params:
+            kwargs["http_client"] = AsyncHttpxClientWrapper(**http_client_params)
 
         return kwargs
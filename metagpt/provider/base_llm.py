@@ -8,6 +8,7 @@
 """
 from __future__ import annotations
 
+import inspect
 import json
 from abc import ABC, abstractmethod
 from typing import Optional, Union
@@ -24,7 +25,8 @@ from tenacity import (
 
 from metagpt.configs.llm_config import LLMConfig
 from metagpt.const import LLM_API_TIMEOUT, USE_CONFIG_TIMEOUT
-from metagpt.logs import logger
+from metagpt.logs import log_llm_stream, logger
+from metagpt.provider.response_cache import ResponseCache, get_response_cache
 from metagpt.schema import Message
 from metagpt.utils.common import log_and_reraise
 from metagpt.utils.cost_manager import CostManager, Costs
@@ -149,7 +151,7 @@ class BaseLLM(ABC):
         if stream is None:
             stream = self.config.stream
         logger.debug(message)
-        rsp = await self.acompletion_text(message, stream=stream, timeout=self.get_timeout(timeout))
+        rsp = await self._acompletion_text_with_cache(message, stream=stream, timeout=self.get_timeout(timeout))
         return rsp
 
     def _extract_assistant_rsp(self, context):
@@ -161,13 +163,44 @@ class BaseLLM(ABC):
         for msg in msgs:
             umsg = self._user_msg(msg)
             context.append(umsg)
-            rsp_text = await self.acompletion_text(context, timeout=self.get_timeout(timeout))
+            rsp_text = await self._acompletion_text_with_cache(context, timeout=self.get_timeout(timeout))
             context.append(self._assistant_msg(rsp_text))
         return self._extract_assistant_rsp(context)
 
     async def aask_code(self, messages: Union[str, Message, list[dict]], timeout=USE_CONFIG_TIMEOUT, **kwargs) -> dict:
         raise NotImplementedError
 
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """The response cache shared by llm instances with the same cache config, None if disabled"""
+        return get_response_cache(getattr(self.config, "cache", None))
+
+    def _cache_key(self, messages: list[dict], tools: Optional[list[dict]] = None) -> str:
+        return ResponseCache.make_key(
+            model=self.model or self.config.model, messages=messages, temperature=self.config.temperature, tools=tools
+        )
+
+    async def _acompletion_text_with_cache(
+        self, messages: list[dict], stream: bool = False, timeout: int = USE_CONFIG_TIMEOUT
+    ) -> str:
+        """`acompletion_text` through the response cache if enabled"""
+        cache = self.response_cache
+        if not cache:
+            return await self.acompletion_text(messages, stream=stream, timeout=timeout)
+
+        hit = True
+
+        async def _call():
+            nonlocal hit
+            hit = False
+            return await self.acompletion_text(messages, stream=stream, timeout=timeout)
+
+        rsp = await cache.aget_or_call(self._cache_key(list(messages)), _call, cost_manager=self.cost_manager)
+        if hit and stream:
+            log_llm_stream(rsp)
+            log_llm_stream("\n")
+        return rsp
+
     @abstractmethod
     async def _achat_completion(self, messages: list[dict], timeout=USE_CONFIG_TIMEOUT):
         """_achat_completion implemented by inherited class"""
@@ -266,3 +299,9 @@ class BaseLLM(ABC):
 
     def get_timeout(self, timeout: int) -> int:
         return timeout or self.config.timeout or LLM_API_TIMEOUT
+
+    async def aclose(self):
+        """Close the client and release its connection pool, if it has an async close, unlike the dashscope SDK class"""
+        close = getattr(self.aclient, "close", None)
+        if close is not None and inspect.iscoroutinefunction(close):
+            await close()
@@ -5,26 +5,90 @@
 @Author  : alexanderwu
 @File    : llm_provider_registry.py
 """
+import asyncio
+import copy
+import importlib
+import json
+from typing import Optional
+
 from metagpt.configs.llm_config import LLMConfig, LLMType
+from metagpt.logs import logger
 from metagpt.provider.base_llm import BaseLLM
+from metagpt.provider.rate_limiter import rate_limited
+
+# The module of the provider of each llm type. A provider module is imported on its first use, so that only the SDK of
+# the configured provider is loaded; its `register_provider` decorator registers it on import.
+PROVIDER_MODULES: dict[LLMType, str] = {
+    LLMType.OPENAI: "metagpt.provider.openai_api",
+    LLMType.FIREWORKS: "metagpt.provider.openai_api",
+    LLMType.OPEN_LLM: "metagpt.provider.openai_api",
+    LLMType.MOONSHOT: "metagpt.provider.openai_api",
+    LLMType.MISTRAL: "metagpt.provider.openai_api",
+    LLMType.YI: "metagpt.provider.openai_api",
+    LLMType.OPENROUTER: "metagpt.provider.openai_api",
+    LLMType.ANTHROPIC: "metagpt.provider.anthropic_api",
+    LLMType.CLAUDE: "metagpt.provider.anthropic_api",
+    LLMType.SPARK: "metagpt.provider.spark_api",
+    LLMType.ZHIPUAI: "metagpt.provider.zhipuai_api",
+    LLMType.GEMINI: "metagpt.provider.google_gemini_api",
+    LLMType.METAGPT: "metagpt.provider.metagpt_api",
+    LLMType.AZURE: "metagpt.provider.azure_openai_api",
+    LLMType.OLLAMA: "metagpt.provider.ollama_api",
+    LLMType.QIANFAN: "metagpt.provider.qianfan_api",
+    LLMType.DASHSCOPE: "metagpt.provider.dashscope_api",
+    LLMType.BEDROCK: "metagpt.provider.bedrock_api",
+    LLMType.ARK: "metagpt.provider.ark_api",
+}
 
 
 class LLMProviderRegistry:
     def __init__(self):
         self.providers = {}
+        # (event loop, normalized llm config) -> shared llm instance, as the clients are bound to the loop they run in
+        self.instances: dict[tuple[Optional[asyncio.AbstractEventLoop], str], BaseLLM] = {}
 
     def register(self, key, provider_cls):
         self.providers[key] = provider_cls
 
     def get_provider(self, enum: LLMType):
-        """get provider instance according to the enum"""
+        """get provider instance according to the enum, import its module if not registered yet"""
+        if enum not in self.providers and enum in PROVIDER_MODULES:
+            importlib.import_module(PROVIDER_MODULES[enum])
         return self.providers[enum]
 
+    def get_instance(self, config: LLMConfig) -> BaseLLM:
+        """get the shared llm instance of the config in the running event loop, create it if not existed"""
+        # the clients of closed loops can not be used nor closed any more
+        for key in [key for key in self.instances if key[0] is not None and key[0].is_closed()]:
+            del self.instances[key]
+
+        key = (_running_loop(), llm_config_key(config))
+        if key not in self.instances:
+            self.instances[key] = create_llm_instance(config)
+        return self.instances[key]
+
+    async def aclose(self):
+        """close the shared llm instances of the running event loop, or created out of any loop, and their clients"""
+        loop = _running_loop()
+        for key in [key for key in self.instances if key[0] in (loop, None)]:
+            llm = self.instances.pop(key)
+            try:
+                await llm.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close the client of {type(llm).__name__}: {e}")
+
+
+# request entry points of providers, `aask_code` requests through `_achat_completion_function` past its response cache
+RATE_LIMITED_METHODS = ["acompletion_text", "acompletion", "_achat_completion_function"]
+
 
 def register_provider(keys):
-    """register provider to registry"""
+    """register provider to registry, its requests are limited by the rate limit of `LLMConfig`"""
 
     def decorator(cls):
+        for name in RATE_LIMITED_METHODS:
+            if hasattr(cls, name):
+                setattr(cls, name, rate_limited(getattr(cls, name)))
         if isinstance(keys, list):
             for key in keys:
                 LLM_REGISTRY.register(key, cls)
@@ -40,5 +104,30 @@ def create_llm_instance(config: LLMConfig) -> BaseLLM:
     return LLM_REGISTRY.get_provider(config.api_type)(config)
 
 
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def llm_config_key(config: LLMConfig) -> str:
+    """normalize the llm config into a hashable cache key"""
+    return json.dumps(config.model_dump(mode="json"), sort_keys=True)
+
+
+def get_llm_instance(config: LLMConfig) -> BaseLLM:
+    """get a caller-owned llm instance which shares the client and connection pool of the cached one.
+
+    The returned instance has its own config and cost manager, so that callers sharing a client do not mix up costs.
+    """
+    shared = LLM_REGISTRY.get_instance(config)
+    llm = copy.copy(shared)
+    llm.config = shared.config.model_copy()
+    if shared.cost_manager is not None:
+        llm.cost_manager = shared.cost_manager.model_copy()
+    return llm
+
+
 # Registry instance
 LLM_REGISTRY = LLMProviderRegistry()
@@ -12,8 +12,10 @@ import json
 import re
 from typing import Optional, Union
 
+import httpx
 from openai import APIConnectionError, AsyncOpenAI, AsyncStream
 from openai._base_client import AsyncHttpxClientWrapper
+from openai._constants import DEFAULT_CONNECTION_LIMITS
 from openai.types import CompletionUsage
 from openai.types.chat import ChatCompletion, ChatCompletionChunk
 from tenacity import (
@@ -71,9 +73,9 @@ class OpenAILLM(BaseLLM):
     def _make_client_kwargs(self) -> dict:
         kwargs = {"api_key": self.config.api_key, "base_url": self.config.base_url}
 
-        # to use proxy, openai v1 needs http_client
-        if proxy_params := self._get_proxy_params():
-            kwargs["http_client"] = AsyncHttpxClientWrapper(**proxy_params)
+        # to use proxy or a customized connection pool, openai v1 needs http_client
+        if http_client_params := {**self._get_proxy_params(), **self._get_pool_params()}:
+            kwargs["http_client"] = AsyncHttpxClientWrapper(**http_client_params)
 
         return kwargs
 
@@ -86,6 +88,18 @@ class OpenAILLM(BaseLLM):
 
         return params
 
+    def _get_pool_params(self) -> dict:
+        config = self.config
+        if not (config.max_connections or config.max_keepalive_connections or config.keepalive_expiry):
+            return {}
+        limits = httpx.Limits(
+            max_connections=config.max_connections or DEFAULT_CONNECTION_LIMITS.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections
+            or DEFAULT_CONNECTION_LIMITS.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry or DEFAULT_CONNECTION_LIMITS.keepalive_expiry,
+        )
+        return {"limits": limits}
+
     async def _achat_completion_stream(self, messages: list[dict], timeout=USE_CONFIG_TIMEOUT) -> str:
         response: AsyncStream[ChatCompletionChunk] = await self.aclient.chat.completions.create(
             **self._cons_kwargs(messages, timeout=self.get_timeout(timeout)), stream=True
@@ -182,8 +196,17 @@ class OpenAILLM(BaseLLM):
         if "tools" not in kwargs:
             configs = {"tools": [{"type": "function", "function": GENERAL_FUNCTION_SCHEMA}]}
             kwargs.update(configs)
-        rsp = await self._achat_completion_function(messages, **kwargs)
-        return self.get_choice_function_arguments(rsp)
+        cache = self.response_cache
+        if not cache:
+            rsp = await self._achat_completion_function(messages, **kwargs)
+            return self.get_choice_function_arguments(rsp)
+
+        async def _call():
+            rsp = await self._achat_completion_function(messages, **kwargs)
+            return self.get_choice_function_arguments(rsp)
+
+        key = self._cache_key(self.format_msg(messages), tools=kwargs["tools"])
+        return await cache.aget_or_call(key, _call, cost_manager=self.cost_manager)
 
     def _parse_arguments(self, arguments: str) -> dict:
         """parse arguments in openai function call"""
@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Time    : 2026/10/18
+@File    : rate_limiter.py
+@Desc    : Provider-wide rate limiter shared by all llm instances of the same provider/model. It limits requests/min,
+    tokens/min and in-flight requests, caps the in-flight requests of the whole process, admits waiting requests by priority, and backs off on rate limit errors
+    according to the `Retry-After` header.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import random
+import time
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Optional
+
+from metagpt.configs.llm_config import LLMConfig
+from metagpt.logs import logger
+from metagpt.utils.token_counter import count_input_tokens
+
+
+class LLMPriority(IntEnum):
+    """Priority of llm requests, smaller values are admitted first when rate limited"""
+
+    HIGH = 0  # e.g. planning, which blocks the whole team
+    NORMAL = 1
+    LOW = 2  # e.g. code review, which can lag behind
+
+
+_LLM_PRIORITY: contextvars.ContextVar[LLMPriority] = contextvars.ContextVar("llm_priority", default=LLMPriority.NORMAL)
+_RATE_LIMITED: contextvars.ContextVar[bool] = contextvars.ContextVar("rate_limited", default=False)
+
+
+@contextmanager
+def llm_priority(priority: LLMPriority):
+    """Set the priority of llm requests issued in the context.
+
+    Example:
+        >>> with llm_priority(LLMPriority.HIGH):
+        ...     rsp = await WritePlan().run(context)
+    """
+    token = _LLM_PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _LLM_PRIORITY.reset(token)
+
+
+class PrioritySemaphore:
+    """A semaphore whose waiters are woken up by priority, then in FIFO order. `value=0` means unlimited."""
+
+    def __init__(self, value: int = 0):
+        self._value = value
+        self._in_use = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    @property
+    def limited(self) -> bool:
+        return bool(self._value)
+
+    def locked(self) -> bool:
+        return bool(self._value) and self._in_use >= self._value
+
+    async def acquire(self, priority: int = LLMPriority.NORMAL):
+        if not self.locked() and not self._waiters:
+            self._in_use += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # the slot has been handed over, pass it on
+            raise
+
+    def release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)  # hand the slot over directly
+                return
+        self._in_use -= 1
+
+    @asynccontextmanager
+    async def hold(self, priority: int = LLMPriority.NORMAL):
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+_GLOBAL_IN_FLIGHT: Optional[PrioritySemaphore] = None
+
+
+def set_global_max_concurrency(value: int):
+    """Limit the in-flight requests of all providers/models in the process, 0 means unlimited"""
+    global _GLOBAL_IN_FLIGHT
+    _GLOBAL_IN_FLIGHT = PrioritySemaphore(value)
+
+
+def get_global_in_flight() -> PrioritySemaphore:
+    """Return the in-flight limit of the process, `llm_max_concurrency` of the config by default"""
+    if _GLOBAL_IN_FLIGHT is None:
+        from metagpt.config2 import config
+
+        set_global_max_concurrency(config.llm_max_concurrency)
+    return _GLOBAL_IN_FLIGHT
+
+
+class TokenBucket:
+    """Token bucket refilled continuously, `capacity` tokens per `period` seconds"""
+
+    def __init__(self, capacity: float, period: float = 60):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds to wait until `amount` tokens are available"""
+        self._refill()
+        amount = min(amount, self.capacity)  # a single oversized request is let through once the bucket is full
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Rate limiter of a provider/model"""
+
+    def __init__(self, rpm: int = 0, tpm: int = 0, max_concurrency: int = 0, max_retries: int = 3):
+        self.request_bucket = TokenBucket(rpm) if rpm else None
+        self.token_bucket = TokenBucket(tpm) if tpm else None
+        self.max_retries = max_retries
+        self._admission = PrioritySemaphore(1)  # admit one waiting request at a time, by priority
+        self._in_flight = PrioritySemaphore(max_concurrency)
+        self._paused_until = 0.0
+
+    def pause(self, seconds: float):
+        """Stop admitting requests for `seconds`, e.g. told by the `Retry-After` header"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _wait_time(self, tokens: int) -> float:
+        wait = self._paused_until - time.monotonic()
+        if self.request_bucket:
+            wait = max(wait, self.request_bucket.wait_time(1))
+        if self.token_bucket:
+            wait = max(wait, self.token_bucket.wait_time(tokens))
+        return wait
+
+    @asynccontextmanager
+    async def limit(self, tokens: int = 0, priority: Optional[int] = None):
+        """Wait for the turn of a request with the estimated `tokens`, and hold an in-flight slot during the request"""
+        priority = _LLM_PRIORITY.get() if priority is None else priority
+        global_in_flight = get_global_in_flight()
+        async with self._admission.hold(priority):
+            await self._in_flight.acquire(priority)
+            try:
+                await global_in_flight.acquire(priority)
+            except BaseException:
+                self._in_flight.release()
+                raise
+            try:
+                while (wait := self._wait_time(tokens)) > 0:
+                    await asyncio.sleep(wait)
+            except BaseException:
+                global_in_flight.release()
+                self._in_flight.release()
+                raise
+            if self.request_bucket:
+                self.request_bucket.consume(1)
+            if self.token_bucket:
+                self.token_bucket.consume(tokens)
+        try:
+            yield
+        finally:
+            global_in_flight.release()
+            self._in_flight.release()
+
+
+def get_retry_after(e: Exception, attempt: int) -> Optional[float]:
+    """Return seconds to wait before retrying if `e` is a rate limit error, None otherwise.
+    The `Retry-After` header is respected, falling back to random exponential backoff."""
+    response = getattr(e, "response", None)
+    status_code = getattr(e, "status_code", None) or getattr(response, "status_code", None)
+    if status_code != 429 and "RateLimit" not in type(e).__name__:
+        return None
+
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if retry_after_ms := headers.get("retry-after-ms"):
+            return float(retry_after_ms) / 1000
+        if retry_after := headers.get("retry-after"):
+            if retry_after.replace(".", "", 1).isdigit():
+                return float(retry_after)
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        pass
+    return min(60.0, 2**attempt + random.random())
+
+
+def estimate_input_tokens(messages: list[dict], model: str) -> int:
+    try:
+        return count_input_tokens(messages, model)
+    except Exception:
+        return sum(len(str(i.get("content", "") if isinstance(i, dict) else i)) for i in messages) // 4
+
+
+_RATE_LIMITERS: dict[tuple, RateLimiter] = {}
+
+
+def get_rate_limiter(config: LLMConfig) -> Optional[RateLimiter]:
+    """Return the rate limiter shared by all llm instances of the provider/model, None if not limited"""
+    if not (config.rpm or config.tpm or config.max_concurrency or get_global_in_flight().limited):
+        return None
+    key = (config.api_type, config.base_url, config.model)
+    if key not in _RATE_LIMITERS:
+        _RATE_LIMITERS[key] = RateLimiter(
+            rpm=config.rpm,
+            tpm=config.tpm,
+            max_concurrency=config.max_concurrency,
+            max_retries=config.rate_limit_max_retries,
+        )
+    return _RATE_LIMITERS[key]
+
+
+def rate_limited(func):
+    """Decorate a request entry point of a provider, e.g. `BaseLLM.acompletion_text`, with the rate limiter configured
+    in its `LLMConfig`. Entry points called by another one are limited once, by the outermost."""
+    if getattr(func, "__rate_limited__", False):
+        return func
+
+    @functools.wraps(func)
+    async def wrapper(self, messages: list[dict], *args, **kwargs):
+        limiter = get_rate_limiter(self.config)
+        if not limiter or _RATE_LIMITED.get():
+            return await func(self, messages, *args, **kwargs)
+
+        tokens = estimate_input_tokens(
+            messages if isinstance(messages, list) else [messages], self.pricing_plan or self.model or self.config.model
+        )
+        attempt = 0
+        while True:
+            try:
+                async with limiter.limit(tokens):
+                    token = _RATE_LIMITED.set(True)
+                    try:
+                        return await func(self, messages, *args, **kwargs)
+                    finally:
+                        _RATE_LIMITED.reset(token)
+            except Exception as e:
+                retry_after = get_retry_after(e, attempt)
+                if retry_after is None or attempt >= limiter.max_retries:
+                    raise
+                attempt += 1
+                logger.warning(f"{type(self).__name__} is rate limited, retry after {retry_after:.1f}s: {e}")
+                limiter.pause(retry_after)
+
+    wrapper.__rate_limited__ = True
+    return wrapper
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Time    : 2026/10/18
+@File    : response_cache.py
+@Desc    : Content-addressed cache of LLM responses. With the `record` mode, identical requests are served from the
+    cache; with the `replay` mode, a whole session can be rerun offline and deterministically.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from metagpt.configs.llm_config import LLMCacheConfig
+from metagpt.const import CONFIG_ROOT
+from metagpt.logs import logger
+from metagpt.utils.cost_manager import CostManager
+
+DEFAULT_SQLITE_CACHE_PATH = CONFIG_ROOT / "llm_response_cache.sqlite"
+
+
+class LLMCacheMissError(Exception):
+    """Raised in the `replay` mode when a request has no recorded response"""
+
+
+class ResponseCacheBackend(ABC):
+    """Storage of the response cache. Values must be json serializable."""
+
+    def __init__(self, max_size: int = 4096, ttl: float = 0):
+        self.max_size = max_size
+        self.ttl = ttl
+
+    def _expired(self, created_at: float) -> bool:
+        return bool(self.ttl) and time.time() - created_at > self.ttl
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if not existed or expired"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any):
+        """Cache the value, evicting the least recently used ones if full"""
+
+    @abstractmethod
+    def clear(self):
+        """Remove all cached values"""
+
+
+class MemoryResponseCacheBackend(ResponseCacheBackend):
+    """In-process LRU cache"""
+
+    def __init__(self, max_size: int = 4096, ttl: float = 0):
+        super().__init__(max_size=max_size, ttl=ttl)
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        created_at, value = item
+        if self._expired(created_at):
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any):
+        self._data[key] = (time.time(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteResponseCacheBackend(ResponseCacheBackend):
+    """On-disk cache shared by processes, which survives restarts"""
+
+    def __init__(self, path: str | Path = "", max_size: int = 4096, ttl: float = 0):
+        super().__init__(max_size=max_size, ttl=ttl)
+        self.path = Path(path) if path else DEFAULT_SQLITE_CACHE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_response_cache "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_response_cache_accessed_at ON llm_response_cache (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self._expired(created_at):
+                self._conn.execute("DELETE FROM llm_response_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE llm_response_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return json.loads(value)
+
+    def set(self, key: str, value: Any):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM llm_response_cache WHERE key IN "
+                "(SELECT key FROM llm_response_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_size,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_response_cache")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+
+
+class ResponseCache:
+    """LLM response cache keyed on the hash of the request content"""
+
+    def __init__(self, config: LLMCacheConfig, backend: ResponseCacheBackend = None):
+        self.config = config
+        self.backend = backend if backend is not None else self._create_backend(config)
+
+    @staticmethod
+    def _create_backend(config: LLMCacheConfig) -> ResponseCacheBackend:
+        if config.backend == "sqlite":
+            return SQLiteResponseCacheBackend(path=config.path, max_size=config.max_size, ttl=config.ttl)
+        return MemoryResponseCacheBackend(max_size=config.max_size, ttl=config.ttl)
+
+    @property
+    def replay_only(self) -> bool:
+        return self.config.mode == "replay"
+
+    @staticmethod
+    def make_key(model: str, messages: list[dict], temperature: float, tools: Optional[list[dict]] = None) -> str:
+        """Hash the parts of a request which determine its response"""
+        content = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "tools": tools},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    async def aget_or_call(
+        self, key: str, func: Callable[[], Awaitable[Any]], cost_manager: Optional[CostManager] = None
+    ) -> Any:
+        """Return the cached response of the key, or call `func` and record its response.
+
+        Raises:
+            LLMCacheMissError: In the `replay` mode and the key is not cached.
+        """
+        value = self.backend.get(key)
+        if cost_manager is not None:
+            cost_manager.update_cache_stats(hit=value is not None)
+        if value is not None:
+            logger.debug(f"LLM response cache hit: {key}")
+            return value
+        if self.replay_only:
+            raise LLMCacheMissError(f"No recorded LLM response for request {key} in the replay mode")
+        value = await func()
+        self.backend.set(key, value)
+        return value
+
+
+_RESPONSE_CACHES: dict[str, ResponseCache] = {}
+
+
+def get_response_cache(config: Optional[LLMCacheConfig]) -> Optional[ResponseCache]:
+    """Return the response cache shared by all llm instances with the same cache config, None if disabled"""
+    if not config or config.mode == "off":
+        return None
+    key = config.model_dump_json()
+    if key not in _RESPONSE_CACHES:
+        _RESPONSE_CACHES[key] = ResponseCache(config)
+    return _RESPONSE_CACHES[key]
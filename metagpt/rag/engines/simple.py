@@ -94,7 +94,8 @@ class SimpleEngine(RetrieverQueryEngine):
             transformations: Parse documents to nodes. Default [SentenceSplitter].
             embed_model: Parse nodes to embedding. Must supported by llama index. Default OpenAIEmbedding.
             llm: Must supported by llama index. Default OpenAI.
-            retriever_configs: Configuration for retrievers. If more than one config, will use SimpleHybridRetriever.
+            retriever_configs: Configuration for retrievers. If more than one config, will use SimpleHybridRetriever,
+                which fuses the results as the fusion config in it, e.g. RRFFusionConfig.
             ranker_configs: Configuration for rankers.
         """
         if not input_dir and not input_files:
@@ -132,7 +133,8 @@ class SimpleEngine(RetrieverQueryEngine):
             transformations: Parse documents to nodes. Default [SentenceSplitter].
             embed_model: Parse nodes to embedding. Must supported by llama index. Default OpenAIEmbedding.
             llm: Must supported by llama index. Default OpenAI.
-            retriever_configs: Configuration for retrievers. If more than one config, will use SimpleHybridRetriever.
+            retriever_configs: Configuration for retrievers. If more than one config, will use SimpleHybridRetriever,
+                which fuses the results as the fusion config in it, e.g. RRFFusionConfig.
             ranker_configs: Configuration for rankers.
         """
         objs = objs or []
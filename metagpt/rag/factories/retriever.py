@@ -21,6 +21,7 @@ from metagpt.rag.retrievers.es_retriever import ElasticsearchRetriever
 from metagpt.rag.retrievers.faiss_retriever import FAISSRetriever
 from metagpt.rag.retrievers.hybrid_retriever import SimpleHybridRetriever
 from metagpt.rag.schema import (
+    BaseFusionConfig,
     BaseRetrieverConfig,
     BM25RetrieverConfig,
     ChromaRetrieverConfig,
@@ -62,14 +63,22 @@ class RetrieverFactory(ConfigBasedFactory):
     def get_retriever(self, configs: list[BaseRetrieverConfig] = None, **kwargs) -> RAGRetriever:
         """Creates and returns a retriever instance based on the provided configurations.
 
-        If multiple retrievers, using SimpleHybridRetriever.
+        If multiple retrievers, using SimpleHybridRetriever, which fuses their results as the fusion config in configs.
         """
+        configs = configs or []
+        fusion_configs = [config for config in configs if isinstance(config, BaseFusionConfig)]
+        if len(fusion_configs) > 1:
+            raise ValueError(f"Expect at most one fusion config, got {len(fusion_configs)}.")
+
+        configs = [config for config in configs if not isinstance(config, BaseFusionConfig)]
         if not configs:
             return self._create_default(**kwargs)
 
         retrievers = super().get_instances(configs, **kwargs)
+        if len(retrievers) == 1:
+            return retrievers[0]
 
-        return SimpleHybridRetriever(*retrievers) if len(retrievers) > 1 else retrievers[0]
+        return SimpleHybridRetriever(*retrievers, fusion_config=fusion_configs[0] if fusion_configs else None)
 
     def _create_default(self, **kwargs) -> RAGRetriever:
         index = self._extract_index(None, **kwargs) or self._build_default_index(**kwargs)
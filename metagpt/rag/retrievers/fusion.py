@@ -0,0 +1,76 @@
+"""Fusion of the results of multiple retrievers."""
+
+from typing import Callable
+
+from llama_index.core.schema import NodeWithScore
+
+from metagpt.rag.schema import (
+    BaseFusionConfig,
+    DedupFusionConfig,
+    RRFFusionConfig,
+    WeightedFusionConfig,
+)
+
+
+def dedup_fusion(results: list[list[NodeWithScore]], config: DedupFusionConfig) -> list[NodeWithScore]:
+    """Concatenate the results in order, keeping the first result of each node."""
+    fused = {}
+    for nodes in results:
+        for n in nodes:
+            fused.setdefault(n.node.node_id, n)
+    return list(fused.values())
+
+
+def rrf_fusion(results: list[list[NodeWithScore]], config: RRFFusionConfig) -> list[NodeWithScore]:
+    """Score each node by the sum of 1 / (k + rank) over the results it is in, rank starting from 1."""
+    scores = {}
+    for nodes in results:
+        for rank, n in enumerate(nodes, start=1):
+            scores[n.node.node_id] = scores.get(n.node.node_id, 0.0) + 1.0 / (config.k + rank)
+    return _sorted_by_scores(results, scores)
+
+
+def weighted_fusion(results: list[list[NodeWithScore]], config: WeightedFusionConfig) -> list[NodeWithScore]:
+    """Score each node by the weighted sum of its min-max normalized scores, 0 in the results it is not in."""
+    weights = config.weights or [1.0] * len(results)
+    if len(weights) != len(results):
+        raise ValueError(f"Got {len(weights)} weights for {len(results)} retrievers.")
+
+    scores = {}
+    for weight, nodes in zip(weights, results):
+        raw = [n.score or 0.0 for n in nodes]
+        low, high = min(raw, default=0.0), max(raw, default=0.0)
+        for n, score in zip(nodes, raw):
+            normalized = (score - low) / (high - low) if high > low else 1.0
+            scores[n.node.node_id] = scores.get(n.node.node_id, 0.0) + weight * normalized
+    return _sorted_by_scores(results, scores)
+
+
+def _sorted_by_scores(results: list[list[NodeWithScore]], scores: dict[str, float]) -> list[NodeWithScore]:
+    """The nodes with their fused scores, best first, ties kept in the order of the results."""
+    nodes = dedup_fusion(results, DedupFusionConfig())
+    fused = [NodeWithScore(node=n.node, score=scores[n.node.node_id]) for n in nodes]
+    return sorted(fused, key=lambda n: n.score, reverse=True)
+
+
+Fusion = Callable[[list[list[NodeWithScore]], BaseFusionConfig], list[NodeWithScore]]
+
+FUSIONS: dict[type[BaseFusionConfig], Fusion] = {
+    DedupFusionConfig: dedup_fusion,
+    RRFFusionConfig: rrf_fusion,
+    WeightedFusionConfig: weighted_fusion,
+}
+
+
+def fuse(results: list[list[NodeWithScore]], config: BaseFusionConfig = None) -> list[NodeWithScore]:
+    """Fuse the results of the retrievers as configured, then keep the top_k of them.
+
+    Default to DedupFusionConfig.
+    """
+    config = config or DedupFusionConfig()
+    fusion = FUSIONS.get(type(config))
+    if fusion is None:
+        raise ValueError(f"Unknown fusion config: `{type(config)}`, {config}")
+
+    fused = fusion(results, config)
+    return fused if config.top_k is None else fused[: config.top_k]
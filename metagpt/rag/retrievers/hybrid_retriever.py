@@ -1,41 +1,44 @@
 """Hybrid retriever."""
 
+import asyncio
 import copy
 
-from llama_index.core.schema import BaseNode, QueryType
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import BaseNode, NodeWithScore, QueryType
 
 from metagpt.rag.retrievers.base import RAGRetriever
+from metagpt.rag.retrievers.fusion import fuse
+from metagpt.rag.schema import BaseFusionConfig
 
 
 class SimpleHybridRetriever(RAGRetriever):
     """A composite retriever that aggregates search results from multiple retrievers."""
 
-    def __init__(self, *retrievers):
+    def __init__(self, *retrievers, fusion_config: BaseFusionConfig = None):
         self.retrievers: list[RAGRetriever] = retrievers
+        self.fusion_config = fusion_config
         super().__init__()
 
     async def _aretrieve(self, query: QueryType, **kwargs):
         """Asynchronously retrieves and aggregates search results from all configured retrievers.
 
-        This method queries each retriever in the `retrievers` list with the given query and
-        additional keyword arguments. It then combines the results, ensuring that each node is
-        unique, based on the node's ID.
+        This method queries the retrievers in the `retrievers` list concurrently with the given query and
+        additional keyword arguments. It then fuses the results as `fusion_config`, by default ensuring that
+        each node is unique, based on the node's ID.
         """
-        all_nodes = []
-        for retriever in self.retrievers:
-            # Prevent retriever changing query
-            query_copy = copy.deepcopy(query)
-            nodes = await retriever.aretrieve(query_copy, **kwargs)
-            all_nodes.extend(nodes)
-
-        # combine all nodes
-        result = []
-        node_ids = set()
-        for n in all_nodes:
-            if n.node.node_id not in node_ids:
-                result.append(n)
-                node_ids.add(n.node.node_id)
-        return result
+        results = await asyncio.gather(*[self._aretrieve_one(r, query, **kwargs) for r in self.retrievers])
+
+        return fuse(results, self.fusion_config)
+
+    @staticmethod
+    async def _aretrieve_one(retriever: RAGRetriever, query: QueryType, **kwargs) -> list[NodeWithScore]:
+        # Prevent retriever changing query
+        query_copy = copy.deepcopy(query)
+
+        # Retrievers without async implementation block the event loop, run them in a thread
+        if getattr(type(retriever), "_aretrieve", None) is BaseRetriever._aretrieve:
+            return await asyncio.to_thread(retriever.retrieve, query_copy, **kwargs)
+        return await retriever.aretrieve(query_copy, **kwargs)
 
     def add_nodes(self, nodes: list[BaseNode]) -> None:
         """Support add nodes."""
@@ -101,6 +101,38 @@ class ElasticsearchKeywordRetrieverConfig(ElasticsearchRetrieverConfig):
     )
 
 
+class BaseFusionConfig(BaseModel):
+    """Common config for fusing the results of the retrievers of SimpleHybridRetriever.
+
+    Put it in the retriever configs, along with more than one retriever config.
+    If add new subconfig, it is necessary to add the corresponding fusion implementation in rag.retrievers.fusion.
+    """
+
+    _no_embedding: bool = PrivateAttr(default=True)
+    top_k: Optional[int] = Field(default=None, description="Number of top fused results to return, all if None.")
+
+
+class DedupFusionConfig(BaseFusionConfig):
+    """Config for concatenating the results of the retrievers in order, keeping the first result of each node."""
+
+
+class RRFFusionConfig(BaseFusionConfig):
+    """Config for reciprocal rank fusion, which scores a node by the sum of 1 / (k + rank) over the retrievers."""
+
+    k: int = Field(default=60, description="The constant damping the weight of the top ranks.")
+
+
+class WeightedFusionConfig(BaseFusionConfig):
+    """Config for fusing the scores of the retrievers, min-max normalized, in a weighted sum.
+
+    The scores must be higher for better nodes, unlike the L2 distances of the default FAISS index, use RRF for these.
+    """
+
+    weights: Optional[list[float]] = Field(
+        default=None, description="The weight of each retriever, in the order of the retriever configs. Equal if None."
+    )
+
+
 class BaseRankerConfig(BaseModel):
     """Common config for rankers.
 
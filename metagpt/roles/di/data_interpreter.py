@@ -85,6 +85,12 @@ class DataInterpreter(Role):
         code, _, _ = await self._write_and_exec_code()
         return Message(content=code, role="assistant", cause_by=WriteAnalysisCode)
 
+    async def _react(self) -> Message:
+        try:
+            return await super()._react()
+        finally:
+            await self.execute_code.terminate()  # return the kernel to the kernel pool
+
     async def _plan_and_act(self) -> Message:
         try:
             rsp = await super()._plan_and_act()
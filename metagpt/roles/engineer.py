@@ -19,14 +19,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import re
 from collections import defaultdict
 from pathlib import Path
 from typing import Optional, Set
 
 from metagpt.actions import Action, WriteCode, WriteCodeReview, WriteTasks
 from metagpt.actions.fix_bug import FixBug
-from metagpt.actions.project_management_an import REFINED_TASK_LIST, TASK_LIST
+from metagpt.actions.project_management_an import (
+    LOGIC_ANALYSIS,
+    REFINED_LOGIC_ANALYSIS,
+    REFINED_TASK_LIST,
+    TASK_LIST,
+)
 from metagpt.actions.summarize_code import SummarizeCode
 from metagpt.actions.write_code_plan_and_change_an import WriteCodePlanAndChange
 from metagpt.const import (
@@ -67,7 +74,8 @@ class Engineer(Role):
         profile (str): Role profile, default is 'Engineer'.
         goal (str): Goal of the engineer.
         constraints (str): Constraints for the engineer.
-        n_borg (int): Number of borgs.
+        n_borg (int): Number of borgs, i.e. the max number of files written concurrently. If greater than 1, files
+            are written in the dependency order of the task list, with independent ones written in parallel.
         use_code_review (bool): Whether to use code review.
     """
 
@@ -100,6 +108,9 @@ class Engineer(Role):
         return m.get(TASK_LIST.key) or m.get(REFINED_TASK_LIST.key)
 
     async def _act_sp_with_cr(self, review=False) -> Set[str]:
+        if self.n_borg > 1 and len(self.code_todos) > 1:
+            return await self._act_sp_with_cr_parallel(review=review)
+
         changed_files = set()
         for todo in self.code_todos:
             """
@@ -109,27 +120,8 @@ class Engineer(Role):
             3. Do we need other codes (currently needed)?
             TODO: The goal is not to need it. After clear task decomposition, based on the design idea, you should be able to write a single file without needing other codes. If you can't, it means you need a clearer definition. This is the key to writing longer code.
             """
-            coding_context = await todo.run()
-            # Code review
-            if review:
-                action = WriteCodeReview(i_context=coding_context, context=self.context, llm=self.llm)
-                self._init_action(action)
-                coding_context = await action.run()
-
-            dependencies = {coding_context.design_doc.root_relative_path, coding_context.task_doc.root_relative_path}
-            if self.config.inc:
-                dependencies.add(coding_context.code_plan_and_change_doc.root_relative_path)
-            await self.project_repo.srcs.save(
-                filename=coding_context.filename,
-                dependencies=list(dependencies),
-                content=coding_context.code_doc.content,
-            )
-            msg = Message(
-                content=coding_context.model_dump_json(),
-                instruct_content=coding_context,
-                role=self.profile,
-                cause_by=WriteCode,
-            )
+            coding_context = await self._write_code(todo, review=review)
+            msg = await self._save_code(coding_context)
             self.rc.memory.add(msg)
 
             changed_files.add(coding_context.code_doc.filename)
@@ -137,6 +129,96 @@ class Engineer(Role):
             logger.info("Nothing has changed.")
         return changed_files
 
+    async def _act_sp_with_cr_parallel(self, review=False) -> Set[str]:
+        """Write and review the code todos concurrently, at most `n_borg` at a time. A file starts after the files it
+        depends on have been saved, and its review starts as soon as it is written."""
+        graph = self._build_code_todo_graph(self.code_todos)
+        saved = {filename: asyncio.Event() for filename in graph}
+        semaphore = asyncio.Semaphore(self.n_borg)
+        save_lock = asyncio.Lock()  # saving updates the shared dependency file
+        msgs = {}
+
+        async def _write(todo: WriteCode):
+            filename = todo.i_context.filename
+            try:
+                for dependency in graph[filename]:
+                    await saved[dependency].wait()
+                async with semaphore:
+                    coding_context = await self._write_code(todo, review=review)
+                async with save_lock:
+                    msgs[filename] = await self._save_code(coding_context)
+            finally:
+                saved[filename].set()  # dependents go on with whatever is available
+
+        results = await asyncio.gather(*[_write(todo) for todo in self.code_todos], return_exceptions=True)
+
+        # Keep the memory in the task list order, whatever order the files are finished in.
+        changed_files = set()
+        for todo in self.code_todos:
+            msg = msgs.get(todo.i_context.filename)
+            if msg:
+                self.rc.memory.add(msg)
+                changed_files.add(msg.instruct_content.code_doc.filename)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        if not changed_files:
+            logger.info("Nothing has changed.")
+        return changed_files
+
+    async def _write_code(self, todo: WriteCode, review=False) -> CodingContext:
+        coding_context = await todo.run()
+        # Code review
+        if review:
+            action = WriteCodeReview(i_context=coding_context, context=self.context, llm=self.llm)
+            self._init_action(action)
+            coding_context = await action.run()
+        return coding_context
+
+    async def _save_code(self, coding_context: CodingContext) -> Message:
+        dependencies = {coding_context.design_doc.root_relative_path, coding_context.task_doc.root_relative_path}
+        if self.config.inc:
+            dependencies.add(coding_context.code_plan_and_change_doc.root_relative_path)
+        await self.project_repo.srcs.save(
+            filename=coding_context.filename,
+            dependencies=list(dependencies),
+            content=coding_context.code_doc.content,
+        )
+        return Message(
+            content=coding_context.model_dump_json(),
+            instruct_content=coding_context,
+            role=self.profile,
+            cause_by=WriteCode,
+        )
+
+    @staticmethod
+    def _build_code_todo_graph(code_todos: list[WriteCode]) -> dict[str, list[str]]:
+        """Build the dependency DAG of the code todos, `filename -> filenames it depends on`.
+
+        The todos are ordered by dependency as the task list is, so a file only depends on the files before it, which
+        it imports according to its logic analysis or its existing code.
+        """
+        graph = {}
+        for todo in code_todos:
+            filename = todo.i_context.filename
+            coding_context = CodingContext.loads(todo.i_context.content)
+            text = coding_context.code_doc.content if coding_context.code_doc else ""
+            if coding_context.task_doc and coding_context.task_doc.content:
+                m = json.loads(coding_context.task_doc.content)
+                analysis = m.get(LOGIC_ANALYSIS.key) or m.get(REFINED_LOGIC_ANALYSIS.key) or []
+                for i in analysis if isinstance(analysis, list) else []:
+                    if isinstance(i, list) and i and Path(str(i[0])).name == Path(filename).name:
+                        text += "\n" + " ".join(str(j) for j in i[1:])
+            imports = set()
+            for module, names in re.findall(r"(?:\bfrom\s+\.*([\w.]*)\s+)?\bimport\s+([\w.]+(?:\s*,\s*[\w.]+)*)", text):
+                imports.update(i.split(".")[-1] for i in [module, *re.split(r"\s*,\s*", names)] if i)
+            # whole path segments only, `a.py` is not mentioned by `data.py`
+            mentioned = {Path(i.rstrip(".")).name for i in re.findall(r"[\w./-]+", text)}
+            graph[filename] = [
+                i for i in graph if i != filename and (Path(i).stem in imports or Path(i).name in mentioned)
+            ]
+        return graph
+
     async def _act(self) -> Message | None:
         """Determines the mode of action based on whether code review is used."""
         if self.rc.todo is None:
@@ -353,11 +435,20 @@ class Engineer(Role):
 
     async def _new_summarize_actions(self):
         src_files = self.project_repo.srcs.all_files
+        # Look up the source files depending on each design and task doc in the reverse index, instead of the
+        # dependencies of each source file.
+        src_root = Path(self.project_repo.srcs.root_path)
+        src_dependencies = defaultdict(list)
+        for doc_repo in [self.project_repo.docs.system_design, self.project_repo.docs.task]:
+            for doc_filename in doc_repo.all_files:
+                doc_pathname = (Path(doc_repo.root_path) / doc_filename).as_posix()
+                for i in await doc_repo.get_dependents(filename=doc_filename):
+                    if Path(i).is_relative_to(src_root):
+                        src_dependencies[str(Path(i).relative_to(src_root))].append(doc_pathname)
         # Generate a SummarizeCode action for each pair of (system_design_doc, task_doc).
         summarizations = defaultdict(list)
         for filename in src_files:
-            dependencies = await self.project_repo.srcs.get_dependency(filename=filename)
-            ctx = CodeSummarizeContext.loads(filenames=list(dependencies))
+            ctx = CodeSummarizeContext.loads(filenames=src_dependencies[filename])
             summarizations[ctx].append(filename)
         for ctx, filenames in summarizations.items():
             ctx.codes_filenames = filenames
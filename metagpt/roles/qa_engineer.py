@@ -21,7 +21,13 @@ from metagpt.actions.summarize_code import SummarizeCode
 from metagpt.const import MESSAGE_ROUTE_TO_NONE
 from metagpt.logs import logger
 from metagpt.roles import Role
-from metagpt.schema import Document, Message, RunCodeContext, TestingContext
+from metagpt.schema import (
+    Document,
+    Message,
+    RunCodeContext,
+    RunCodeResult,
+    TestingContext,
+)
 from metagpt.utils.common import any_to_str_set, parse_recipient
 
 
@@ -92,19 +98,31 @@ class QaEngineer(Role):
 
         logger.info(f"Done {str(self.project_repo.tests.workdir)} generating.")
 
-    async def _run_code(self, msg):
-        run_code_context = RunCodeContext.loads(msg.content)
-        src_doc = await self.project_repo.with_src_path(self.context.src_workspace).srcs.get(
-            run_code_context.code_filename
-        )
-        if not src_doc:
-            return
-        test_doc = await self.project_repo.tests.get(run_code_context.test_filename)
-        if not test_doc:
-            return
-        run_code_context.code = src_doc.content
-        run_code_context.test_code = test_doc.content
-        result = await RunCode(i_context=run_code_context, context=self.context, llm=self.llm).run()
+    async def _run_code(self, msgs: list[Message]):
+        """Run the tests of `msgs` in parallel, and handle each result as soon as its test finishes"""
+        run_code_contexts = {}
+        for msg in msgs:
+            run_code_context = RunCodeContext.loads(msg.content)
+            src_doc = await self.project_repo.with_src_path(self.context.src_workspace).srcs.get(
+                run_code_context.code_filename
+            )
+            if not src_doc:
+                continue
+            test_doc = await self.project_repo.tests.get(run_code_context.test_filename)
+            if not test_doc:
+                continue
+            run_code_context.code = src_doc.content
+            run_code_context.test_code = test_doc.content
+            run_code_contexts[id(run_code_context)] = (run_code_context, src_doc, test_doc)
+
+        contexts = [i for i, _, _ in run_code_contexts.values()]
+        async for run_code_context, result in RunCode.run_many(contexts, context=self.context, llm=self.llm):
+            _, src_doc, test_doc = run_code_contexts[id(run_code_context)]
+            await self._save_run_code_result(run_code_context, result, src_doc, test_doc)
+
+    async def _save_run_code_result(
+        self, run_code_context: RunCodeContext, result: RunCodeResult, src_doc: Document, test_doc: Document
+    ):
         run_code_context.output_filename = run_code_context.test_filename + ".json"
         await self.project_repo.test_outputs.save(
             filename=run_code_context.output_filename,
@@ -155,6 +173,7 @@ class QaEngineer(Role):
         code_filters = any_to_str_set({SummarizeCode})
         test_filters = any_to_str_set({WriteTest, DebugError})
         run_filters = any_to_str_set({RunCode})
+        run_msgs = []
         for msg in self.rc.news:
             # Decide what to do based on observed msg type, currently defined by human,
             # might potentially be moved to _think, that is, let the agent decides for itself
@@ -162,11 +181,13 @@ class QaEngineer(Role):
                 # engineer wrote a code, time to write a test for it
                 await self._write_test(msg)
             elif msg.cause_by in test_filters:
-                # I wrote or debugged my test code, time to run it
-                await self._run_code(msg)
+                # I wrote or debugged my test code, time to run it, together with the other tests
+                run_msgs.append(msg)
             elif msg.cause_by in run_filters:
                 # I ran my test code, time to fix bugs, if any
                 await self._debug_error(msg)
+        if run_msgs:
+            await self._run_code(run_msgs)
         self.test_round += 1
         return Message(
             content=f"Round {self.test_round} of tests done",
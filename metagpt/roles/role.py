@@ -22,6 +22,7 @@
 
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from enum import Enum
 from typing import TYPE_CHECKING, Iterable, Optional, Set, Type, Union
 
@@ -426,7 +427,7 @@ class Role(SerializationMixin, ContextMixin, BaseModel):
         if not news:
             news = self.rc.msg_buffer.pop_all()
         # Store the read messages in your own memory to prevent duplicate processing.
-        old_messages = [] if ignore_memory else self.rc.memory.get()
+        old_messages = [] if ignore_memory else [n for n in news if n in self.rc.memory]
         self.rc.memory.add_batch(news)
         # Filter out messages of interest.
         self.rc.news = [
@@ -547,7 +548,8 @@ class Role(SerializationMixin, ContextMixin, BaseModel):
             logger.debug(f"{self._setting}: no news. waiting.")
             return
 
-        rsp = await self.react()
+        async with self._repo_session():
+            rsp = await self.react()
 
         # Reset the next action to be taken.
         self.set_todo(None)
@@ -555,6 +557,18 @@ class Role(SerializationMixin, ContextMixin, BaseModel):
         self.publish_message(rsp)
         return rsp
 
+    @asynccontextmanager
+    async def _repo_session(self):
+        """Cache the repository state and coalesce the writes of the dependency file during a reaction. The cache is
+        disabled while the reactions of other roles on the same repository overlap this one."""
+        if not self.git_repo:
+            yield
+            return
+        dependency = await self.git_repo.get_dependency()
+        with self.git_repo.cache_session(owner=self):
+            async with dependency.write_behind():
+                yield
+
     @property
     def is_idle(self) -> bool:
         """If true, all actions have been executed."""
@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 
 import asyncio
+import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
 
 import agentops
 import typer
@@ -10,6 +12,9 @@ import typer
 from metagpt.const import CONFIG_ROOT
 from metagpt.utils.project_repo import ProjectRepo
 
+if TYPE_CHECKING:
+    from metagpt.schema import Message
+
 app = typer.Typer(add_completion=False, pretty_exceptions_show_locals=False)
 
 
@@ -30,6 +35,55 @@ def generate_repo(
     """Run the startup logic. Can be called from CLI or other Python scripts."""
     from metagpt.config2 import config
     from metagpt.context import Context
+
+    if config.agentops_api_key != "":
+        agentops.init(config.agentops_api_key, tags=["software_company"])
+
+    config.update_via_cli(project_path, project_name, inc, reqa_file, max_auto_summarize_code)
+    ctx = Context(config=config)
+    company = _build_team(ctx, idea, investment, code_review, run_tests, implement, recover_path)
+    asyncio.run(_run_team(company, n_round=n_round))
+
+    if config.agentops_api_key != "":
+        agentops.end_session("Success")
+
+    return ctx.repo
+
+
+async def agenerate_repo(
+    idea,
+    investment=3.0,
+    n_round=5,
+    code_review=True,
+    run_tests=False,
+    implement=True,
+    project_name="",
+    inc=False,
+    project_path="",
+    reqa_file="",
+    max_auto_summarize_code=0,
+    recover_path=None,
+    on_message: Optional[Callable[["Message"], None]] = None,
+) -> ProjectRepo:
+    """Run the startup logic in the running event loop, e.g. of a web server running several projects at once.
+
+    Each project has its own copy of the config. `on_message` is called with each message published in the team.
+    """
+    from metagpt.config2 import config
+    from metagpt.context import Context
+
+    project_config = config.model_copy(deep=True)
+    project_config.update_via_cli(project_path, project_name, inc, reqa_file, max_auto_summarize_code)
+    ctx = Context(config=project_config)
+    company = _build_team(ctx, idea, investment, code_review, run_tests, implement, recover_path)
+    if on_message:
+        company.env.add_listener(on_message)
+    await company.run(n_round=n_round)
+    return ctx.repo
+
+
+def _build_team(ctx, idea, investment, code_review, run_tests, implement, recover_path):
+    """Hire the roles of a software company, or recover the team from `recover_path`, and publish the idea"""
     from metagpt.roles import (
         Architect,
         Engineer,
@@ -39,12 +93,6 @@ def generate_repo(
     )
     from metagpt.team import Team
 
-    if config.agentops_api_key != "":
-        agentops.init(config.agentops_api_key, tags=["software_company"])
-
-    config.update_via_cli(project_path, project_name, inc, reqa_file, max_auto_summarize_code)
-    ctx = Context(config=config)
-
     if not recover_path:
         company = Team(context=ctx)
         company.hire(
@@ -70,12 +118,20 @@ def generate_repo(
 
     company.invest(investment)
     company.run_project(idea)
-    asyncio.run(company.run(n_round=n_round))
+    return company
 
-    if config.agentops_api_key != "":
-        agentops.end_session("Success")
 
-    return ctx.repo
+async def _run_team(company, n_round: int):
+    """Run the team, then close the shared llm clients and browsers before the event loop they are bound to closes."""
+    from metagpt.provider.llm_provider_registry import LLM_REGISTRY
+
+    try:
+        await company.run(n_round=n_round)
+    finally:
+        await LLM_REGISTRY.aclose()
+        browser_pool = sys.modules.get("metagpt.tools.web_browser_pool")
+        if browser_pool is not None:  # imported only if a browser was used, without playwright installed otherwise
+            await browser_pool.close_browser_pool()
 
 
 @app.command("", help="Start a new project.")
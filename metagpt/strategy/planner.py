@@ -12,6 +12,7 @@ from metagpt.actions.di.write_plan import (
 )
 from metagpt.logs import logger
 from metagpt.memory import Memory
+from metagpt.provider.rate_limiter import LLMPriority, llm_priority
 from metagpt.schema import Message, Plan, Task, TaskResult
 from metagpt.strategy.task_type import TaskType
 from metagpt.utils.common import remove_comments
@@ -72,7 +73,8 @@ class Planner(BaseModel):
         plan_confirmed = False
         while not plan_confirmed:
             context = self.get_useful_memories()
-            rsp = await WritePlan().run(context, max_tasks=max_tasks)
+            with llm_priority(LLMPriority.HIGH):  # the whole plan waits for it
+                rsp = await WritePlan().run(context, max_tasks=max_tasks)
             self.working_memory.add(Message(content=rsp, role="assistant", cause_by=WritePlan))
 
             # precheck plan before asking reviews
@@ -8,11 +8,16 @@ import sys
 from pathlib import Path
 from typing import Literal, Optional
 
-from playwright.async_api import async_playwright
-from pydantic import BaseModel, Field, PrivateAttr
+import aiohttp
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from metagpt.logs import logger
-from metagpt.utils.parse_html import WebPage
+from metagpt.tools.web_browser_pool import (
+    DEFAULT_BLOCKED_RESOURCES,
+    BrowserPool,
+    get_browser_pool,
+)
+from metagpt.utils.parse_html import WebPage, get_html_content
 
 
 class PlaywrightWrapper(BaseModel):
@@ -22,12 +27,24 @@ class PlaywrightWrapper(BaseModel):
     the required browsers are also installed. You can install playwright by running the command
     `pip install metagpt[playwright]` and download the necessary browser binaries by running the
     command `playwright install` for the first time.
+
+    Pages are loaded by the long-lived browsers of `pool`, or of the pool shared in the event loop, with the resource
+    types of `blocked_resources` not loaded since only the text and the html of the pages are scraped. With
+    `fast_path`, a page is first fetched by plain HTTP, and loaded by the browser only if its text is shorter than
+    `fast_path_min_text` characters, e.g. rendered by javascript.
     """
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     browser_type: Literal["chromium", "firefox", "webkit"] = "chromium"
     launch_kwargs: dict = Field(default_factory=dict)
     proxy: Optional[str] = None
     context_kwargs: dict = Field(default_factory=dict)
+    pool: Optional[BrowserPool] = None
+    blocked_resources: list[str] = Field(default_factory=lambda: list(DEFAULT_BLOCKED_RESOURCES))
+    fast_path: bool = False
+    fast_path_min_text: int = 200
+    fast_path_timeout: float = 10
     _has_run_precheck: bool = PrivateAttr(False)
 
     def __init__(self, **kwargs):
@@ -43,30 +60,54 @@ class PlaywrightWrapper(BaseModel):
             self.context_kwargs["ignore_https_errors"] = kwargs["ignore_https_errors"]
 
     async def run(self, url: str, *urls: str) -> WebPage | list[WebPage]:
-        async with async_playwright() as ap:
-            browser_type = getattr(ap, self.browser_type)
-            await self._run_precheck(browser_type)
-            browser = await browser_type.launch(**self.launch_kwargs)
-            _scrape = self._scrape
-
-            if urls:
-                return await asyncio.gather(_scrape(browser, url), *(_scrape(browser, i) for i in urls))
-            return await _scrape(browser, url)
-
-    async def _scrape(self, browser, url):
-        context = await browser.new_context(**self.context_kwargs)
-        page = await context.new_page()
-        async with page:
+        pool = self.pool or get_browser_pool()
+        if urls:
+            return await asyncio.gather(self._scrape(pool, url), *(self._scrape(pool, i) for i in urls))
+        return await self._scrape(pool, url)
+
+    async def _scrape(self, pool: BrowserPool, url: str) -> WebPage:
+        async with pool.slot(url):
+            if self.fast_path:
+                page = await self._fetch(pool, url)
+                if page is not None:
+                    return page
             try:
-                await page.goto(url)
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                html = await page.content()
-                inner_text = await page.evaluate("() => document.body.innerText")
+                async with pool.page(
+                    self.browser_type,
+                    self.launch_kwargs,
+                    self.context_kwargs,
+                    self.blocked_resources,
+                    precheck=self._run_precheck,
+                ) as page:
+                    await page.goto(url)
+                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    html = await page.content()
+                    inner_text = await page.evaluate("() => document.body.innerText")
             except Exception as e:
                 inner_text = f"Fail to load page content for {e}"
                 html = ""
             return WebPage(inner_text=inner_text, html=html, url=url)
 
+    async def _fetch(self, pool: BrowserPool, url: str) -> Optional[WebPage]:
+        """Fetch the page by plain HTTP, None if it fails or the page seems to need javascript"""
+        try:
+            async with pool.get_session().get(
+                url,
+                proxy=self.proxy,
+                ssl=False if self.context_kwargs.get("ignore_https_errors") else None,
+                timeout=aiohttp.ClientTimeout(total=self.fast_path_timeout),
+            ) as response:
+                if response.status != 200 or response.content_type not in ("text/html", "text/plain"):
+                    return None
+                html = await response.text()
+        except Exception as e:
+            logger.debug(f"Fail to fetch {url} without the browser: {e}")
+            return None
+        inner_text = get_html_content(html, url, separator="\n")
+        if len(inner_text) < self.fast_path_min_text:
+            return None
+        return WebPage(inner_text=inner_text, html=html, url=url)
+
     async def _run_precheck(self, browser_type):
         if self._has_run_precheck:
             return
@@ -4,7 +4,9 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import importlib
+import threading
 from concurrent import futures
 from copy import deepcopy
 from typing import Callable, Literal, Optional
@@ -16,6 +18,7 @@ from selenium.webdriver.support.wait import WebDriverWait
 from webdriver_manager.core.download_manager import WDMDownloadManager
 from webdriver_manager.core.http import WDMHttpClient
 
+from metagpt.utils.common import close_on_loop_shutdown
 from metagpt.utils.parse_html import WebPage
 
 
@@ -29,6 +32,9 @@ class SeleniumWrapper(BaseModel):
        for that browser before running. For example, if you have Mozilla Firefox installed on your
        computer, you can set the configuration SELENIUM_BROWSER_TYPE to firefox. After that, you
        can scrape web pages using the Selenium WebBrowserEngine.
+
+    WebDrivers are kept between the pages and the runs, with up to `max_idle_drivers` idle ones, and are quit by
+    `close`, or when the event loop of the runs shuts down.
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -38,8 +44,11 @@ class SeleniumWrapper(BaseModel):
     proxy: Optional[str] = None
     loop: Optional[asyncio.AbstractEventLoop] = None
     executor: Optional[futures.Executor] = None
+    max_idle_drivers: int = 4
     _has_run_precheck: bool = PrivateAttr(False)
     _get_driver: Optional[Callable] = PrivateAttr(None)
+    _idle_drivers: list = PrivateAttr(default_factory=list)
+    _drivers_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
 
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
@@ -74,18 +83,53 @@ class SeleniumWrapper(BaseModel):
             ),
         )
         self._has_run_precheck = True
+        close_on_loop_shutdown(self.close)
+
+    async def close(self):
+        """Quit the idle WebDrivers"""
+        with self._drivers_lock:
+            drivers, self._idle_drivers = self._idle_drivers, []
+        loop = self.loop or asyncio.get_event_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _quit_driver, i) for i in drivers))
 
     def _scrape_website(self, url):
-        with self._get_driver() as driver:
-            try:
-                driver.get(url)
-                WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                inner_text = driver.execute_script("return document.body.innerText;")
-                html = driver.page_source
-            except Exception as e:
-                inner_text = f"Fail to load page content for {e}"
-                html = ""
-            return WebPage(inner_text=inner_text, html=html, url=url)
+        driver = self._acquire_driver()
+        try:
+            driver.get(url)
+            WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            inner_text = driver.execute_script("return document.body.innerText;")
+            html = driver.page_source
+        except Exception as e:
+            inner_text = f"Fail to load page content for {e}"
+            html = ""
+            _quit_driver(driver)  # the driver may be broken
+        else:
+            self._release_driver(driver)
+        return WebPage(inner_text=inner_text, html=html, url=url)
+
+    def _acquire_driver(self):
+        with self._drivers_lock:
+            if self._idle_drivers:
+                return self._idle_drivers.pop()
+        return self._get_driver()
+
+    def _release_driver(self, driver):
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+        except Exception:
+            _quit_driver(driver)
+            return
+        with self._drivers_lock:
+            if len(self._idle_drivers) < self.max_idle_drivers:
+                self._idle_drivers.append(driver)
+                return
+        _quit_driver(driver)
+
+
+def _quit_driver(driver):
+    with contextlib.suppress(Exception):
+        driver.quit()
 
 
 _webdriver_manager_types = {
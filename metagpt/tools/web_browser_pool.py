@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Time    : 2026/10/18
+@File    : web_browser_pool.py
+@Desc    : Long-lived playwright browsers shared by the PlaywrightWrapper runs of an event loop. Browsers are launched
+    once, browser contexts are kept warm between pages, and the pages in flight are capped in total and per domain, so
+    scraping many URLs does not pay for a browser launch per call nor flood a single site.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    BrowserType,
+    Page,
+    Playwright,
+    Route,
+    async_playwright,
+)
+
+from metagpt.logs import logger
+from metagpt.utils.common import close_on_loop_shutdown
+
+DEFAULT_BLOCKED_RESOURCES = ("image", "font", "media")
+
+
+class BrowserPool:
+    """A pool of playwright browsers, one per browser type and launch arguments, with up to `warm_contexts` idle
+    browser contexts kept per context arguments. At most `max_pages` pages are loaded at the same time, and at most
+    `max_pages_per_domain` of them from the same domain.
+
+    Example:
+        >>> async with BrowserPool(max_pages=16) as pool:
+        ...     await PlaywrightWrapper(pool=pool).run(url, *urls)
+    """
+
+    def __init__(self, max_pages: int = 8, max_pages_per_domain: int = 4, warm_contexts: int = 2):
+        self.max_pages = max_pages
+        self.max_pages_per_domain = max_pages_per_domain
+        self.warm_contexts = warm_contexts
+        self._pages = asyncio.Semaphore(max_pages)
+        self._domains: dict[str, asyncio.Semaphore] = {}
+        self._domain_users: dict[str, int] = defaultdict(int)
+        self._playwright: Optional[Playwright] = None
+        self._browsers: dict[str, Browser] = {}
+        self._contexts: dict[str, deque[BrowserContext]] = defaultdict(deque)
+        self._lock = asyncio.Lock()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._closed = False
+
+    async def __aenter__(self) -> "BrowserPool":
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    @property
+    def browser_count(self) -> int:
+        return len(self._browsers)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Wait for a page slot of the domain of the url, then for a slot of the pool"""
+        domain = urlparse(url).netloc
+        semaphore = self._domains.get(domain)
+        if semaphore is None:
+            semaphore = self._domains[domain] = asyncio.Semaphore(self.max_pages_per_domain)
+        self._domain_users[domain] += 1
+        try:
+            async with semaphore, self._pages:
+                yield
+        finally:
+            self._domain_users[domain] -= 1
+            if not self._domain_users[domain]:
+                del self._domain_users[domain], self._domains[domain]
+
+    @asynccontextmanager
+    async def page(
+        self,
+        browser_type: str,
+        launch_kwargs: dict,
+        context_kwargs: dict,
+        blocked_resources: Iterable[str] = (),
+        precheck: Optional[Callable[[BrowserType], Awaitable[None]]] = None,
+    ) -> AsyncIterator[Page]:
+        """Open a page in a warm context of the shared browser, and return the context to the pool when done"""
+        browser, browser_key = await self._get_browser(browser_type, launch_kwargs, precheck)
+        blocked_resources = frozenset(blocked_resources)
+        context_key = _key(browser_key, context_kwargs, sorted(blocked_resources))
+        context = await self._acquire_context(browser, context_key, context_kwargs, blocked_resources)
+        keep = False
+        try:
+            page = await context.new_page()
+            try:
+                yield page
+            finally:
+                await page.close()
+            keep = True
+        finally:
+            await self._release_context(context_key, context, keep)
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """The HTTP session shared by the fetches of the pages that do not need a browser"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def close(self):
+        self._closed = True
+        for contexts in self._contexts.values():
+            while contexts:
+                await _close_quietly(contexts.popleft())
+        for browser in self._browsers.values():
+            await _close_quietly(browser)
+        self._browsers.clear()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get_browser(
+        self,
+        browser_type: str,
+        launch_kwargs: dict,
+        precheck: Optional[Callable[[BrowserType], Awaitable[None]]],
+    ) -> tuple[Browser, str]:
+        async with self._lock:
+            if self._closed:
+                raise RuntimeError("The browser pool is closed")
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            launcher = getattr(self._playwright, browser_type)
+            if precheck:
+                await precheck(launcher)  # may set the executable path of the launch arguments
+            key = _key(browser_type, launch_kwargs)
+            browser = self._browsers.get(key)
+            if browser is not None and browser.is_connected():
+                return browser, key
+            if browser is not None:
+                logger.info(f"Relaunch the disconnected {browser_type} browser")
+            browser = self._browsers[key] = await launcher.launch(**launch_kwargs)
+            return browser, key
+
+    async def _acquire_context(
+        self, browser: Browser, key: str, context_kwargs: dict, blocked_resources: frozenset[str]
+    ) -> BrowserContext:
+        contexts = self._contexts[key]
+        while contexts:
+            context = contexts.popleft()
+            if context.browser is browser:
+                return context
+            # the context of a browser that was disconnected and relaunched
+            await _close_quietly(context)
+        context = await browser.new_context(**context_kwargs)
+        if blocked_resources:
+
+            async def _block(route: Route):
+                if route.request.resource_type in blocked_resources:
+                    await route.abort()
+                else:
+                    await route.continue_()
+
+            await context.route("**/*", _block)
+        return context
+
+    async def _release_context(self, key: str, context: BrowserContext, keep: bool):
+        contexts = self._contexts[key]
+        if keep and not self._closed and len(contexts) < self.warm_contexts:
+            try:
+                await context.clear_cookies()
+                contexts.append(context)
+                return
+            except Exception as e:
+                logger.debug(f"Discard the browser context: {e}")
+        await _close_quietly(context)
+
+
+def _key(*parts) -> str:
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+async def _close_quietly(closable: Browser | BrowserContext):
+    try:
+        await closable.close()
+    except Exception as e:
+        logger.debug(f"Failed to close {closable}: {e}")
+
+
+_BROWSER_POOLS: dict[asyncio.AbstractEventLoop, BrowserPool] = {}
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the pool shared by the PlaywrightWrapper runs in the current event loop, unless replaced by
+    `set_browser_pool`. The pool is closed by `close_browser_pool`, or when the loop shuts down."""
+    loop = asyncio.get_running_loop()
+    # playwright connections are bound to the loop they run in
+    pool = _BROWSER_POOLS.get(loop)
+    if pool is None or pool.closed:
+        pool = _BROWSER_POOLS[loop] = BrowserPool()
+        close_on_loop_shutdown(lambda: _close_browser_pool(loop, pool))
+    return pool
+
+
+def set_browser_pool(pool: BrowserPool):
+    """Share a pool, e.g. with other limits, by the PlaywrightWrapper runs in the current event loop"""
+    _BROWSER_POOLS[asyncio.get_running_loop()] = pool
+
+
+async def close_browser_pool():
+    """Close the pool shared in the current event loop, if any, e.g. before the loop is closed"""
+    loop = asyncio.get_running_loop()
+    if loop in _BROWSER_POOLS:
+        await _close_browser_pool(loop, _BROWSER_POOLS[loop])
+
+
+async def _close_browser_pool(loop: asyncio.AbstractEventLoop, pool: BrowserPool):
+    if _BROWSER_POOLS.get(loop) is pool:
+        del _BROWSER_POOLS[loop]
+    await pool.close()
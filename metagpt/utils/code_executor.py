@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Time    : 2026/10/18
+@File    : code_executor.py
+@Desc    : Non-blocking executor of the commands of RunCode. Commands run in asyncio subprocesses under a bounded
+    worker pool, with per-run timeouts and output size caps. The dependencies of a project are installed once into a
+    virtualenv cached by the hash of its requirements.txt, instead of before every run.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import signal
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional
+
+from metagpt.const import CONFIG_ROOT
+from metagpt.logs import logger
+
+DEFAULT_VENV_ROOT = CONFIG_ROOT / "venvs"
+
+
+@dataclass
+class ExecResult:
+    stdout: str = ""
+    stderr: str = ""
+    returncode: Optional[int] = None
+    timed_out: bool = False
+
+
+@dataclass
+class ExecJob:
+    command: list[str]
+    cwd: str
+    env: Optional[dict] = None
+    timeout: Optional[float] = None
+
+
+class CodeExecutor:
+    """Run commands in asyncio subprocesses, at most `max_workers` at the same time.
+
+    Example:
+        >>> executor = CodeExecutor(max_workers=4, timeout=10)
+        >>> env = await executor.prepare_env(working_directory, os.environ.copy())
+        >>> result = await executor.run(["python", "tests/test_main.py"], cwd=working_directory, env=env)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        timeout: float = 10,
+        max_output_size: int = 1024 * 1024,
+        venv_root: Path | str = DEFAULT_VENV_ROOT,
+        extra_requirements: Iterable[str] = ("pytest",),
+    ):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_output_size = max_output_size
+        self.venv_root = Path(venv_root)
+        self.extra_requirements = list(extra_requirements)
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._venvs: dict[str, Path] = {}
+        self._venv_locks: dict[str, asyncio.Lock] = {}
+
+    async def run(
+        self, command: list[str], cwd: str, env: Optional[dict] = None, timeout: Optional[float] = None
+    ) -> ExecResult:
+        """Run `command` and return its outputs. A command exceeding `timeout` seconds is killed together with its
+        child processes, and the outputs read so far are returned. `timeout=0` means no time limit."""
+        timeout = self.timeout if timeout is None else timeout
+        async with self._semaphore:
+            logger.info(" ".join(command))
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                cwd=cwd,
+                env=env,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=os.name == "posix",
+            )
+            stdout, stderr = bytearray(), bytearray()
+            readers = asyncio.gather(
+                self._read_stream(process.stdout, stdout), self._read_stream(process.stderr, stderr)
+            )
+            timed_out = False
+            try:
+                await asyncio.wait_for(asyncio.shield(readers), timeout=timeout or None)
+                await process.wait()
+            except asyncio.TimeoutError:
+                logger.info(f"The command did not complete within {timeout} seconds: {' '.join(command)}")
+                timed_out = True
+                self._kill(process)
+                await process.wait()
+                await readers
+            except BaseException:
+                self._kill(process)
+                readers.cancel()
+                raise
+            return ExecResult(
+                stdout=self._decode(stdout),
+                stderr=self._decode(stderr),
+                returncode=process.returncode,
+                timed_out=timed_out,
+            )
+
+    async def run_many(self, jobs: Iterable[ExecJob]) -> AsyncIterator[tuple[ExecJob, ExecResult]]:
+        """Run the jobs in parallel under the worker pool, and yield each job with its result as soon as it finishes.
+        The jobs still running are cancelled, and their processes killed, if one raises or the iteration stops."""
+
+        async def _run(job: ExecJob):
+            return job, await self.run(job.command, cwd=job.cwd, env=job.env, timeout=job.timeout)
+
+        tasks = [asyncio.ensure_future(_run(job)) for job in jobs]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def prepare_env(self, working_directory: str, env: dict) -> dict:
+        """Return a copy of `env` activating the virtualenv of the project in `working_directory`"""
+        venv = await self.get_venv(working_directory, env)
+        env = dict(env)
+        env["VIRTUAL_ENV"] = str(venv)
+        env["PATH"] = str(self._bin_dir(venv)) + os.pathsep + env.get("PATH", os.defpath)
+        env.pop("PYTHONHOME", None)
+        return env
+
+    async def get_venv(self, working_directory: str, env: dict) -> Path:
+        """Return the virtualenv with the requirements of the project installed. Virtualenvs are shared by the projects
+        with the same requirements.txt, and are created and installed once."""
+        requirements = Path(working_directory) / "requirements.txt"
+        content = requirements.read_bytes() if requirements.is_file() else b""
+        key = hashlib.sha256(content + "\n".join(self.extra_requirements).encode()).hexdigest()[:16]
+        if key in self._venvs:
+            return self._venvs[key]
+
+        async with self._venv_locks.setdefault(key, asyncio.Lock()):
+            if key in self._venvs:
+                return self._venvs[key]
+            venv = self.venv_root / key
+            if not (venv / ".installed").exists():
+                await self._install_venv(venv, requirements if content.strip() else None, env)
+            if (venv / ".installed").exists():  # a failed install is retried by the next call
+                self._venvs[key] = venv
+            return venv
+
+    async def _install_venv(self, venv: Path, requirements: Optional[Path], env: dict):
+        # Site packages of the current python are visible in the virtualenv, so installed requirements are not
+        # downloaded again, and pip of the current python installs into the virtualenv.
+        venv.parent.mkdir(parents=True, exist_ok=True)
+        result = await self._check_call(
+            [sys.executable, "-m", "venv", "--system-site-packages", "--without-pip", str(venv)], str(venv.parent), env
+        )
+        if not result:
+            return
+        python = str(self._bin_dir(venv) / "python")
+        install_command = [python, "-m", "pip", "install"]
+        if requirements:
+            install_command += ["-r", str(requirements)]
+        install_command += self.extra_requirements
+        cwd = str(requirements.parent if requirements else venv)
+        if len(install_command) > 4 and not await self._check_call(install_command, cwd, env):
+            return  # retried by the next process, the same as installing before every run
+        (venv / ".installed").touch()
+
+    async def _check_call(self, command: list[str], cwd: str, env: dict) -> bool:
+        env = {k: v for k, v in env.items() if k not in {"VIRTUAL_ENV", "PYTHONHOME"}}
+        result = await self.run(command, cwd=cwd, env=env, timeout=0)
+        if result.returncode != 0:
+            logger.warning(f"{' '.join(command)} failed: {result.stderr[-2000:]}")
+            return False
+        return True
+
+    async def _read_stream(self, stream: asyncio.StreamReader, buffer: bytearray):
+        """Read the stream to the end to keep the process from blocking on a full pipe, keeping `max_output_size`
+        bytes at most"""
+        dropped = 0
+        while chunk := await stream.read(64 * 1024):
+            room = self.max_output_size - len(buffer)
+            if room > 0:
+                buffer.extend(chunk[:room])
+            dropped += max(0, len(chunk) - max(room, 0))
+        if dropped:
+            buffer.extend(f"\n... {dropped} bytes truncated".encode())
+
+    @staticmethod
+    def _kill(process: asyncio.subprocess.Process):
+        if process.returncode is not None:
+            return
+        try:
+            if os.name == "posix":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
+    @staticmethod
+    def _bin_dir(venv: Path) -> Path:
+        return venv / ("Scripts" if os.name == "nt" else "bin")
+
+    @staticmethod
+    def _decode(data: bytearray) -> str:
+        return data.decode("utf-8", errors="replace")
+
+
+_CODE_EXECUTOR: tuple[Optional[asyncio.AbstractEventLoop], Optional[CodeExecutor]] = (None, None)
+
+
+def get_code_executor() -> CodeExecutor:
+    """Return the executor shared by all RunCode actions running in the current event loop"""
+    global _CODE_EXECUTOR
+    loop = asyncio.get_running_loop()
+    if _CODE_EXECUTOR[0] is not loop:  # executors are bound to the loop of their semaphores and locks
+        _CODE_EXECUTOR = (loop, CodeExecutor())
+    return _CODE_EXECUTOR[1]
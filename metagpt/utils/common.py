@@ -12,6 +12,7 @@
 from __future__ import annotations
 
 import ast
+import asyncio
 import base64
 import contextlib
 import csv
@@ -26,7 +27,7 @@ import sys
 import traceback
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Callable, List, Literal, Tuple, Union
+from typing import Any, Awaitable, Callable, List, Literal, Tuple, Union
 from urllib.parse import quote, unquote
 
 import aiofiles
@@ -776,6 +777,28 @@ def is_coroutine_func(func: Callable) -> bool:
     return inspect.iscoroutinefunction(func)
 
 
+_LOOP_SHUTDOWN_HOOKS: set = set()
+
+
+def close_on_loop_shutdown(aclose: Callable[[], Awaitable[Any]]):
+    """Await `aclose()` when the running event loop shuts down its async generators, e.g. at the end of `asyncio.run`,
+    so that the resources bound to the loop, such as browsers, are released before the loop is closed."""
+
+    async def _hook():
+        try:
+            yield
+        finally:
+            _LOOP_SHUTDOWN_HOOKS.discard(hook)
+            try:
+                await aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close on the shutdown of the event loop: {e}")
+
+    hook = _hook()
+    _LOOP_SHUTDOWN_HOOKS.add(hook)  # not finalized before the loop shuts down
+    asyncio.ensure_future(hook.__anext__())  # started, so that the loop closes it on shutdown
+
+
 def load_mc_skills_code(skill_names: list[str] = None, skills_dir: Path = None) -> list[str]:
     """load minecraft skill from js files"""
     if not skills_dir:
@@ -8,12 +8,17 @@
 """
 from __future__ import annotations
 
+import asyncio
 import json
+import os
 import re
+import tempfile
+import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Set
+from typing import Dict, Optional, Set, Tuple
 
-from metagpt.utils.common import aread, awrite
+from metagpt.utils.common import aread
 from metagpt.utils.exceptions import handle_exception
 
 
@@ -21,37 +26,136 @@ class DependencyFile:
     """A class representing a DependencyFile for managing dependencies.
 
     :param workdir: The working directory path for the DependencyFile.
+    :param flush_interval: Seconds after which the updates in the write-behind mode are flushed, 0 to flush only at
+        exit of the write-behind mode.
     """
 
-    def __init__(self, workdir: Path | str):
+    def __init__(self, workdir: Path | str, flush_interval: float = 0):
         """Initialize a DependencyFile instance.
 
         :param workdir: The working directory path for the DependencyFile.
+        :param flush_interval: Seconds after which the updates in the write-behind mode are flushed.
         """
-        self._dependencies = {}
+        self._dependencies: Dict[str, list] = {}
+        self._dependents: Dict[str, Set[str]] = {}  # reverse index, dependency -> files depending on it
         self._filename = Path(workdir) / ".dependencies.json"
+        self.flush_interval = flush_interval
+        self._write_behind_depth = 0
+        self._dirty = False
+        self._signature = None  # (mtime, size) of the file last loaded or saved
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = threading.Lock()  # the file is written in threads by `aflush`
+        self._version = 0  # version of the data last taken to flush
+        self._written_version = 0
 
     async def load(self):
         """Load dependencies from the file asynchronously."""
         if not self._filename.exists():
             return
+        if not self._dirty and self._signature == self._file_signature():
+            return  # unchanged since last loaded or saved
+        if not self._dirty and self._written_version < self._version:
+            return  # being saved in threads, the dependencies in memory are newer than the file
         json_data = await aread(self._filename)
         json_data = re.sub(r"\\+", "/", json_data)  # Compatible with windows path
-        self._dependencies = json.loads(json_data)
+        self._set_dependencies(json.loads(json_data))
+        self._dirty = False
+        self._signature = self._file_signature()
 
     @handle_exception
     async def save(self):
         """Save dependencies to the file asynchronously."""
-        data = json.dumps(self._dependencies)
-        await awrite(filename=self._filename, data=data)
+        await self.aflush(force=True)
+
+    def flush(self, force: bool = False):
+        """Write the dependencies to the file if updated, atomically by writing a temporary file and renaming it.
+
+        :param force: Whether to write even if not updated.
+        """
+        data = self._take_flush_data(force)
+        if data is not None:
+            self._write(*data)
+
+    async def aflush(self, force: bool = False):
+        """Asynchronous version of `flush`, writing the file in a thread so as not to block the event loop.
+
+        :param force: Whether to write even if not updated.
+        """
+        data = self._take_flush_data(force)
+        if data is not None:
+            await asyncio.to_thread(self._write, *data)
+
+    def _take_flush_data(self, force: bool) -> Optional[Tuple[str, int]]:
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._dirty and not force:
+            return None
+        self._dirty = False
+        self._version += 1
+        return json.dumps(self._dependencies), self._version
+
+    def _write(self, data: str, version: int):
+        with self._write_lock:
+            if version < self._written_version:
+                return  # outdated by a later flush written first
+            self._write_file(data)
+            self._written_version = version
+            self._signature = self._file_signature()
+
+    def _write_file(self, data: str):
+        self._filename.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_filename = tempfile.mkstemp(prefix=".dependencies.", suffix=".tmp", dir=self._filename.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as writer:
+                writer.write(data)
+                writer.flush()
+                os.fsync(writer.fileno())
+            os.replace(tmp_filename, self._filename)
+        except BaseException:
+            Path(tmp_filename).unlink(missing_ok=True)
+            self._dirty = True
+            raise
+        if hasattr(os, "O_DIRECTORY"):  # persist the rename, not supported on windows
+            dir_fd = os.open(self._filename.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    @asynccontextmanager
+    async def write_behind(self):
+        """Keep the updates in memory and flush them once at exit, instead of loading and saving the file on each
+        `update` and `get`. Nested or concurrent contexts flush at exit of the last one.
+
+        Example:
+            >>> async with dependency_file.write_behind():
+            ...     for filename, dependencies in files.items():
+            ...         await dependency_file.update(filename, dependencies)
+        """
+        if not self._write_behind_depth:
+            await self.load()
+        self._write_behind_depth += 1
+        try:
+            yield self
+        finally:
+            self._write_behind_depth -= 1
+            if not self._write_behind_depth:
+                await self.aflush()
+
+    @property
+    def write_behind_mode(self) -> bool:
+        return self._write_behind_depth > 0
 
     async def update(self, filename: Path | str, dependencies: Set[Path | str], persist=True):
         """Update dependencies for a file asynchronously.
 
         :param filename: The filename or path.
         :param dependencies: The set of dependencies.
-        :param persist: Whether to persist the changes immediately.
+        :param persist: Whether to persist the changes immediately, deferred in the write-behind mode.
         """
+        persist = persist and not self.write_behind_mode
         if persist:
             await self.load()
 
@@ -70,9 +174,13 @@ class DependencyFile:
                     s = str(i)
                 relative_paths.append(s)
 
+            self._unindex(key)
             self._dependencies[key] = relative_paths
+            self._index(key)
         elif key in self._dependencies:
+            self._unindex(key)
             del self._dependencies[key]
+        self._mark_dirty()
 
         if persist:
             await self.save()
@@ -81,18 +189,71 @@ class DependencyFile:
         """Get dependencies for a file asynchronously.
 
         :param filename: The filename or path.
-        :param persist: Whether to load dependencies from the file immediately.
+        :param persist: Whether to load dependencies from the file immediately, skipped in the write-behind mode.
         :return: A set of dependencies.
         """
-        if persist:
+        if persist and not self.write_behind_mode:
+            await self.load()
+        return set(self._dependencies.get(self._key(filename), {}))
+
+    async def get_dependents(self, filename: Path | str, persist=True) -> Set[str]:
+        """Get the files depending on a file asynchronously.
+
+        :param filename: The filename or path.
+        :param persist: Whether to load dependencies from the file immediately, skipped in the write-behind mode.
+        :return: A set of the files depending on it.
+        """
+        if persist and not self.write_behind_mode:
             await self.load()
+        return set(self._dependents.get(self._key(filename), set()))
 
+    def _key(self, filename: Path | str) -> str:
         root = self._filename.parent
         try:
             key = Path(filename).relative_to(root).as_posix()
         except ValueError:
             key = Path(filename).as_posix()
-        return set(self._dependencies.get(str(key), {}))
+        return str(key)
+
+    def _set_dependencies(self, dependencies: Dict[str, list]):
+        self._dependencies = dependencies
+        self._dependents = {}
+        for key in self._dependencies:
+            self._index(key)
+
+    def _index(self, key: str):
+        for i in self._dependencies.get(key, []):
+            self._dependents.setdefault(i, set()).add(key)
+
+    def _unindex(self, key: str):
+        for i in self._dependencies.get(key, []):
+            dependents = self._dependents.get(i)
+            if dependents is None:
+                continue
+            dependents.discard(key)
+            if not dependents:
+                del self._dependents[i]
+
+    def _mark_dirty(self):
+        self._dirty = True
+        if not self.write_behind_mode or not self.flush_interval or self._flush_handle:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._flush_handle = loop.call_later(self.flush_interval, self._flush_soon)
+
+    def _flush_soon(self):
+        self._flush_handle = None
+        self._flush_task = asyncio.ensure_future(self.aflush())
+
+    def _file_signature(self):
+        try:
+            stat = self._filename.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
 
     def delete_file(self):
         """Delete the dependency file."""
@@ -8,6 +8,50 @@
 from llama_index.embeddings.openai import OpenAIEmbedding
 
 from metagpt.config2 import config
+from metagpt.utils.embedding_service import EmbeddingService, get_embedding_service
+
+
+class BatchedOpenAIEmbedding(OpenAIEmbedding):
+    """OpenAIEmbedding whose text embeddings go through the EmbeddingService shared by all the instances of the same
+    endpoint, api key, model and dimensions, so that the concurrent requests are embedded in one call and the embedded
+    texts are cached"""
+
+    @property
+    def service(self) -> EmbeddingService:
+        return get_embedding_service(
+            self.model_name,
+            self._aembed_texts,
+            endpoint=self.api_base,
+            api_key=self.api_key or "",
+            dimensions=self.dimensions,
+        )
+
+    async def _aembed_texts(self, texts: list[str]) -> list[list[float]]:
+        return await super()._aget_text_embeddings(texts)
+
+    async def _aget_text_embedding(self, text: str) -> list[float]:
+        return await self.service.aembed(text)
+
+    async def _aget_text_embeddings(self, texts: list[str]) -> list[list[float]]:
+        return await self.service.aembed_batch(texts)
+
+    def _get_text_embedding(self, text: str) -> list[float]:
+        (embedding,) = self.service.get_cached([text])
+        if embedding is None:
+            embedding = super()._get_text_embedding(text)
+            self.service.set_cached([text], [embedding])
+        return embedding
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[list[float]]:
+        embeddings = self.service.get_cached(texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            missing_embeddings = super()._get_text_embeddings(missing_texts)
+            self.service.set_cached(missing_texts, missing_embeddings)
+            for i, embedding in zip(missing, missing_embeddings):
+                embeddings[i] = embedding
+        return embeddings
 
 
 def get_embedding() -> OpenAIEmbedding:
@@ -15,5 +59,5 @@ def get_embedding() -> OpenAIEmbedding:
     if llm is None:
         raise ValueError("To use OpenAIEmbedding, please ensure that config.llm.api_type is correctly set to 'openai'.")
 
-    embedding = OpenAIEmbedding(api_key=llm.api_key, api_base=llm.base_url)
+    embedding = BatchedOpenAIEmbedding(api_key=llm.api_key, api_base=llm.base_url)
     return embedding
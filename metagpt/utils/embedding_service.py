@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Time    : 2026/10/18
+@File    : embedding_service.py
+@Desc    : Embedding requests of an event loop are coalesced into batched embeddings calls, retried with a non-blocking
+    backoff, and their embeddings are cached by the hash of the model and the text, in memory or on disk, packed as
+    float64 bytes.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+from array import array
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Sequence
+
+from tenacity import after_log, retry, stop_after_attempt, wait_random_exponential
+
+from metagpt.config2 import config
+from metagpt.configs.embedding_config import EmbeddingConfig
+from metagpt.const import CONFIG_ROOT
+from metagpt.logs import logger
+from metagpt.provider.response_cache import (
+    MemoryResponseCacheBackend,
+    ResponseCacheBackend,
+    SQLiteResponseCacheBackend,
+)
+
+DEFAULT_EMBEDDING_CACHE_PATH = CONFIG_ROOT / "embedding_cache.sqlite"
+
+EmbedFunc = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+class EmbeddingService:
+    """Embed texts with `embed_func`, which embeds a list of texts in one call.
+
+    The texts requested within `batch_window` seconds, by any coroutine of the event loop, are embedded together, at
+    most `batch_size` per call. A text already requested and not embedded yet is not requested twice.
+
+    Example:
+        >>> service = EmbeddingService(embed_func, model="text-embedding-ada-002")
+        >>> embeddings = await asyncio.gather(*(service.aembed(i) for i in texts))  # one embeddings call
+    """
+
+    def __init__(
+        self,
+        embed_func: EmbedFunc,
+        model: str,
+        cache: Optional[ResponseCacheBackend] = None,
+        batch_size: int = 100,
+        batch_window: float = 0.01,
+        dimensions: Optional[int] = None,
+    ):
+        self.embed_func = embed_func
+        self.model = model
+        self.dimensions = dimensions
+        self.cache = cache
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: list[tuple[str, str]] = []  # (key, text) of the next batch
+        self._pending: dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def make_key(self, text: str) -> str:
+        model = f"{self.model}/{self.dimensions}" if self.dimensions else self.model
+        return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).hexdigest()
+
+    def get_cached(self, texts: Sequence[str]) -> list[Optional[list[float]]]:
+        """Return the cached embedding of each text, None if not cached"""
+        if self.cache is None:
+            return [None] * len(texts)
+        return [self._unpack(self.cache.get(self.make_key(i))) for i in texts]
+
+    def set_cached(self, texts: Sequence[str], embeddings: Sequence[list[float]]):
+        if self.cache is None:
+            return
+        for text, embedding in zip(texts, embeddings):
+            self.cache.set(self.make_key(text), self._pack(embedding))
+
+    @staticmethod
+    def _pack(embedding: Sequence[float]) -> str:
+        """The base64 of the float64 bytes, a fraction of the memory of a list of python floats"""
+        return base64.b64encode(array("d", embedding).tobytes()).decode("ascii")
+
+    @staticmethod
+    def _unpack(value) -> Optional[list[float]]:
+        if value is None or isinstance(value, list):  # cached unpacked by older versions
+            return value
+        return array("d", base64.b64decode(value)).tolist()
+
+    async def aembed(self, text: str) -> list[float]:
+        return (await self.aembed_batch([text]))[0]
+
+    async def aembed_batch(self, texts: Sequence[str]) -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:  # futures are bound to the loop they are created in
+            self._loop, self._queue, self._pending, self._flush_handle = loop, [], {}, None
+
+        embeddings = self.get_cached(texts)
+        futures = {}
+        for i, text in enumerate(texts):
+            if embeddings[i] is not None:
+                continue
+            key = self.make_key(text)
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = loop.create_future()
+                self._queue.append((key, text))
+            futures[i] = future
+        if not futures:
+            return embeddings
+
+        self._schedule_flush()
+        # shielded, so that a cancelled caller does not cancel the embeddings awaited by the others
+        results = await asyncio.gather(*(asyncio.shield(i) for i in futures.values()))
+        for i, embedding in zip(futures, results):
+            embeddings[i] = embedding
+        return embeddings
+
+    def _schedule_flush(self):
+        while len(self._queue) >= self.batch_size:
+            self._start_batch()
+        if self._queue and self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self.batch_window, self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        while self._queue:
+            self._start_batch()
+
+    def _start_batch(self):
+        batch, self._queue = self._queue[: self.batch_size], self._queue[self.batch_size :]
+        task = self._loop.create_task(self._embed_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _embed_batch(self, batch: list[tuple[str, str]]):
+        keys = [key for key, _ in batch]
+        texts = [text for _, text in batch]
+        try:
+            embeddings = await self._call(texts)
+            self.set_cached(texts, embeddings)
+        except Exception as e:
+            for key in keys:
+                future = self._pending.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+        for key, embedding in zip(keys, embeddings):
+            future = self._pending.pop(key, None)
+            if future is not None and not future.done():
+                future.set_result(embedding)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_random_exponential(min=1, max=20),
+        after=after_log(logger, logger.level("WARNING").name),
+        reraise=True,
+    )
+    async def _call(self, texts: list[str]) -> list[list[float]]:
+        embeddings = await self.embed_func(texts)
+        if len(embeddings) != len(texts):
+            raise ValueError(f"Got {len(embeddings)} embeddings of {len(texts)} texts")
+        logger.debug(f"Embedded {len(texts)} texts with {self.model}")
+        return embeddings
+
+
+def create_embedding_cache(embedding_config: EmbeddingConfig) -> Optional[ResponseCacheBackend]:
+    if embedding_config.cache_backend == "sqlite":
+        path = Path(embedding_config.cache_path) if embedding_config.cache_path else DEFAULT_EMBEDDING_CACHE_PATH
+        return SQLiteResponseCacheBackend(path=path, max_size=embedding_config.cache_max_size)
+    if embedding_config.cache_backend == "memory":
+        return MemoryResponseCacheBackend(max_size=embedding_config.cache_max_size)
+    return None
+
+
+_EMBEDDING_SERVICES: dict[str, EmbeddingService] = {}
+
+
+def get_embedding_service(
+    model: str,
+    embed_func: EmbedFunc,
+    endpoint: str = "",
+    embedding_config: Optional[EmbeddingConfig] = None,
+    api_key: str = "",
+    dimensions: Optional[int] = None,
+) -> EmbeddingService:
+    """Return the service shared by all the embedding clients of the same endpoint, api key, model and dimensions,
+    created with `embed_func` by the first of them"""
+    api_key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest() if api_key else ""
+    key = f"{endpoint}|{api_key_hash}|{model}|{dimensions or ''}"
+    if key not in _EMBEDDING_SERVICES:
+        embedding_config = embedding_config or config.embedding
+        _EMBEDDING_SERVICES[key] = EmbeddingService(
+            embed_func,
+            model=model,
+            cache=create_embedding_cache(embedding_config),
+            batch_size=embedding_config.embed_batch_size or 100,
+            batch_window=embedding_config.batch_window,
+            dimensions=dimensions,
+        )
+    return _EMBEDDING_SERVICES[key]
@@ -8,11 +8,14 @@
 """
 from __future__ import annotations
 
+import asyncio
 import json
+import mmap
 import os
+import stat
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 
 from metagpt.logs import logger
 from metagpt.schema import Document
@@ -29,8 +32,13 @@ class FileRepository:
     Attributes:
         _relative_path (Path): The relative path within the Git repository.
         _git_repo (GitRepository): The associated GitRepository instance.
+        max_concurrency (int): The max number of files read concurrently by `get_many` and `get_all`.
+        mmap_min_size (int): Files of this size in bytes or larger are read by memory mapping, 0 to disable.
     """
 
+    max_concurrency: int = 16
+    mmap_min_size: int = 0
+
     def __init__(self, git_repo, relative_path: Path = Path(".")):
         """Initialize a FileRepository instance.
 
@@ -54,6 +62,8 @@ class FileRepository:
         pathname.parent.mkdir(parents=True, exist_ok=True)
         content = content if content else ""  # avoid `argument must be str, not None` to make it continue
         await awrite(filename=str(pathname), data=content)
+        self._git_repo.invalidate_cache()
+        self._git_repo.cache_content(pathname, self._signature(os.stat(pathname)), content)
         logger.info(f"save to: {str(pathname)}")
 
         if dependencies is not None:
@@ -73,6 +83,16 @@ class FileRepository:
         dependency_file = await self._git_repo.get_dependency()
         return await dependency_file.get(pathname)
 
+    async def get_dependents(self, filename: Path | str) -> Set[str]:
+        """Get the files depending on a file.
+
+        :param filename: The filename or path within the repository.
+        :return: Set of the filenames or paths of the files depending on it.
+        """
+        pathname = self.workdir / filename
+        dependency_file = await self._git_repo.get_dependency()
+        return await dependency_file.get_dependents(pathname)
+
     async def get_changed_dependency(self, filename: Path | str) -> Set[str]:
         """Get the dependencies of a file that have changed.
 
@@ -96,31 +116,66 @@ class FileRepository:
         """
         doc = Document(root_path=str(self.root_path), filename=str(filename))
         path_name = self.workdir / filename
-        if not path_name.exists():
+        try:
+            st = os.stat(path_name)
+        except (FileNotFoundError, NotADirectoryError):
             return None
-        if not path_name.is_file():
+        if not stat.S_ISREG(st.st_mode):
             return None
-        doc.content = await aread(path_name)
+        signature = self._signature(st)
+        content = self._git_repo.get_cached_content(path_name, signature)
+        if content is None:
+            if self.mmap_min_size and st.st_size >= self.mmap_min_size:
+                content = await asyncio.to_thread(self._read_mmap, path_name)
+            if content is None:
+                content = await aread(path_name)
+            self._git_repo.cache_content(path_name, signature, content)
+        doc.content = content
         return doc
 
+    async def get_many(self, filenames: List[Path | str]) -> List[Optional[Document]]:
+        """Read the content of files concurrently, at most `max_concurrency` files at a time.
+
+        :param filenames: The filenames or paths within the repository.
+        :return: The documents in the order of filenames, None for the files not existing.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _get(filename):
+            async with semaphore:
+                return await self.get(filename)
+
+        return list(await asyncio.gather(*[_get(i) for i in filenames]))
+
     async def get_all(self, filter_ignored=True) -> List[Document]:
         """Get the content of all files in the repository.
 
         :return: List of Document instances representing files.
         """
-        docs = []
         if filter_ignored:
-            for f in self.all_files:
-                doc = await self.get(f)
-                docs.append(doc)
+            filenames = self.all_files
         else:
+            filenames = []
             for root, dirs, files in os.walk(str(self.workdir)):
                 for file in files:
                     file_path = Path(root) / file
-                    relative_path = file_path.relative_to(self.workdir)
-                    doc = await self.get(relative_path)
-                    docs.append(doc)
-        return docs
+                    filenames.append(file_path.relative_to(self.workdir))
+        return await self.get_many(filenames)
+
+    @staticmethod
+    def _signature(st: os.stat_result) -> tuple:
+        return st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def _read_mmap(pathname: Path) -> Optional[str]:
+        """Read a large file by memory mapping, None if it is not utf-8 encoded."""
+        with open(pathname, mode="rb") as reader:
+            with mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                try:
+                    content = str(mm[:], encoding="utf-8")
+                except UnicodeDecodeError:
+                    return None
+        return content.replace("\r\n", "\n").replace("\r", "\n")  # universal newlines as `aread`
 
     @property
     def workdir(self):
@@ -231,6 +286,7 @@ class FileRepository:
         if not pathname.exists():
             return
         pathname.unlink(missing_ok=True)
+        self._git_repo.invalidate_cache()
 
         dependency_file = await self._git_repo.get_dependency()
         await dependency_file.update(filename=pathname, dependencies=None)
@@ -8,10 +8,12 @@
 """
 from __future__ import annotations
 
+import os
 import shutil
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
 from git.repo import Repo
 from git.repo.fun import is_git_dir
@@ -40,6 +42,13 @@ class GitRepository:
 
     Attributes:
         _repository (Repo): The GitPython `Repo` object representing the Git repository.
+
+    Within `cache_session`, or while watching by `start_watching`, the changed files and file lists are cached until
+    the repository is changed through `FileRepository.save`/`delete`, `add_change`, `commit` or a file system event.
+    Call `invalidate_cache` after changing files in other ways within a session. File contents read by
+    `FileRepository` are cached in the session too, keyed by the path and validated by the mtime and size.
+    The sessions of different owners, e.g. the concurrent reactions of several roles, each writing the repository in
+    its own ways, disable the cache while they overlap.
     """
 
     def __init__(self, local_path=None, auto_init=True):
@@ -51,6 +60,13 @@ class GitRepository:
         self._repository = None
         self._dependency = None
         self._gitignore_rules = None
+        self._gitignore_signature = None  # (mtime, size) of the parsed .gitignore
+        self._ignored_cache: Dict[str, bool] = {}
+        self._changed_files_cache: Optional[Dict[str, ChangeType]] = None
+        self._files_cache: Dict[tuple, List[str]] = {}
+        self._content_cache: Dict[str, tuple] = {}  # pathname -> ((mtime, size), content)
+        self._cache_owners: Dict[Optional[int], int] = {}  # id of the owner of the sessions -> number of sessions
+        self._observer = None
         if local_path:
             self.open(local_path=local_path, auto_init=auto_init)
 
@@ -63,7 +79,7 @@ class GitRepository:
         local_path = Path(local_path)
         if self.is_git_dir(local_path):
             self._repository = Repo(local_path)
-            self._gitignore_rules = parse_gitignore(full_path=str(local_path / ".gitignore"))
+            self._load_gitignore(local_path / ".gitignore")
             return
         if not auto_init:
             return
@@ -83,7 +99,7 @@ class GitRepository:
             writer.write("\n".join(ignores))
         self._repository.index.add([".gitignore"])
         self._repository.index.commit("Add .gitignore")
-        self._gitignore_rules = parse_gitignore(full_path=gitignore_filename)
+        self._load_gitignore(gitignore_filename)
 
     def add_change(self, files: Dict):
         """Add or remove files from the staging area based on the provided changes.
@@ -95,6 +111,7 @@ class GitRepository:
 
         for k, v in files.items():
             self._repository.index.remove(k) if v is ChangeType.DELETED else self._repository.index.add([k])
+        self.invalidate_cache()
 
     def commit(self, comments):
         """Commit the staged changes with the given comments.
@@ -103,9 +120,13 @@ class GitRepository:
         """
         if self.is_valid:
             self._repository.index.commit(comments)
+            self.invalidate_cache()
 
     def delete_repository(self):
         """Delete the entire repository directory."""
+        self.stop_watching()
+        self.invalidate_cache()
+        self._content_cache.clear()
         if self.is_valid:
             try:
                 shutil.rmtree(self._repository.working_dir)
@@ -118,11 +139,105 @@ class GitRepository:
 
         :return: A dictionary where keys are file paths and values are change types.
         """
+        if self._changed_files_cache is not None:
+            return dict(self._changed_files_cache)
         files = {i: ChangeType.UNTRACTED for i in self._repository.untracked_files}
         changed_files = {f.a_path: ChangeType(f.change_type) for f in self._repository.index.diff(None)}
         files.update(changed_files)
+        if self.caching:
+            self._changed_files_cache = dict(files)
         return files
 
+    @property
+    def caching(self) -> bool:
+        """Whether the repository state is cached, see `cache_session` and `start_watching`"""
+        return len(self._cache_owners) == 1 or self._observer is not None
+
+    @contextmanager
+    def cache_session(self, owner: Any = None):
+        """Cache the repository state in the context, e.g. an action. Nested or concurrent sessions of the same owner
+        share the cache, which is dropped at exit of the last one. The cache is dropped and disabled while sessions
+        of different owners overlap, as one does not see the changes the others make outside `FileRepository`.
+
+        :param owner: The writer of the repository in the session, e.g. a role.
+
+        Example:
+            >>> with git_repo.cache_session():
+            ...     changed_files = git_repo.changed_files  # computed
+            ...     changed_files = git_repo.changed_files  # cached
+        """
+        key = None if owner is None else id(owner)
+        self._cache_owners[key] = self._cache_owners.get(key, 0) + 1
+        if len(self._cache_owners) > 1:
+            self.invalidate_cache()
+        try:
+            yield self
+        finally:
+            self._cache_owners[key] -= 1
+            if not self._cache_owners[key]:
+                del self._cache_owners[key]
+            if not self._cache_owners and not self.caching:
+                self.invalidate_cache()
+                self._content_cache.clear()
+
+    def invalidate_cache(self):
+        """Drop the cached changed files and file lists, which are refreshed on the next access."""
+        self._changed_files_cache = None
+        self._files_cache.clear()
+
+    def get_cached_content(self, pathname: Path | str, signature: tuple) -> Optional[str]:
+        """Return the cached content of a file if it is unchanged since cached.
+
+        :param pathname: The absolute path of the file.
+        :param signature: The current (mtime, size) of the file.
+        """
+        item = self._content_cache.get(str(pathname))
+        if item is None:
+            return None
+        if item[0] != signature:
+            del self._content_cache[str(pathname)]
+            return None
+        return item[1]
+
+    def cache_content(self, pathname: Path | str, signature: tuple, content: str):
+        """Cache the content of a file read or written in a cache session.
+
+        :param pathname: The absolute path of the file.
+        :param signature: The (mtime, size) of the file when the content was read or written.
+        :param content: The content of the file.
+        """
+        if self.caching:
+            self._content_cache[str(pathname)] = (signature, content)
+
+    def start_watching(self):
+        """Invalidate the cache on file system events in the working directory, requires `watchdog`."""
+        if self._observer or not self.is_valid:
+            return
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            raise ImportError("`watchdog` package not found, please run `pip install watchdog`")
+
+        repo = self
+
+        class _InvalidateHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                repo.invalidate_cache()
+
+        self._observer = Observer()
+        self._observer.schedule(_InvalidateHandler(), str(self.workdir), recursive=True)
+        self._observer.daemon = True
+        self._observer.start()
+
+    def stop_watching(self):
+        """Stop the watcher started by `start_watching`."""
+        if not self._observer:
+            return
+        self._observer.stop()
+        self._observer.join()
+        self._observer = None
+
     @staticmethod
     def is_git_dir(local_path):
         """Check if the specified directory is a Git repository.
@@ -165,6 +280,9 @@ class GitRepository:
 
         :param comments: Comments for the archive commit.
         """
+        if self._dependency:
+            self._dependency.flush()
+        self.invalidate_cache()
         logger.info(f"Archive: {list(self.changed_files.keys())}")
         self.add_change(self.changed_files)
         self.commit(comments)
@@ -198,6 +316,8 @@ class GitRepository:
         """
         if self.workdir.name == new_dir_name:
             return
+        if self._dependency:
+            self._dependency.flush()
         new_path = self.workdir.parent / new_dir_name
         if new_path.exists():
             logger.info(f"Delete directory {str(new_path)}")
@@ -218,7 +338,13 @@ class GitRepository:
                 return
         logger.info(f"Rename directory {str(self.workdir)} to {str(new_path)}")
         self._repository = Repo(new_path)
-        self._gitignore_rules = parse_gitignore(full_path=str(new_path / ".gitignore"))
+        self._dependency = None  # bound to the old path
+        self._load_gitignore(new_path / ".gitignore")
+        self.invalidate_cache()
+        self._content_cache.clear()
+        if self._observer:
+            self.stop_watching()
+            self.start_watching()
 
     def get_files(self, relative_path: Path | str, root_relative_path: Path | str = None, filter_ignored=True) -> List:
         """
@@ -242,26 +368,36 @@ class GitRepository:
 
         if not root_relative_path:
             root_relative_path = Path(self.workdir) / relative_path
+        if filter_ignored:
+            self._reload_gitignore_if_changed()
+        key = (str(relative_path), str(root_relative_path), filter_ignored)
+        if key in self._files_cache:
+            return list(self._files_cache[key])
+
+        directory_path = Path(self.workdir) / relative_path
+        if not directory_path.exists():
+            return []
         files = []
+        self._walk(str(directory_path), str(directory_path.relative_to(root_relative_path)), files)
+        if filter_ignored:
+            files = self.filter_gitignore(filenames=files, root_relative_path=root_relative_path)
+        if self.caching:
+            self._files_cache[key] = list(files)
+        return files
+
+    @staticmethod
+    def _walk(directory: str, relative_directory: str, files: List[str]):
+        """Collect the files under the directory in one pass, in the order of `Path.iterdir` depth-first."""
         try:
-            directory_path = Path(self.workdir) / relative_path
-            if not directory_path.exists():
-                return []
-            for file_path in directory_path.iterdir():
-                if file_path.is_file():
-                    rpath = file_path.relative_to(root_relative_path)
-                    files.append(str(rpath))
-                else:
-                    subfolder_files = self.get_files(
-                        relative_path=file_path, root_relative_path=root_relative_path, filter_ignored=False
-                    )
-                    files.extend(subfolder_files)
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    rpath = os.path.normpath(os.path.join(relative_directory, entry.name))
+                    if entry.is_file():
+                        files.append(rpath)
+                    elif os.path.exists(entry.path):
+                        GitRepository._walk(entry.path, rpath, files)
         except Exception as e:
             logger.error(f"Error: {e}")
-        if not filter_ignored:
-            return files
-        filtered_files = self.filter_gitignore(filenames=files, root_relative_path=root_relative_path)
-        return filtered_files
 
     def filter_gitignore(self, filenames: List[str], root_relative_path: Path | str = None) -> List[str]:
         """
@@ -276,10 +412,35 @@ class GitRepository:
         """
         if root_relative_path is None:
             root_relative_path = self.workdir
+        self._reload_gitignore_if_changed()
         files = []
         for filename in filenames:
-            pathname = root_relative_path / filename
-            if self._gitignore_rules(str(pathname)):
+            pathname = str(Path(root_relative_path) / filename)
+            ignored = self._ignored_cache.get(pathname)
+            if ignored is None:
+                ignored = self._ignored_cache[pathname] = bool(self._gitignore_rules(pathname))
+            if ignored:
                 continue
             files.append(filename)
         return files
+
+    def _load_gitignore(self, filename: Path | str):
+        self._gitignore_rules = parse_gitignore(full_path=str(filename))
+        self._gitignore_signature = self._gitignore_file_signature(filename)
+        self._ignored_cache.clear()
+
+    def _reload_gitignore_if_changed(self):
+        if not self.is_valid:
+            return
+        filename = self.workdir / ".gitignore"
+        if self._gitignore_file_signature(filename) not in (self._gitignore_signature, None):
+            self._load_gitignore(filename)
+            self._files_cache.clear()
+
+    @staticmethod
+    def _gitignore_file_signature(filename: Path | str):
+        try:
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Time    : 2026/10/18
+@File    : kernel_pool.py
+@Desc    : Pool of pre-started jupyter kernels leased by ExecuteNbCode. Kernels are started ahead of time with common
+    libraries imported, health checked when leased, reset when returned, and recycled when they die or use too much
+    memory, so short tasks do not pay for kernel startup and library imports.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from jupyter_client import AsyncKernelClient, AsyncKernelManager
+
+from metagpt.logs import logger
+
+DEFAULT_WARMUP_CODE = """
+try:
+    import numpy as np
+    import pandas as pd
+    import sklearn
+    import matplotlib.pyplot as plt
+except ImportError:
+    pass
+"""
+
+RESET_CODE = """
+%reset -f
+import os as _os, sys as _sys
+_os.chdir({cwd!r})
+if "matplotlib.pyplot" in _sys.modules:
+    _sys.modules["matplotlib.pyplot"].close("all")
+del _os, _sys
+"""
+
+
+@dataclass
+class PooledKernel:
+    km: AsyncKernelManager
+    kc: AsyncKernelClient
+    leases: int = 0
+
+    @property
+    def pid(self) -> Optional[int]:
+        return getattr(self.km.provisioner, "pid", None)
+
+
+class KernelPool:
+    """A pool keeping `size` idle kernels started, with at most `max_kernels` kernels alive at the same time, leased
+    or idle, None for no limit. A kernel using more than `memory_limit_mb` MB of memory is shut down instead of being
+    returned to the pool, 0 for no limit. `size=0` starts kernels on demand and shuts them down when released.
+    `acquire` raises TimeoutError if no kernel is released within `acquire_timeout` seconds, None to wait forever.
+
+    Example:
+        >>> async with KernelPool(size=4) as pool:
+        ...     di = DataInterpreter(execute_code=ExecuteNbCode(pool=pool))
+        ...     await di.run("Run data analysis on sklearn Iris dataset")
+    """
+
+    def __init__(
+        self,
+        size: int = 0,
+        max_kernels: Optional[int] = 8,
+        memory_limit_mb: int = 0,
+        warmup_code: str = DEFAULT_WARMUP_CODE,
+        kernel_name: str = "",
+        cwd: Optional[str] = None,
+        startup_timeout: float = 60,
+        health_check_timeout: float = 5,
+        acquire_timeout: Optional[float] = 300,
+    ):
+        if memory_limit_mb:
+            try:
+                import psutil  # noqa: F401
+            except ImportError:
+                raise ImportError("`psutil` package not found, please run `pip install psutil`")
+        self.size = size if max_kernels is None else min(size, max_kernels)
+        self.max_kernels = max_kernels
+        self.memory_limit_mb = memory_limit_mb
+        self.warmup_code = warmup_code
+        self.kernel_name = kernel_name
+        self.cwd = cwd or os.getcwd()
+        self.startup_timeout = startup_timeout
+        self.health_check_timeout = health_check_timeout
+        self.acquire_timeout = acquire_timeout
+        self._idle: deque[PooledKernel] = deque()
+        self._alive = 0  # kernels alive or starting, leased or idle
+        self._changed = asyncio.Condition()  # notified when a kernel gets idle or shut down
+        self._starting: set[asyncio.Task] = set()
+        self._closed = False
+
+    async def __aenter__(self) -> "KernelPool":
+        await self.fill()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    async def fill(self):
+        """Start kernels until there are `size` idle ones, and wait for them to be ready"""
+        self._refill()
+        if self._starting:
+            await asyncio.gather(*self._starting, return_exceptions=True)
+
+    async def acquire(self) -> PooledKernel:
+        """Lease a healthy kernel, waiting for a kernel to be released if `max_kernels` kernels are alive"""
+        loop = asyncio.get_running_loop()
+        deadline = None if self.acquire_timeout is None else loop.time() + self.acquire_timeout
+        while True:
+            if self._closed:
+                raise RuntimeError("The kernel pool is closed")
+            while self._idle:
+                kernel = self._idle.popleft()
+                if await self.is_healthy(kernel):
+                    return self._lease(kernel)
+                logger.info(f"Discard unhealthy kernel {kernel.pid}")
+                await self._shutdown(kernel)
+            if self._can_start():
+                return self._lease(await self._start_kernel())
+            async with self._changed:
+                try:
+                    await asyncio.wait_for(
+                        self._changed.wait_for(lambda: self._idle or self._can_start() or self._closed),
+                        timeout=None if deadline is None else max(deadline - loop.time(), 0),
+                    )
+                except asyncio.TimeoutError:
+                    raise TimeoutError(
+                        f"No kernel released within {self.acquire_timeout}s, {self._alive} kernels are leased or "
+                        f"starting, terminate the ExecuteNbCode actions done with their kernels"
+                    ) from None
+
+    async def release(self, kernel: PooledKernel, reset: bool = True):
+        """Return a leased kernel. Kernels are reset and kept idle if the pool is not full, and shut down otherwise."""
+        keep = not self._closed and len(self._idle) < self.size and await self.is_healthy(kernel)
+        if keep and reset:
+            keep = await self._execute(kernel, RESET_CODE.format(cwd=self.cwd), "reset")
+        if keep and self.memory_limit_mb:
+            memory = self.memory_usage_mb(kernel)
+            if memory > self.memory_limit_mb:
+                logger.info(f"Recycle kernel {kernel.pid} using {memory:.0f}MB memory")
+                keep = False
+        if keep:
+            await self._put_idle(kernel)
+            return
+        await self.discard(kernel)
+
+    async def discard(self, kernel: PooledKernel):
+        """Shut down a leased kernel, e.g. died, and start another one if the pool is not full"""
+        await self._shutdown(kernel)
+        self._refill()
+
+    async def close(self):
+        self._closed = True
+        for task in list(self._starting):
+            task.cancel()
+        await asyncio.gather(*self._starting, return_exceptions=True)
+        while self._idle:
+            await self._shutdown(self._idle.popleft())
+        await self._notify()  # wake up the waiters to fail
+
+    def kill(self):
+        """Kill the idle kernels without the event loop, e.g. of a pool left by a closed event loop"""
+        self._closed = True
+        while self._idle:
+            kernel = self._idle.popleft()
+            try:
+                kernel.kc.stop_channels()
+                if kernel.pid:
+                    os.kill(kernel.pid, signal.SIGTERM)
+            except Exception as e:
+                logger.warning(f"Failed to kill kernel {kernel.pid}: {e}")
+            self._alive -= 1
+
+    async def is_healthy(self, kernel: PooledKernel) -> bool:
+        """Check if the kernel is alive and responding, instead of waiting for a fixed time"""
+        try:
+            if not await kernel.km.is_alive():
+                return False
+            await kernel.kc.kernel_info(reply=True, timeout=self.health_check_timeout)
+            return True
+        except Exception as e:
+            logger.debug(f"Kernel {kernel.pid} is unhealthy: {e}")
+            return False
+
+    def memory_usage_mb(self, kernel: PooledKernel) -> float:
+        import psutil
+
+        try:
+            return psutil.Process(kernel.pid).memory_info().rss / 1024 / 1024
+        except (psutil.Error, TypeError, ValueError):
+            return 0
+
+    def _can_start(self) -> bool:
+        return self.max_kernels is None or self._alive < self.max_kernels
+
+    def _lease(self, kernel: PooledKernel) -> PooledKernel:
+        kernel.leases += 1
+        self._refill()
+        return kernel
+
+    def _refill(self):
+        """Start idle kernels in the background up to `size`, within `max_kernels`"""
+        if self._closed:
+            return
+        missing = self.size - len(self._idle) - len(self._starting)
+        if self.max_kernels is not None:
+            missing = min(missing, self.max_kernels - self._alive)
+        for _ in range(missing):
+            task = asyncio.create_task(self._start_idle_kernel())
+            self._starting.add(task)
+            task.add_done_callback(self._starting.discard)
+
+    async def _start_idle_kernel(self):
+        await self._put_idle(await self._start_kernel())
+
+    async def _put_idle(self, kernel: PooledKernel):
+        self._idle.append(kernel)
+        await self._notify()
+
+    async def _notify(self):
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _start_kernel(self) -> PooledKernel:
+        self._alive += 1
+        try:
+            km = AsyncKernelManager(kernel_name=self.kernel_name) if self.kernel_name else AsyncKernelManager()
+            await km.start_kernel(cwd=self.cwd)
+            kc = km.client()
+            kc.start_channels()
+            try:
+                await kc.wait_for_ready(timeout=self.startup_timeout)
+            except BaseException:
+                kc.stop_channels()
+                await km.shutdown_kernel(now=True)
+                raise
+        except BaseException:
+            self._alive -= 1
+            await self._notify()
+            raise
+        kc.allow_stdin = False
+        kernel = PooledKernel(km=km, kc=kc)
+        if self.warmup_code:
+            await self._execute(kernel, self.warmup_code, "warm up")
+        return kernel
+
+    async def _execute(self, kernel: PooledKernel, code: str, purpose: str) -> bool:
+        try:
+            reply = await kernel.kc.execute_interactive(
+                code, silent=True, store_history=False, timeout=self.startup_timeout, output_hook=lambda msg: None
+            )
+        except Exception as e:
+            logger.warning(f"Failed to {purpose} kernel {kernel.pid}: {e}")
+            return False
+        if reply["content"]["status"] != "ok":
+            logger.warning(f"Failed to {purpose} kernel {kernel.pid}: {reply['content'].get('evalue')}")
+            return False
+        return True
+
+    async def _shutdown(self, kernel: PooledKernel):
+        try:
+            kernel.kc.stop_channels()
+            if await kernel.km.is_alive():
+                await kernel.km.shutdown_kernel(now=True)
+            await kernel.km.cleanup_resources()
+        except Exception as e:
+            logger.warning(f"Failed to shut down kernel {kernel.pid}: {e}")
+        finally:
+            self._alive -= 1
+            await self._notify()
+
+
+_KERNEL_POOL: tuple[Optional[asyncio.AbstractEventLoop], Optional[KernelPool]] = (None, None)
+
+
+def get_kernel_pool() -> KernelPool:
+    """Return the pool shared by the ExecuteNbCode actions running in the current event loop, unless replaced by
+    `set_kernel_pool`. It keeps a kernel with common libraries imported ready, without limit on the kernels leased."""
+    global _KERNEL_POOL
+    loop = asyncio.get_running_loop()
+    if _KERNEL_POOL[0] is not loop:  # kernel clients are bound to the loop they run in
+        _replace_kernel_pool(loop, KernelPool(size=1, max_kernels=None))
+    return _KERNEL_POOL[1]
+
+
+def set_kernel_pool(pool: KernelPool):
+    """Share a pool, e.g. with pre-started kernels, by the ExecuteNbCode actions running in the current event loop"""
+    _replace_kernel_pool(asyncio.get_running_loop(), pool)
+
+
+def _replace_kernel_pool(loop: asyncio.AbstractEventLoop, pool: KernelPool):
+    global _KERNEL_POOL
+    old_loop, old_pool = _KERNEL_POOL
+    if old_pool is not None and old_pool is not pool and old_loop is not None and old_loop.is_closed():
+        old_pool.kill()  # its idle kernels would be kept alive for nothing
+    _KERNEL_POOL = (loop, pool)
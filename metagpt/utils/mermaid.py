@@ -11,12 +11,20 @@ from pathlib import Path
 
 from metagpt.config2 import config
 from metagpt.logs import logger
-from metagpt.utils.common import awrite, check_cmd_exists
+from metagpt.utils.common import awrite, awrite_bin, check_cmd_exists
+from metagpt.utils.mermaid_renderer import (
+    MermaidCache,
+    get_mermaid_cache,
+    render_to_file,
+)
 
 
 async def mermaid_to_file(engine, mermaid_code, output_file_without_suffix, width=2048, height=2048) -> int:
     """suffix: png/svg/pdf
 
+    The outputs are cached on disk by the hash of the mermaid code and the render config, an unchanged diagram is
+    copied from the cache instead of being rendered again.
+
     :param mermaid_code: mermaid code
     :param output_file_without_suffix: output filename
     :param width:
@@ -30,6 +38,32 @@ async def mermaid_to_file(engine, mermaid_code, output_file_without_suffix, widt
     tmp = Path(f"{output_file_without_suffix}.mmd")
     await awrite(filename=tmp, data=mermaid_code)
 
+    if engine == "none":
+        return 0
+    suffixes = ["svg", "png"] if engine == "ink" else ["pdf", "svg", "png"]  # ink does not support pdf
+    cache = get_mermaid_cache()
+    key = MermaidCache.make_key(
+        engine, mermaid_code, width, height, {"puppeteer_config": config.mermaid.puppeteer_config}
+    )
+    cached = cache.get(key, suffixes) if cache else None
+    if cached:
+        for suffix, data in cached.items():
+            logger.info(f"Generating {output_file_without_suffix}.{suffix} from the cache..")
+            await awrite_bin(filename=f"{output_file_without_suffix}.{suffix}", data=data)
+        return 0
+
+    # the outputs of a previous diagram at the same path are not taken for the outputs of this one
+    outputs = {suffix: Path(f"{output_file_without_suffix}.{suffix}") for suffix in suffixes}
+    for path in outputs.values():
+        path.unlink(missing_ok=True)
+    result = await _render_to_file(engine, tmp, mermaid_code, output_file_without_suffix, width, height)
+    if result == 0 and cache:
+        if all(i.exists() for i in outputs.values()):
+            cache.set(key, {suffix: path.read_bytes() for suffix, path in outputs.items()})
+    return result
+
+
+async def _render_to_file(engine, tmp: Path, mermaid_code, output_file_without_suffix, width, height) -> int:
     if engine == "nodejs":
         if check_cmd_exists(config.mermaid.path) != 0:
             logger.warning(
@@ -38,56 +72,62 @@ async def mermaid_to_file(engine, mermaid_code, output_file_without_suffix, widt
             )
             return -1
 
-        for suffix in ["pdf", "svg", "png"]:
-            output_file = f"{output_file_without_suffix}.{suffix}"
-            # Call the `mmdc` command to convert the Mermaid code to a PNG
-            logger.info(f"Generating {output_file}..")
-
-            if config.mermaid.puppeteer_config:
-                commands = [
-                    config.mermaid.path,
-                    "-p",
-                    config.mermaid.puppeteer_config,
-                    "-i",
-                    str(tmp),
-                    "-o",
-                    output_file,
-                    "-w",
-                    str(width),
-                    "-H",
-                    str(height),
-                ]
-            else:
-                commands = [config.mermaid.path, "-i", str(tmp), "-o", output_file, "-w", str(width), "-H", str(height)]
-            process = await asyncio.create_subprocess_shell(
-                " ".join(commands), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
+        # mmdc renders one format per run, the runs are independent of each other
+        return_codes = await asyncio.gather(
+            *[_mmdc(tmp, f"{output_file_without_suffix}.{suffix}", width, height) for suffix in ["pdf", "svg", "png"]]
+        )
+        return 0 if not any(return_codes) else -1
+    elif engine == "playwright":
+        from metagpt.utils.mmdc_playwright import mermaid_to_file
+
+        return await mermaid_to_file(mermaid_code, output_file_without_suffix, width, height)
+    elif engine == "pyppeteer":
+        from metagpt.utils.mmdc_pyppeteer import mermaid_to_file
 
-            stdout, stderr = await process.communicate()
-            if stdout:
-                logger.info(stdout.decode())
-            if stderr:
-                logger.warning(stderr.decode())
+        return await mermaid_to_file(mermaid_code, output_file_without_suffix, width, height)
+    elif engine == "ink":
+        from metagpt.utils.mmdc_ink import mermaid_to_file
+
+        return await mermaid_to_file(mermaid_code, output_file_without_suffix)
+    elif engine == "fake":
+        return await render_to_file(engine, mermaid_code, output_file_without_suffix, width, height)
     else:
-        if engine == "playwright":
-            from metagpt.utils.mmdc_playwright import mermaid_to_file
-
-            return await mermaid_to_file(mermaid_code, output_file_without_suffix, width, height)
-        elif engine == "pyppeteer":
-            from metagpt.utils.mmdc_pyppeteer import mermaid_to_file
-
-            return await mermaid_to_file(mermaid_code, output_file_without_suffix, width, height)
-        elif engine == "ink":
-            from metagpt.utils.mmdc_ink import mermaid_to_file
-
-            return await mermaid_to_file(mermaid_code, output_file_without_suffix)
-        elif engine == "none":
-            return 0
-        else:
-            logger.warning(f"Unsupported mermaid engine: {engine}")
+        logger.warning(f"Unsupported mermaid engine: {engine}")
     return 0
 
 
+async def _mmdc(tmp: Path, output_file, width, height) -> int:
+    # Call the `mmdc` command to convert the Mermaid code to a PNG, return the exit code
+    logger.info(f"Generating {output_file}..")
+
+    if config.mermaid.puppeteer_config:
+        commands = [
+            config.mermaid.path,
+            "-p",
+            config.mermaid.puppeteer_config,
+            "-i",
+            str(tmp),
+            "-o",
+            output_file,
+            "-w",
+            str(width),
+            "-H",
+            str(height),
+        ]
+    else:
+        commands = [config.mermaid.path, "-i", str(tmp), "-o", output_file, "-w", str(width), "-H", str(height)]
+    process = await asyncio.create_subprocess_shell(
+        " ".join(commands), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+
+    stdout, stderr = await process.communicate()
+    if stdout:
+        logger.info(stdout.decode())
+    if stderr:
+        logger.warning(stderr.decode())
+    return process.returncode
+
+
 MMC1 = """
 classDiagram
     class Main {
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+@Time    : 2026/10/18
+@File    : mermaid_renderer.py
+@Desc    : Long-lived mermaid renderers and the on-disk cache of rendered diagrams. A browser renderer keeps one page
+    with mermaid loaded, renders a diagram once to svg, and takes the png and pdf from the same page. Rendered outputs
+    are cached by the hash of the diagram source and the render config, so an unchanged diagram is never rendered twice.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urljoin
+
+from metagpt.config2 import config
+from metagpt.const import CONFIG_ROOT
+from metagpt.logs import logger
+from metagpt.utils.common import close_on_loop_shutdown
+
+DEFAULT_MERMAID_CACHE_DIR = CONFIG_ROOT / "mermaid_cache"
+MERMAID_HTML_URL = urljoin("file:", os.path.join(os.path.dirname(os.path.abspath(__file__)), "index.html"))
+
+RENDER_JS = """async ([definition, mermaidConfig, myCSS, backgroundColor]) => {
+    const { mermaid, zenuml } = globalThis;
+    if (!globalThis.__zenumlRegistered) {
+        await mermaid.registerExternalDiagrams([zenuml]);
+        globalThis.__zenumlRegistered = true;
+    }
+    mermaid.initialize({ startOnLoad: false, ...mermaidConfig });
+    const container = document.getElementById('container');
+    container.innerHTML = '';
+    const { svg } = await mermaid.render('my-svg', definition, container);
+    container.innerHTML = svg;
+    const svgElement = container.querySelector('svg');
+    svgElement.style.backgroundColor = backgroundColor;
+
+    if (myCSS) {
+        const style = document.createElementNS('http://www.w3.org/2000/svg', 'style');
+        style.appendChild(document.createTextNode(myCSS));
+        svgElement.appendChild(style);
+    }
+    const rect = svgElement.getBoundingClientRect();
+    return {
+        svg: new XMLSerializer().serializeToString(svgElement),
+        clip: {
+            x: Math.floor(rect.left),
+            y: Math.floor(rect.top),
+            width: Math.ceil(rect.width),
+            height: Math.ceil(rect.height)
+        }
+    };
+}"""
+
+
+class MermaidRenderer(ABC):
+    """Render mermaid code to the bytes of each output format"""
+
+    suffixes: tuple[str, ...] = ("png", "svg", "pdf")
+
+    @abstractmethod
+    async def render(self, mermaid_code: str, width: int = 2048, height: int = 2048) -> dict[str, bytes]:
+        """Return the outputs of the diagram keyed by the suffix"""
+
+    async def close(self):
+        pass
+
+
+class BrowserMermaidRenderer(MermaidRenderer):
+    """A headless browser page with mermaid loaded, which renders the diagrams one at a time"""
+
+    background_color = "#ffffff"
+
+    def __init__(self, mermaid_config: Optional[dict] = None, css: str = ""):
+        self.mermaid_config = mermaid_config or {}
+        self.css = css
+        self._page = None
+        self._lock = asyncio.Lock()
+
+    async def render(self, mermaid_code: str, width: int = 2048, height: int = 2048) -> dict[str, bytes]:
+        async with self._lock:
+            if self._page is None:
+                self._page = await self._open_page()
+                await self._page.evaluate(f'document.body.style.background = "{self.background_color}";')
+            try:
+                await self._set_viewport(width, height)
+                rendered = await self._page.evaluate(
+                    RENDER_JS, [mermaid_code, self.mermaid_config, self.css, self.background_color]
+                )
+                clip = rendered["clip"]
+                await self._set_viewport(clip["x"] + clip["width"], clip["y"] + clip["height"])
+                return {
+                    "svg": rendered["svg"].encode("utf-8"),
+                    "png": await self._page.screenshot(clip=clip, omit_background=True),
+                    "pdf": await self._page.pdf(scale=1.0),
+                }
+            except Exception:
+                await self._close()  # a fresh browser for the next diagram
+                raise
+
+    async def close(self):
+        async with self._lock:
+            await self._close()
+
+    @abstractmethod
+    async def _open_page(self):
+        """Launch the browser if needed and open a page with `MERMAID_HTML_URL` loaded"""
+
+    @abstractmethod
+    async def _set_viewport(self, width: int, height: int):
+        """Resize the viewport of the page"""
+
+    @abstractmethod
+    async def _close(self):
+        """Close the browser and reset the page"""
+
+
+class FakeMermaidRenderer(MermaidRenderer):
+    """Render placeholders without a browser, for tests"""
+
+    def __init__(self):
+        self.render_count = 0
+
+    async def render(self, mermaid_code: str, width: int = 2048, height: int = 2048) -> dict[str, bytes]:
+        self.render_count += 1
+        digest = hashlib.sha256(mermaid_code.encode("utf-8")).hexdigest()
+        svg = f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}"><!-- {digest} --></svg>'
+        return {
+            "svg": svg.encode("utf-8"),
+            "png": b"\x89PNG\r\n\x1a\n" + digest.encode(),
+            "pdf": b"%PDF-1.4\n%" + digest.encode(),
+        }
+
+
+class MermaidCache:
+    """Rendered outputs stored as `<key>.<suffix>` files in `cache_dir`"""
+
+    def __init__(self, cache_dir: str | Path = ""):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_MERMAID_CACHE_DIR
+
+    @staticmethod
+    def make_key(engine: str, mermaid_code: str, width: int, height: int, render_config: Optional[dict] = None) -> str:
+        content = json.dumps(
+            {"engine": engine, "code": mermaid_code, "width": width, "height": height, "config": render_config or {}},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, suffixes: list[str]) -> Optional[dict[str, bytes]]:
+        """Return the cached outputs, None unless all the suffixes are cached"""
+        paths = {suffix: self.cache_dir / f"{key}.{suffix}" for suffix in suffixes}
+        if not all(i.exists() for i in paths.values()):
+            return None
+        return {suffix: path.read_bytes() for suffix, path in paths.items()}
+
+    def set(self, key: str, outputs: dict[str, bytes]):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for suffix, data in outputs.items():
+            tmp = self.cache_dir / f"{key}.{suffix}.{os.getpid()}.tmp"
+            tmp.write_bytes(data)
+            tmp.replace(self.cache_dir / f"{key}.{suffix}")  # atomic, for processes sharing the cache
+
+
+def get_mermaid_cache() -> Optional[MermaidCache]:
+    """The cache of the mermaid config, None if disabled"""
+    if not config.mermaid.cache:
+        return None
+    return MermaidCache(config.mermaid.cache_dir)
+
+
+_RENDERERS: dict[tuple[asyncio.AbstractEventLoop, str], MermaidRenderer] = {}
+
+
+def get_mermaid_renderer(engine: str) -> MermaidRenderer:
+    """Return the renderer of the engine shared in the current event loop, one of `playwright`, `pyppeteer`, `fake`.
+    The renderer is closed when the loop shuts down."""
+    loop = asyncio.get_running_loop()
+    # browser connections are bound to the loop they run in
+    key = (loop, engine)
+    if key in _RENDERERS:
+        return _RENDERERS[key]
+    if engine == "playwright":
+        from metagpt.utils.mmdc_playwright import PlaywrightMermaidRenderer
+
+        renderer = PlaywrightMermaidRenderer()
+    elif engine == "pyppeteer":
+        from metagpt.utils.mmdc_pyppeteer import PyppeteerMermaidRenderer
+
+        renderer = PyppeteerMermaidRenderer(executable_path=config.mermaid.pyppeteer_path)
+    elif engine == "fake":
+        renderer = FakeMermaidRenderer()
+    else:
+        raise ValueError(f"No long-lived renderer of the mermaid engine: {engine}")
+    logger.debug(f"Start the {engine} mermaid renderer")
+    _RENDERERS[key] = renderer
+    close_on_loop_shutdown(lambda: _close_renderer(key))
+    return renderer
+
+
+async def _close_renderer(key: tuple[asyncio.AbstractEventLoop, str]):
+    renderer = _RENDERERS.pop(key, None)
+    if renderer is not None:
+        await renderer.close()
+
+
+async def render_to_file(engine: str, mermaid_code: str, output_file_without_suffix, width=2048, height=2048) -> int:
+    """Render with the shared renderer of the engine and save the outputs, return 0 if succeed, -1 if failed"""
+    try:
+        outputs = await get_mermaid_renderer(engine).render(mermaid_code, width, height)
+    except Exception as e:
+        logger.error(e)
+        return -1
+    for suffix, data in outputs.items():
+        logger.info(f"Generating {output_file_without_suffix}.{suffix}..")
+        with open(f"{output_file_without_suffix}.{suffix}", "wb") as f:
+            f.write(data)
+    return 0
@@ -39,10 +39,10 @@ class WebPage(BaseModel):
                 yield urljoin(self.url, url)
 
 
-def get_html_content(page: str, base: str):
+def get_html_content(page: str, base: str, separator: str = ""):
     soup = _get_soup(page)
 
-    return soup.get_text(strip=True)
+    return soup.get_text(separator, strip=True)
 
 
 def _get_soup(page: str):
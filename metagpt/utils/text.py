@@ -1,6 +1,92 @@
-from typing import Generator, Sequence
+import re
+from collections import deque
+from pathlib import Path
+from typing import Generator, Iterable, Sequence, Union
 
-from metagpt.utils.token_counter import TOKEN_MAX, count_output_tokens
+from metagpt.utils.token_counter import TOKEN_MAX, count_output_tokens, get_encoding
+
+# the boundaries to split a paragraph that is too long, from the coarsest to the finest
+_SPLIT_PATTERNS = (re.compile(r"(?<=[.!?。！？])"), re.compile(r"(?<=[,;，；])"))
+
+
+class TokenChunker:
+    """Split texts into chunks of at most `chunk_size` tokens, at paragraph boundaries first, then at sentence and
+    clause boundaries, and at token offsets as the last resort. Each piece of text is tokenized once, with the encoding
+    of the model cached by the process, and consecutive chunks share up to `overlap` tokens of whole pieces.
+
+    Example:
+        >>> chunker = TokenChunker("gpt-3.5-turbo", chunk_size=1000, overlap=100)
+        >>> chunks = list(chunker.split(text))
+        >>> for chunk in chunker.split_file("large.txt"):  # the file is never fully held in memory
+        ...     summarize(chunk)
+    """
+
+    def __init__(self, model_name: str, chunk_size: int, overlap: int = 0):
+        if chunk_size <= 0:
+            raise ValueError(f"The chunk size must be positive, got {chunk_size}")
+        if not 0 <= overlap < chunk_size:
+            raise ValueError(f"The overlap must be in [0, {chunk_size}), got {overlap}")
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.encoding = get_encoding(model_name)
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text))
+
+    def split(self, text: str) -> Generator[str, None, None]:
+        """Split the text into chunks."""
+        return self.stream(text.splitlines(keepends=True))
+
+    def split_file(self, path: Union[str, Path], encoding: str = "utf-8") -> Generator[str, None, None]:
+        """Split the text file into chunks, reading it line by line."""
+        with open(path, encoding=encoding) as f:
+            yield from self.stream(f)
+
+    def stream(self, lines: Iterable[str]) -> Generator[str, None, None]:
+        """Split the lines, e.g. of a file or a network stream, into chunks as the lines come.
+
+        Args:
+            lines: The lines of the text, with their line endings.
+
+        Yields:
+            The chunk of text.
+        """
+        window: deque[tuple[str, int]] = deque()
+        tokens = 0
+        fresh = False  # whether the window has pieces other than the overlap of the previous chunk
+        for piece, count in self._pieces(lines):
+            if tokens + count > self.chunk_size and fresh:
+                yield "".join(i for i, _ in window)
+                fresh = False
+                while window and (tokens > self.overlap or tokens + count > self.chunk_size):
+                    tokens -= window.popleft()[1]
+            window.append((piece, count))
+            tokens += count
+            fresh = True
+        if fresh:
+            yield "".join(i for i, _ in window)
+
+    def _pieces(self, lines: Iterable[str]) -> Generator[tuple[str, int], None, None]:
+        for line in lines:
+            yield from self._split(line, 0)
+
+    def _split(self, text: str, level: int, tokens: list[int] = None) -> Generator[tuple[str, int], None, None]:
+        tokens = self.encoding.encode(text) if tokens is None else tokens
+        if len(tokens) <= self.chunk_size:
+            if tokens:
+                yield text, len(tokens)
+            return
+        if level < len(_SPLIT_PATTERNS):
+            parts = [i for i in _SPLIT_PATTERNS[level].split(text) if i]
+            if len(parts) > 1:
+                for part in parts:
+                    yield from self._split(part, level + 1)
+                return
+            yield from self._split(text, level + 1, tokens)
+            return
+        for i in range(0, len(tokens), self.chunk_size):
+            part = tokens[i : i + self.chunk_size]
+            yield self.encoding.decode(part), len(part)
 
 
 def reduce_message_length(
@@ -25,7 +111,10 @@ def reduce_message_length(
     """
     max_token = TOKEN_MAX.get(model_name, 2048) - count_output_tokens(system_text, model_name) - reserved
     for msg in msgs:
-        if count_output_tokens(msg, model_name) < max_token or model_name not in TOKEN_MAX:
+        if model_name not in TOKEN_MAX:
+            return msg
+        # a token is at least one byte, so a message with fewer bytes than the limit fits without tokenizing it
+        if len(msg.encode("utf-8")) < max_token or count_output_tokens(msg, model_name) < max_token:
             return msg
 
     raise RuntimeError("fail to reduce message length")
@@ -37,6 +126,7 @@ def generate_prompt_chunk(
     model_name: str,
     system_text: str,
     reserved: int = 0,
+    overlap: int = 0,
 ) -> Generator[str, None, None]:
     """Split the text into chunks of a maximum token size.
 
@@ -46,34 +136,17 @@ def generate_prompt_chunk(
         model_name: The name of the encoding to use. (e.g., "gpt-3.5-turbo")
         system_text: The system prompts.
         reserved: The number of reserved tokens.
+        overlap: The maximum number of tokens shared by consecutive chunks.
 
     Yields:
         The chunk of text.
     """
-    paragraphs = text.splitlines(keepends=True)
-    current_token = 0
-    current_lines = []
-
     reserved = reserved + count_output_tokens(prompt_template + system_text, model_name)
     # 100 is a magic number to ensure the maximum context length is not exceeded
     max_token = TOKEN_MAX.get(model_name, 2048) - reserved - 100
 
-    while paragraphs:
-        paragraph = paragraphs.pop(0)
-        token = count_output_tokens(paragraph, model_name)
-        if current_token + token <= max_token:
-            current_lines.append(paragraph)
-            current_token += token
-        elif token > max_token:
-            paragraphs = split_paragraph(paragraph) + paragraphs
-            continue
-        else:
-            yield prompt_template.format("".join(current_lines))
-            current_lines = [paragraph]
-            current_token = token
-
-    if current_lines:
-        yield prompt_template.format("".join(current_lines))
+    for chunk in TokenChunker(model_name, max_token, overlap).split(text):
+        yield prompt_template.format(chunk)
 
 
 def split_paragraph(paragraph: str, sep: str = ".,", count: int = 2) -> list[str]:
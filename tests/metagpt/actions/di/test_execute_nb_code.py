@@ -1,6 +1,7 @@
 import pytest
 
 from metagpt.actions.di.execute_nb_code import ExecuteNbCode
+from metagpt.utils.kernel_pool import KernelPool
 
 
 @pytest.mark.asyncio
@@ -126,3 +127,37 @@ async def test_parse_outputs():
     assert "KeyError: 'DUMMPY_ID'" in output
     assert "columns num:2" in output
     await executor.terminate()
+
+
+@pytest.mark.asyncio
+async def test_lease_from_kernel_pool():
+    async with KernelPool(size=1, warmup_code="import math") as pool:
+        executor = ExecuteNbCode(pool=pool)
+        output, is_success = await executor.run("x = math.sqrt(4)\nprint(x)")
+        assert is_success
+        assert "2.0" in output
+        kernel = executor.nb_client.kc
+        await executor.terminate()
+
+        # the kernel returned to the pool is reused by the next executor, with its state reset
+        executor = ExecuteNbCode(pool=pool)
+        output, is_success = await executor.run("print(x)")
+        assert executor.nb_client.kc is kernel
+        assert not is_success
+        assert "NameError" in output
+        await executor.terminate()
+
+
+@pytest.mark.asyncio
+async def test_stream_outputs():
+    executor = ExecuteNbCode()
+    code = """
+from IPython.display import clear_output
+print("progress 1")
+clear_output()
+print("done")
+"""
+    output, is_success = await executor.run(code)
+    assert is_success
+    assert output == "done\n"
+    await executor.terminate()
@@ -5,6 +5,9 @@
 @Author  : alexanderwu
 @File    : test_action_node.py
 """
+import asyncio
+import copy
+import math
 from pathlib import Path
 from typing import List, Tuple
 
@@ -13,6 +16,8 @@ from pydantic import BaseModel, Field, ValidationError
 
 from metagpt.actions import Action
 from metagpt.actions.action_node import ActionNode, ReviewMode, ReviseMode
+from metagpt.actions.design_api_an import DESIGN_API_NODE
+from metagpt.actions.write_prd_an import WRITE_PRD_NODE
 from metagpt.environment import Environment
 from metagpt.llm import LLM
 from metagpt.roles import Role
@@ -261,6 +266,101 @@ async def test_action_node_with_image(mocker):
     assert node.instruct_content.invoice
 
 
+def test_output_class_cache(mocker):
+    node = copy.deepcopy(WRITE_PRD_NODE)
+    create_model_class = mocker.spy(ActionNode, "create_model_class")
+    mapping, output_class = node.get_output_class("WritePRD_AN", mode="auto")
+    assert create_model_class.call_count == 1
+
+    # a cache hit neither rebuilds the mapping nor looks up the registry
+    get_mapping = mocker.spy(node, "get_mapping")
+    assert node.get_output_class("WritePRD_AN", mode="auto") == (mapping, output_class)
+    assert node.create_class() is output_class
+    assert create_model_class.call_count == 1
+    assert get_mapping.call_count == 0
+
+    # a structural change of the tree is a cache miss
+    node.get_child("Language").instruction = "Provide the language used in the project"
+    assert node.get_output_class("WritePRD_AN", mode="auto")[1] is not output_class
+    assert create_model_class.call_count == 2
+    assert node.create_class(exclude=["Language"]) is not output_class
+
+
+def test_compile_memoized(mocker):
+    node = copy.deepcopy(DESIGN_API_NODE)
+    prompt = node.compile(context="context", schema="json")
+    to_dict = mocker.spy(node, "to_dict")
+    assert node.compile(context="context", schema="json") == prompt
+    assert node.compile(context="another context", schema="json").replace("another context", "context") == prompt
+    assert to_dict.call_count == 0
+
+    node.get_child("Implementation approach").example = "We will use pygame"
+    prompt = node.compile(context="context", schema="json")
+    assert "We will use pygame" in prompt
+    assert to_dict.call_count == 2  # instruction and example
+
+
+class MockNodeLLM:
+    """A deterministic LLM answering with the format example of the prompt, after a delay.
+
+    A call is in the wave after the latest wave of the calls finished before it starts, so `waves` is the number of
+    LLM round trips in a row, which the fill takes `waves * delay` seconds for.
+    """
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self.finished_wave = 0
+        self.waves = 0
+
+    async def aask(self, msg, system_msgs=None, images=None, timeout=None):
+        wave = self.finished_wave + 1
+        self.waves = max(self.waves, wave)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        self.finished_wave = max(self.finished_wave, wave)
+        return msg.split("## format example\n")[1].split("\n\n## nodes")[0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("root", [WRITE_PRD_NODE, DESIGN_API_NODE])
+async def test_fill_parallel(root):
+    results = {}
+    for strgy in ["complex", "parallel"]:
+        node = copy.deepcopy(root)
+        llm = MockNodeLLM(delay=0)
+        await node.fill(context="Create a 2048 game", llm=llm, strgy=strgy, max_concurrency=4)
+        results[strgy] = (node.instruct_content.model_dump(), llm.max_running, llm.waves)
+
+    assert results["parallel"][0] == results["complex"][0]
+    assert results["complex"][1:] == (1, len(root.children))
+    assert results["parallel"][1:] == (4, math.ceil(len(root.children) / 4))
+
+
+@pytest.mark.asyncio
+async def test_fill_parallel_with_prevs():
+    node_a = ActionNode(key="a", expected_type=str, instruction="a", example="a")
+    node_b = ActionNode(key="b", expected_type=str, instruction="b", example="b")
+    node_c = ActionNode(key="c", expected_type=str, instruction="c", example="c")
+    node_c.add_prev(node_a)
+    root = ActionNode.from_children("root", [node_c, node_a, node_b])
+
+    order = []
+    llm = MockNodeLLM(delay=0)
+
+    async def aask(msg, *args, **kwargs):
+        order.append(next(i for i in "abc" if f'"{i}": "{i}"' in msg))
+        return await MockNodeLLM.aask(llm, msg)
+
+    llm.aask = aask
+    await root.fill(context="", llm=llm, strgy="parallel")
+    assert order == ["a", "b", "c"]  # c waits for a
+    assert list(root.instruct_content.model_dump()) == ["c", "a", "b"]
+
+
 class ToolDef(BaseModel):
     tool_name: str = Field(default="a", description="tool name", examples=[])
     description: str = Field(default="b", description="tool description", examples=[])
@@ -88,6 +88,37 @@ async def test_web_browse_and_summarize(mocker, context):
     assert resp[url] is None
 
 
+@pytest.mark.asyncio
+async def test_web_browse_and_summarize_map_reduce(mocker, context):
+    prompts = []
+
+    async def mock_llm_ask(self, prompt, *args, **kwargs):
+        prompts.append(prompt)
+        if "irrelevant" in prompt:
+            return "Not relevant."
+        return "metagpt"
+
+    mocker.patch("metagpt.provider.base_llm.BaseLLM.aask", mock_llm_ask)
+    mocker.patch(
+        "metagpt.actions.research.generate_prompt_chunk",
+        lambda text, template, *args: (template.format(i) for i in text.split("|")),
+    )
+    url = "https://github.com/geekan/MetaGPT"
+    url2 = "https://github.com/trending"
+    action = research.WebBrowseAndSummarize(context=context, reduce_fan_in=2)
+    action.web_browser_engine.run_func = mocker.AsyncMock(
+        return_value=[
+            mocker.Mock(inner_text="a|b|c|irrelevant|d|e"),
+            mocker.Mock(inner_text="irrelevant|irrelevant"),
+        ]
+    )
+
+    resp = [i async for i in action.run_stream(url, url2, query="What's new in metagpt")]
+    assert dict(resp) == {url: "metagpt", url2: None}
+    # 8 chunks, then the 5 relevant summaries are reduced 2 at a time: 3 -> 2 -> 1
+    assert len(prompts) == 8 + 2 + 1 + 1
+
+
 @pytest.mark.asyncio
 async def test_conduct_research(mocker, context):
     data = None
@@ -63,3 +63,20 @@ async def test_run(context):
     for ctx, result in inputs:
         rsp = await RunCode(i_context=ctx, context=context).run()
         assert result in rsp.summary
+
+
+@pytest.mark.asyncio
+async def test_run_many(context, mocker, tmp_path):
+    mocker.patch.object(RunCode, "_aask", return_value="PASS")
+    i_contexts = [
+        RunCodeContext(
+            mode="script",
+            test_filename=f"test_{delay}.py",
+            command=["python", "-c", f"import time; time.sleep({delay}); print({delay})"],
+            working_directory=str(tmp_path),  # no requirements.txt to install before running
+        )
+        for delay in (0.5, 0.1)
+    ]
+    results = [(i, rsp) async for i, rsp in RunCode.run_many(i_contexts, context=context)]
+    assert [i.test_filename for i, _ in results] == ["test_0.1.py", "test_0.5.py"]
+    assert [rsp.stdout.strip() for _, rsp in results] == ["0.1", "0.5"]
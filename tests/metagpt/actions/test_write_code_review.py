@@ -5,6 +5,8 @@
 @Author  : alexanderwu
 @File    : test_write_code_review.py
 """
+import json
+
 import pytest
 
 from metagpt.actions.write_code_review import WriteCodeReview
@@ -55,5 +57,35 @@ async def test_write_code_review_inc(capfd, context):
     await WriteCodeReview(i_context=coding_context, context=context).run()
 
 
+@pytest.mark.asyncio
+async def test_write_code_review_refetch_codes(context, mocker):
+    context.src_workspace = context.repo.workdir / "srcs"
+    context.config.code_review_k_times = 2
+    srcs = context.repo.with_src_path(context.src_workspace).srcs
+    await srcs.save("a.py", content="A = 1")
+    coding_context = CodingContext(
+        filename="math.py",
+        design_doc=Document(content="{}"),
+        task_doc=Document(filename="1.json", content=json.dumps({"Task list": ["a.py", "b.py", "math.py"]})),
+        code_doc=Document(filename="math.py", content="def add(a, b):\n    return a +"),
+    )
+    prompts = []
+
+    async def review_and_rewrite(context_prompt, cr_prompt, filename):
+        prompts.append(context_prompt)
+        if len(prompts) == 1:
+            await srcs.save("b.py", content="B = 2")  # written by another borg during the review
+            return "LBTM", "def add(a, b):\n    return a + b"
+        return "LGTM", None
+
+    action = WriteCodeReview(i_context=coding_context, context=context)
+    mocker.patch.object(action, "write_code_review_and_rewrite", review_and_rewrite)
+    await action.run()
+
+    assert "----- a.py" in prompts[0] and "----- b.py" not in prompts[0]
+    assert "----- a.py" in prompts[1] and "B = 2" in prompts[1]
+    assert coding_context.code_doc.content == "def add(a, b):\n    return a + b"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-s"])
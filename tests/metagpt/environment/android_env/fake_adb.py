@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : a stand-in of the `adb` executable for the tests, with a device that knows a few shell commands.
+#           The commands it runs are appended to the file of the `FAKE_ADB_LOG` environment variable.
+
+import os
+import shlex
+import sys
+
+XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<hierarchy rotation="0"><node index="0" bounds="[0,0][720,1080]" /></hierarchy>'
+)
+PNG = (  # 2x3 red pixels
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x02\x00\x00\x00\x03\x08\x02\x00\x00\x006\x88I\xd6\x00\x00\x00"
+    b"\x10IDATx\x9cc\xf8\xcf\xc0\x00D\x0c(\x14\x00D\xd0\x05\xfb\xa4\xcf\xde\x80\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+
+def log(cmd: str):
+    if os.environ.get("FAKE_ADB_LOG"):
+        with open(os.environ["FAKE_ADB_LOG"], "a") as f:
+            f.write(cmd + "\n")
+
+
+def run(cmd: str) -> int:
+    """Run a shell command of the fake device, return its exit code"""
+    log(cmd)
+    args = shlex.split(cmd)
+    if args[:2] == ["wm", "size"]:
+        print("Physical size: 720x1080")
+    elif args[:1] in (["input"], ["mkdir"]):
+        pass
+    elif args[:2] == ["uiautomator", "dump"]:
+        print(XML + "UI hierchary dumped to: /dev/tty")
+    elif args[:1] == ["printf"]:
+        print(args[1], end="")  # an output without newline
+    elif args[:1] == ["exit"]:
+        sys.exit(int(args[1]))
+    else:
+        return 127
+    return 0
+
+
+def shell():
+    """Read the commands from stdin like `sh`, with `echo ...$?` and `</dev/null` supported"""
+    code = 0
+    for line in sys.stdin:
+        cmd = line.strip().removesuffix("</dev/null").strip()
+        if cmd.startswith("echo "):
+            print(cmd[len("echo ") :].replace("$?", str(code)))
+        elif cmd:
+            code = run(cmd)
+        sys.stdout.flush()
+
+
+def main(args: list[str]):
+    if args == ["devices"]:
+        print("List of devices attached\nemulator-5554\tdevice")
+        return
+    if args[:2] != ["-s", "emulator-5554"]:
+        print(f"error: device '{args[1]}' not found", file=sys.stderr)
+        sys.exit(1)
+    args = args[2:]
+    if args == ["shell"]:
+        shell()
+    elif args[0] == "shell":
+        sys.exit(run(" ".join(args[1:])))
+    elif args == ["exec-out", "screencap", "-p"]:
+        log("screencap -p")
+        sys.stdout.buffer.write(PNG)
+    else:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
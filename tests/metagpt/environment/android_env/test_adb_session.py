@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : the unittest of AdbSession and the adb of AndroidExtEnv, against a fake adb executable
+
+import shlex
+import sys
+from pathlib import Path
+from threading import Thread
+
+import pytest
+
+from metagpt.environment.android.adb_session import AdbSession
+from metagpt.environment.android.android_ext_env import AndroidExtEnv
+from metagpt.environment.android.const import ADB_EXEC_FAIL
+
+FAKE_ADB = f"{shlex.quote(sys.executable)} {shlex.quote(str(Path(__file__).parent / 'fake_adb.py'))}"
+
+
+@pytest.fixture
+def adb_log(tmp_path, monkeypatch) -> Path:
+    log_path = tmp_path / "adb.log"
+    monkeypatch.setenv("FAKE_ADB_LOG", str(log_path))
+    return log_path
+
+
+def test_adb_session(adb_log):
+    with AdbSession("emulator-5554", adb_path=FAKE_ADB, timeout=10) as session:
+        assert session.shell("wm size") == (0, "Physical size: 720x1080")
+        pid = session._proc.pid
+        assert session.shell("printf no-newline") == (0, "no-newline")
+        assert session.shell("unknown command") == (127, "")
+        assert session.batch(["input tap 1 2", "input swipe 1 2 3 4 400", "wm size"]) == [
+            (0, ""),
+            (0, ""),
+            (0, "Physical size: 720x1080"),
+        ]
+        assert session._proc.pid == pid  # all in the same shell
+
+        # the commands of concurrent callers do not mix up
+        results = {}
+
+        def tap(i: int):
+            results[i] = session.batch([f"input tap {i} {i}", "wm size"])
+
+        threads = [Thread(target=tap, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(result == [(0, ""), (0, "Physical size: 720x1080")] for result in results.values())
+
+        # the shell exits, and is restarted on the next command
+        assert session.shell("exit 1") == (-1, "")
+        assert session.shell("wm size") == (0, "Physical size: 720x1080")
+        assert session._proc.pid != pid
+
+        assert session.exec_out("screencap -p").startswith(b"\x89PNG")
+    assert not session.alive
+    assert adb_log.read_text().splitlines()[:4] == ["wm size", "printf no-newline", "unknown command", "input tap 1 2"]
+
+
+def test_adb_session_device_not_found():
+    session = AdbSession("emulator-0000", adb_path=FAKE_ADB, timeout=10)
+    assert session.shell("wm size") == (-1, "")
+    assert session.exec_out("screencap -p") is None
+
+
+def test_android_ext_env_adb(mocker, tmp_path, adb_log):
+    mocker.patch("metagpt.environment.android.android_ext_env.load_cv_model", return_value=(None, None, None))
+    ext_env = AndroidExtEnv(device_id="emulator-5554", adb_path=FAKE_ADB, screenshot_dir="/sdcard/", xml_dir="/sdcard/")
+    assert ext_env.list_devices() == ["emulator-5554"]
+    assert ext_env.device_shape == (720, 1080)
+
+    image = ext_env.capture_screenshot()
+    assert image.size == (2, 3)
+    ss_path = ext_env.get_screenshot("0_before", tmp_path)
+    assert ss_path == tmp_path / "0_before.png"
+    assert ss_path.read_bytes().startswith(b"\x89PNG")
+
+    xml_path = ext_env.get_xml("0", tmp_path)
+    assert xml_path.read_text().endswith("</hierarchy>")
+
+    assert ext_env.system_tap(10, 20) == ""
+    assert ext_env.user_batch_input(["tap 10 20", "text hello"]) == ["", ""]
+    assert ext_env.execute_adb_batch(["wm size", "unknown"]) == ["Physical size: 720x1080", ADB_EXEC_FAIL]
+    ext_env.close()
+
+    log = adb_log.read_text()
+    assert "input tap 10 20\ninput tap 10 20\ninput text hello\n" in log
+    assert "screencap -p" in log and "pull" not in log
@@ -2,8 +2,6 @@
 # -*- coding: utf-8 -*-
 # @Desc   : the unittest of AndroidExtEnv
 
-from pathlib import Path
-
 from metagpt.environment.android.android_ext_env import AndroidExtEnv
 from metagpt.environment.android.const import ADB_EXEC_FAIL
 
@@ -20,19 +18,19 @@ def mock_list_devices(self) -> str:
     return ["emulator-5554"]
 
 
-def mock_get_screenshot(self, adb_cmd: str) -> str:
-    return "screenshot_xxxx-xx-xx"
+def mock_get_screenshot(self, cmd: str) -> bytes:
+    return b"\x89PNG screenshot_xxxx-xx-xx"
 
 
 def mock_get_xml(self, adb_cmd: str) -> str:
-    return "xml_xxxx-xx-xx"
+    return '<?xml version="1.0" ?><hierarchy rotation="0"></hierarchy>UI hierchary dumped to: /dev/tty'
 
 
 def mock_write_read_operation(self, adb_cmd: str) -> str:
     return "OK"
 
 
-def test_android_ext_env(mocker):
+def test_android_ext_env(mocker, tmp_path):
     device_id = "emulator-5554"
     mocker.patch("metagpt.environment.android.android_ext_env.AndroidExtEnv.execute_adb_with_cmd", mock_device_shape)
     mocker.patch("metagpt.environment.android.android_ext_env.AndroidExtEnv.list_devices", mock_list_devices)
@@ -51,11 +49,15 @@ def test_android_ext_env(mocker):
 
     assert ext_env.list_devices() == [device_id]
 
-    mocker.patch("metagpt.environment.android.android_ext_env.AndroidExtEnv.execute_adb_with_cmd", mock_get_screenshot)
-    assert ext_env.get_screenshot("screenshot_xxxx-xx-xx", "/data/") == Path("/data/screenshot_xxxx-xx-xx.png")
+    mocker.patch("metagpt.environment.android.android_ext_env.AndroidExtEnv.execute_adb_exec_out", mock_get_screenshot)
+    ss_path = ext_env.get_screenshot("screenshot_xxxx-xx-xx", tmp_path)
+    assert ss_path == tmp_path / "screenshot_xxxx-xx-xx.png"
+    assert ss_path.read_bytes() == b"\x89PNG screenshot_xxxx-xx-xx"
 
     mocker.patch("metagpt.environment.android.android_ext_env.AndroidExtEnv.execute_adb_with_cmd", mock_get_xml)
-    assert ext_env.get_xml("xml_xxxx-xx-xx", "/data/") == Path("/data/xml_xxxx-xx-xx.xml")
+    xml_path = ext_env.get_xml("xml_xxxx-xx-xx", tmp_path)
+    assert xml_path == tmp_path / "xml_xxxx-xx-xx.xml"
+    assert xml_path.read_text() == '<?xml version="1.0" ?><hierarchy rotation="0"></hierarchy>'
 
     mocker.patch(
         "metagpt.environment.android.android_ext_env.AndroidExtEnv.execute_adb_with_cmd", mock_write_read_operation
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : the unittest of the spatial helpers of android env
+
+import numpy as np
+
+from metagpt.environment.android.spatial_index import GridIndex, nms_boxes
+
+
+def test_grid_index():
+    index = GridIndex(30)
+    index.add((100, 100))
+    index.add((500, 900))
+    assert len(index) == 2
+    assert index.has_near((121, 121), 30)  # distance 29.7
+    assert not index.has_near((122, 122), 30)  # distance 31.1
+    assert index.has_near((500, 970), 70)  # a radius larger than the cells
+    assert not index.has_near((0, 0), 30)
+
+
+def test_nms_boxes():
+    boxes = [
+        [0, 0, 100, 100],
+        [10, 10, 110, 110],  # iou 0.68 with the first box
+        [200, 200, 300, 300],
+        [250, 200, 350, 300],  # iou 0.33 with the third box
+        [0, 0, 100, 100],
+    ]
+    assert nms_boxes(boxes).tolist() == [0, 2, 3]
+    assert nms_boxes(boxes, iou_threshold=0.3).tolist() == [0, 2]
+    assert nms_boxes([]).tolist() == []
+
+    # the same as the pairwise loop
+    rng = np.random.default_rng(0)
+    xy = rng.integers(0, 500, size=(200, 2))
+    boxes = np.concatenate([xy, xy + rng.integers(1, 100, size=(200, 2))], axis=1)
+    expected = []
+    for i, box in enumerate(boxes):
+        if all(_iou(box, boxes[j]) < 0.5 for j in expected):
+            expected.append(i)
+    assert nms_boxes(boxes).tolist() == expected
+
+
+def _iou(box1, box2) -> float:
+    inter_w = max(0, min(box1[2], box2[2]) - max(box1[0], box2[0]))
+    inter_h = max(0, min(box1[3], box2[3]) - max(box1[1], box2[1]))
+    inter = inter_w * inter_h
+    area1 = (box1[2] - box1[0]) * (box1[3] - box1[1])
+    area2 = (box2[2] - box2[0]) * (box2[3] - box2[1])
+    return inter / (area1 + area2 - inter)
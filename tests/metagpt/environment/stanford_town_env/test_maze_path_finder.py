@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : the unittest of MazePathFinder
+
+from pathlib import Path
+
+from metagpt.environment.stanford_town.maze_path_finder import MazePathFinder
+from metagpt.environment.stanford_town.stanford_town_ext_env import StanfordTownExtEnv
+
+maze_asset_path = (
+    Path(__file__)
+    .absolute()
+    .parent.joinpath("..", "..", "..", "..", "metagpt/ext/stanford_town/static_dirs/assets/the_ville")
+)
+
+# x: 0 1 2 3
+MAZE = [
+    ["0", "0", "0", "0"],  # y: 0
+    ["0", "1", "1", "0"],  # y: 1
+    ["0", "0", "1", "0"],  # y: 2
+]
+
+
+def _is_valid(path, maze, block="1"):
+    steps = zip(path, path[1:])
+    return all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 and maze[b[1]][b[0]] != block for a, b in steps)
+
+
+def test_find_path():
+    finder = MazePathFinder(MAZE, "1")
+    path = finder.find_path((1, 2), (3, 2))
+    assert path[0] == (1, 2) and path[-1] == (3, 2)
+    assert len(path) == 9
+    assert _is_valid(path, MAZE)
+
+    assert finder.find_path([1, 2], [3, 2]) == path  # cached
+    assert finder.find_path((3, 2), (1, 2)) == path[::-1]
+    assert finder.find_path((0, 0), (0, 0)) == [(0, 0)]
+    assert finder.find_path((0, 0), (1, 1)) == [(1, 1)]  # unreachable
+
+
+def test_find_nearest_path():
+    finder = MazePathFinder(MAZE, "1")
+    assert finder.find_nearest_path((0, 2), [(3, 2), (3, 0)]) == [(0, 2), (0, 1), (0, 0), (1, 0), (2, 0), (3, 0)]
+    assert finder.find_nearest_path((0, 2), [(1, 1)]) is None
+    assert finder.find_nearest_path((0, 2), [(0, 2), (3, 0)]) == [(0, 2)]
+
+
+def test_invalidate():
+    maze = [row.copy() for row in MAZE]
+    finder = MazePathFinder(maze, "1")
+    assert len(finder.find_path((0, 0), (3, 0))) == 4
+    maze[0][2] = "1"
+    finder.invalidate()
+    assert finder.find_path((0, 0), (3, 0)) == [(3, 0)]
+
+
+def test_stanford_town_ext_env_find_path():
+    ext_env = StanfordTownExtEnv(maze_asset_path=maze_asset_path)
+    # two tiles of the same area, reachable from each other
+    tiles = sorted(ext_env.address_tiles["the Ville:Oak Hill College:hallway"])
+    start, end = tiles[0], tiles[-1]
+    path = ext_env.find_path(start, end)
+    assert path[0] == start and path[-1] == end
+    assert len(path) > 2  # not the `[end]` of an unreachable end
+    assert _is_valid(path, ext_env.collision_maze, ext_env.collision_block_id)
+
+    nearest = ext_env.find_nearest_path(start, [end, path[len(path) // 2]])
+    assert nearest[-1] == path[len(path) // 2]
+    assert len(nearest) == len(path) // 2 + 1
+
+    ext_env.set_collision(path[1], True)
+    new_path = ext_env.find_path(start, end)
+    assert path[1] not in new_path
+    ext_env.set_collision(path[1], False)
+    assert len(ext_env.find_path(start, end)) == len(path)
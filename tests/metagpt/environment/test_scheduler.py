@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : the unittest of RoleScheduler
+
+import asyncio
+
+import pytest
+
+from metagpt.environment import Environment
+from metagpt.roles import Role
+from metagpt.schema import Message
+
+running_roles = {"now": 0, "max": 0}
+
+
+class RelayRole(Role):
+    """Forward each received message to `forward_to`"""
+
+    forward_to: str = ""
+    runs: int = 0
+
+    async def run(self, with_message=None):
+        self.runs += 1
+        running_roles["now"] += 1
+        running_roles["max"] = max(running_roles["max"], running_roles["now"])
+        await asyncio.sleep(0.01)
+        running_roles["now"] -= 1
+        for msg in self.rc.msg_buffer.pop_all():
+            if self.forward_to:
+                self.rc.env.publish_message(Message(content=msg.content, send_to=self.forward_to))
+
+
+@pytest.mark.asyncio
+async def test_event_driven_run():
+    env = Environment(event_driven=True)
+    alice = RelayRole(name="Alice", profile="A", forward_to="Bob")
+    bob = RelayRole(name="Bob", profile="B")
+    carol = RelayRole(name="Carol", profile="C")
+    env.add_roles([alice, bob, carol])
+    assert env.is_idle
+
+    env.publish_message(Message(content="hello", send_to="Alice"))
+    assert not env.is_idle
+    await env.run()
+    assert (alice.runs, bob.runs, carol.runs) == (1, 0, 0)
+    await env.run()
+    assert (alice.runs, bob.runs, carol.runs) == (1, 1, 0)
+    assert env.is_idle
+
+
+@pytest.mark.asyncio
+async def test_event_driven_max_concurrency():
+    env = Environment(event_driven=True, max_concurrency=1)
+    roles = [RelayRole(name=f"Role{i}", profile=f"P{i}") for i in range(3)]
+    env.add_roles(roles)
+
+    running_roles["max"] = 0
+    env.publish_message(Message(content="hello"))
+    await env.run()
+    assert [role.runs for role in roles] == [1, 1, 1]
+    assert running_roles["max"] == 1
+    assert env.is_idle
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : test the UI element extraction from the dumped uiautomator xml, no device needed
+
+from metagpt.const import TEST_DATA_PATH
+from metagpt.ext.android_assistant.utils.utils import (
+    elem_list_from_xml_tree,
+    extract_elements_from_xml_tree,
+    traverse_xml_tree,
+)
+
+XML_PATH = TEST_DATA_PATH.joinpath("andriod_assistant/ui_dump/contacts.xml")
+
+
+def test_extract_elements_single_pass():
+    clickable_list = []
+    focusable_list = []
+    extract_elements_from_xml_tree(
+        XML_PATH, {"clickable": clickable_list, "focusable": focusable_list}, min_dist=30, add_index=True
+    )
+
+    # the same elements as traversing the tree once per attrib
+    for attrib, elem_list in [("clickable", clickable_list), ("focusable", focusable_list)]:
+        expected = []
+        traverse_xml_tree(XML_PATH, expected, attrib, True)
+        assert elem_list == expected
+
+    clickable_uids = [elem.uid for elem in clickable_list]
+    assert clickable_uids == [
+        "com.android.contacts.id_toolbar_android.widget.ImageButton_126_126_0",
+        "com.android.contacts.id_toolbar_com.android.contacts.id_menu_search_Search_2",
+        "com.android.contacts.id_toolbar_android.widget.ImageView_126_126_Moreoptions_3",
+        "com.android.contacts.id_list_android.view.ViewGroup_1080_147_Alice_0",
+        "com.android.contacts.id_list_android.view.ViewGroup_1080_147_Bob_1",
+        "com.android.contacts.id_list_android.view.ViewGroup_1080_147_Carol_2",
+        "android.widget.FrameLayout_1080_2340_com.android.contacts.id_floating_action_button_Createcontact_2",
+    ]  # the call button is within 30 pixels of the center of its row
+    assert all(elem.attrib == "clickable" for elem in clickable_list)
+    assert len(focusable_list) == 12
+
+
+def test_elem_list_from_xml_tree():
+    elem_list = elem_list_from_xml_tree(XML_PATH, [], 30)
+    assert [elem.attrib for elem in elem_list] == ["clickable"] * 7 + ["focusable"] * 5
+    assert [elem.bbox for elem in elem_list[7:]] == [
+        ((0, 210), (1080, 2148)),  # the list
+        ((200, 250), (700, 320)),  # the names
+        ((200, 397), (700, 467)),
+        ((200, 544), (700, 614)),
+        ((100, 1938), (400, 2106)),  # the settings
+    ]
+
+    # a larger min_dist drops the focusable elements near a clickable one, and useless elements are dropped
+    useless = "com.android.contacts.id_toolbar_com.android.contacts.id_menu_search_Search_2"
+    elem_list = elem_list_from_xml_tree(XML_PATH, [useless], 100)
+    assert useless not in [elem.uid for elem in elem_list]
+    assert [elem.bbox for elem in elem_list if elem.attrib == "focusable"] == [
+        ((0, 210), (1080, 2148)),
+        ((100, 1938), (400, 2106)),
+    ]
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : the unittest of MemoryMatrix and the retrieval on it
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from metagpt.ext.stanford_town.memory.agent_memory import AgentMemory
+from metagpt.ext.stanford_town.memory.memory_matrix import MemoryMatrix
+from metagpt.ext.stanford_town.memory.retrieve import (
+    cos_sim,
+    new_agent_retrieve,
+    normalize_list_floats,
+)
+
+NOW = datetime(2024, 1, 10)
+
+
+def _agent_memory(count: int, dim: int = 8) -> AgentMemory:
+    rng = np.random.default_rng(0)
+    agent_memory = AgentMemory()
+    for i in range(count):
+        add = agent_memory.add_event if i % 3 else agent_memory.add_thought
+        embedding_key = f"memory {i}" if i % 10 else f"memory {i} is idle"
+        embedding_pair = (embedding_key, rng.normal(size=dim).tolist())
+        add(NOW - timedelta(days=i % 7), None, "s", "p", "o", embedding_key, [], i % 10, embedding_pair, [])
+    return agent_memory
+
+
+def test_memory_matrix_sync():
+    agent_memory = _agent_memory(100)
+    matrix = agent_memory.matrix
+    assert len(matrix) == 100
+    assert matrix.embeddings.shape == (100, 8)
+    assert matrix.retrievable.sum() == 90
+
+    agent_memory.add_event(NOW, None, "s", "p", "o", "new memory", [], 1, ("new memory", [0.1] * 8), [])
+    assert agent_memory.matrix is matrix
+    assert len(matrix) == 101
+
+    agent_memory.storage = agent_memory.storage[:10]
+    assert len(agent_memory.matrix) == 10
+
+
+def test_top_k_matches_brute_force():
+    agent_memory = _agent_memory(200)
+    matrix = agent_memory.matrix
+    queries = np.random.default_rng(1).normal(size=(3, 8))
+    top_rows = matrix.top_k(queries, NOW, 0.99, 5)
+
+    rows = [i for i, node in enumerate(agent_memory.storage) if "idle" not in node.embedding_key]
+    for query, result in zip(queries, top_rows):
+        importance = normalize_list_floats([agent_memory.storage[i].poignancy for i in rows], 0, 1)
+        recency = normalize_list_floats([0.99 ** (NOW - agent_memory.storage[i].created).days for i in rows], 0, 1)
+        relevance = normalize_list_floats(
+            [cos_sim(agent_memory.embeddings[agent_memory.storage[i].embedding_key], query) for i in rows], 0, 1
+        )
+        scores = np.array(importance) + np.array(recency) + np.array(relevance)
+        expected = [rows[i] for i in np.argsort(-scores)[:5]]
+        assert list(result) == expected
+
+
+@pytest.mark.asyncio
+async def test_new_agent_retrieve(mocker):
+    agent_memory = _agent_memory(50)
+    embeddings = np.random.default_rng(2).normal(size=(2, 8)).tolist()
+    mocker.patch("metagpt.ext.stanford_town.memory.retrieve.aget_embeddings", mocker.AsyncMock(return_value=embeddings))
+    role = SimpleNamespace(memory=agent_memory, scratch=SimpleNamespace(curr_time=NOW, recency_decay=0.99))
+
+    retrieved = await new_agent_retrieve(role, ["who i love?", "what to do"], 4)
+    assert list(retrieved) == ["who i love?", "what to do"]
+    for nodes in retrieved.values():
+        assert len(nodes) == 4
+        assert all(node.last_accessed == NOW for node in nodes)
+        assert all("idle" not in node.embedding_key for node in nodes)
+
+
+def test_memory_matrix_empty():
+    matrix = MemoryMatrix()
+    assert [len(i) for i in matrix.top_k(np.ones((2, 4)), NOW, 0.99, 3)] == [0, 0]
@@ -55,3 +55,41 @@ def test_memory():
     memory.clear()
     assert memory.count() == 0
     assert len(memory.index) == 0
+
+
+def test_memory_indexes():
+    memory = Memory()
+    message1 = Message(content="write the game snake.py", role="user", sent_from="Alice")
+    message2 = Message(content="review snake.py and game.py", role="assistant", sent_from="Bob")
+    memory.add_batch([message1, message2, message1.model_copy()])
+    assert memory.count() == 2
+    assert message1 in memory
+    assert Message(content="write the game snake.py", role="user") not in memory
+
+    assert memory.get_by_role("assistant") == [message2]
+    assert memory.get_by_sent_from("Alice") == [message1]
+    assert memory.get_by_content("snake.py") == [message1, message2]
+    assert memory.get_by_content("game snake") == [message1]
+    assert memory.get_by_content("ake.p") == [message1, message2]
+    assert memory.get_by_content("view snake.py and ga") == [message2]
+    assert memory.try_remember("snake.py and") == [message2]
+    assert memory.try_remember(" ") == [message1, message2]
+    assert memory.try_remember("tetris") == []
+
+    assert memory.find_news([message1, message2], k=1) == [message1]
+    assert memory.find_news([message1, message2]) == []
+
+    memory.delete(message1)
+    assert memory.get_by_content("snake.py") == [message2]
+    assert memory.get_by_sent_from("Alice") == []
+
+
+def test_memory_index_rebuild():
+    message = Message(content="test message", role="user")
+    memory = Memory(**Memory(storage=[message]).model_dump())
+    assert memory.get_by_role("user") == [message]
+
+    # subclasses may append to the storage directly
+    memory.storage.append(Message(content="another message", role="user"))
+    assert len(memory.get_by_role("user")) == 2
+    assert len(memory.try_remember("another")) == 1
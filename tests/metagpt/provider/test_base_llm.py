@@ -104,3 +104,15 @@ async def test_async_base_llm():
 
     # resp = await base_llm.aask_code([prompt])
     # assert resp == default_resp_cont
+
+
+@pytest.mark.asyncio
+async def test_aclose(mocker):
+    base_llm = MockBaseLLM()
+    base_llm.aclient = mocker.AsyncMock()
+    await base_llm.aclose()
+    base_llm.aclient.close.assert_awaited_once()
+
+    # some providers use a class of their SDK as the client, without close
+    base_llm.aclient = type("AGeneration", (), {})
+    await base_llm.aclose()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : the unittest of the lazy provider loading of LLMProviderRegistry, with an import-time benchmark
+
+import asyncio
+import json
+import subprocess
+import sys
+
+import pytest
+
+from metagpt.configs.llm_config import LLMType
+from metagpt.provider.llm_provider_registry import (
+    LLM_REGISTRY,
+    PROVIDER_MODULES,
+    LLMProviderRegistry,
+)
+
+# the SDKs of the optional providers, none of which should be loaded unless its provider is used
+PROVIDER_SDKS = ["anthropic", "google.generativeai", "zhipuai", "sparkai", "qianfan", "dashscope", "boto3"]
+
+
+def import_time(code: str) -> dict[str, int]:
+    """Run the code with `python -X importtime`, return the cumulative import time in us of each imported module"""
+    res = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    modules = {}
+    for line in res.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def loaded_modules(code: str, names: list[str]) -> set[str]:
+    """Run the code in a fresh interpreter, return the modules of `names` in its `sys.modules`. Unlike
+    `-X importtime`, this sees the modules loaded by `importlib.import_module`."""
+    code += f"\nimport json, sys\nprint(json.dumps([i for i in {names!r} if i in sys.modules]))\n"
+    res = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(json.loads(res.stdout.splitlines()[-1]))
+
+
+def test_provider_modules():
+    assert set(PROVIDER_MODULES) == set(LLMType)
+    for llm_type in [LLMType.OPENAI, LLMType.CLAUDE, LLMType.OLLAMA]:
+        provider = LLM_REGISTRY.get_provider(llm_type)
+        assert provider.__module__ == PROVIDER_MODULES[llm_type]
+
+
+def test_import_provider_without_sdks():
+    modules = import_time("import metagpt.provider")
+    assert "metagpt.provider" in modules
+    assert not [i for i in PROVIDER_SDKS if i in modules]
+    assert not [i for i in modules if i.startswith("metagpt.provider.") and i.endswith("_api")]
+
+
+def test_create_llm_instance_imports_configured_provider():
+    code = (
+        "from metagpt.configs.llm_config import LLMConfig\n"
+        "from metagpt.provider.llm_provider_registry import create_llm_instance\n"
+        "create_llm_instance(LLMConfig(api_type='ollama', model='llama2', base_url='http://localhost:11434/api'))\n"
+    )
+    modules = loaded_modules(code, ["metagpt.provider.ollama_api", "metagpt.provider.anthropic_api", *PROVIDER_SDKS])
+    assert modules == {"metagpt.provider.ollama_api"}
+
+
+@pytest.mark.asyncio
+async def test_aclose_failure(mocker):
+    registry = LLMProviderRegistry()
+    failing, closing = mocker.AsyncMock(), mocker.AsyncMock()
+    failing.aclose.side_effect = ValueError("no close")
+    loop = asyncio.get_running_loop()
+    registry.instances = {(loop, "failing"): failing, (loop, "closing"): closing}
+
+    await registry.aclose()  # a failure is logged, without aborting the closing of the others
+    closing.aclose.assert_awaited_once()
+    assert not registry.instances
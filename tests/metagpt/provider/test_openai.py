@@ -104,6 +104,13 @@ class TestOpenAI:
         kwargs = instance._make_client_kwargs()
         assert "http_client" in kwargs
 
+    def test_make_client_kwargs_with_pool_limits(self):
+        config = mock_llm_config.model_copy(update={"max_connections": 8, "max_keepalive_connections": 4})
+        instance = OpenAILLM(config)
+        kwargs = instance._make_client_kwargs()
+        assert "http_client" in kwargs
+        assert instance._get_pool_params()["limits"].max_connections == 8
+
     def test_get_choice_function_arguments_for_aask_code(self, tool_calls_rsp):
         instance = OpenAILLM(mock_llm_config_proxy)
         for i, rsp in enumerate(tool_calls_rsp):
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : unittest of rate_limiter
+
+import asyncio
+
+import pytest
+
+from metagpt.provider.llm_provider_registry import RATE_LIMITED_METHODS
+from metagpt.provider.openai_api import OpenAILLM
+from metagpt.provider.rate_limiter import (
+    LLMPriority,
+    PrioritySemaphore,
+    RateLimiter,
+    TokenBucket,
+    get_rate_limiter,
+    get_retry_after,
+    llm_priority,
+    rate_limited,
+    set_global_max_concurrency,
+)
+from tests.metagpt.provider.mock_llm_config import mock_llm_config
+from tests.metagpt.provider.test_base_llm import MockBaseLLM
+
+
+class MockRateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, headers: dict = None):
+        super().__init__("rate limited")
+        self.response = type("Response", (), {"headers": headers or {}})()
+
+
+def test_token_bucket():
+    bucket = TokenBucket(capacity=60)
+    assert bucket.wait_time(60) == 0
+    bucket.consume(60)
+    assert bucket.wait_time(30) == pytest.approx(30, abs=0.1)
+    assert bucket.wait_time(600) == pytest.approx(60, abs=0.1)
+
+
+def test_get_retry_after():
+    assert get_retry_after(ValueError(), 0) is None
+    assert get_retry_after(MockRateLimitError({"retry-after": "2"}), 0) == 2
+    assert get_retry_after(MockRateLimitError({"retry-after-ms": "500"}), 0) == 0.5
+    assert 1 <= get_retry_after(MockRateLimitError(), 0) < 2
+
+
+@pytest.mark.asyncio
+async def test_priority_semaphore():
+    semaphore = PrioritySemaphore(1)
+    order = []
+
+    async def worker(name, priority):
+        async with semaphore.hold(priority):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    await semaphore.acquire()
+    tasks = [
+        asyncio.create_task(worker("low", LLMPriority.LOW)),
+        asyncio.create_task(worker("normal", LLMPriority.NORMAL)),
+        asyncio.create_task(worker("high", LLMPriority.HIGH)),
+    ]
+    await asyncio.sleep(0)
+    semaphore.release()
+    await asyncio.gather(*tasks)
+    assert order == ["high", "normal", "low"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_max_concurrency():
+    limiter = RateLimiter(max_concurrency=2)
+    in_flight, max_in_flight = 0, 0
+
+    async def request():
+        nonlocal in_flight, max_in_flight
+        async with limiter.limit(tokens=10):
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*[request() for _ in range(6)])
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_retry(mocker):
+    config = mock_llm_config.model_copy(update={"model": "gpt-4-turbo", "rpm": 600, "rate_limit_max_retries": 2})
+    assert get_rate_limiter(config) is get_rate_limiter(config.model_copy())
+    assert get_rate_limiter(mock_llm_config) is None
+
+    acompletion_text = mocker.AsyncMock(side_effect=[MockRateLimitError({"retry-after": "0.01"}), "ok"])
+    llm = MockBaseLLM(config)
+    with llm_priority(LLMPriority.HIGH):
+        rsp = await rate_limited(acompletion_text)(llm, [{"role": "user", "content": "hello"}])
+    assert rsp == "ok"
+    assert acompletion_text.await_count == 2
+
+    acompletion_text = mocker.AsyncMock(side_effect=MockRateLimitError({"retry-after": "0.01"}))
+    with pytest.raises(MockRateLimitError):
+        await rate_limited(acompletion_text)(llm, [{"role": "user", "content": "hello"}])
+    assert acompletion_text.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_global_max_concurrency():
+    set_global_max_concurrency(2)
+    try:
+        limiters = [RateLimiter(max_concurrency=2), RateLimiter(max_concurrency=2)]  # e.g. two models
+        in_flight, max_in_flight = 0, 0
+
+        async def request(limiter):
+            nonlocal in_flight, max_in_flight
+            async with limiter.limit(tokens=10):
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*[request(limiters[i % 2]) for i in range(8)])
+        assert max_in_flight == 2
+        assert get_rate_limiter(mock_llm_config)  # limited by the global cap only
+    finally:
+        set_global_max_concurrency(0)
+    assert get_rate_limiter(mock_llm_config) is None
+
+
+def test_rate_limited_entry_points():
+    for name in RATE_LIMITED_METHODS:
+        assert getattr(OpenAILLM, name).__rate_limited__
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_nested(mocker):
+    config = mock_llm_config.model_copy(update={"model": "gpt-4-0613", "max_concurrency": 1})
+    llm = MockBaseLLM(config)
+    acompletion = mocker.AsyncMock(return_value="ok")
+    limited_acompletion = rate_limited(acompletion)
+
+    async def acompletion_text(self, messages):
+        return await limited_acompletion(self, messages)
+
+    # limited once by the outermost entry point, not deadlocked on the only in-flight slot
+    rsp = await asyncio.wait_for(rate_limited(acompletion_text)(llm, "hello"), timeout=1)
+    assert rsp == "ok"
+    assert acompletion.await_count == 1
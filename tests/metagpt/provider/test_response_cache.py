@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : unittest of response_cache
+
+import pytest
+
+from metagpt.configs.llm_config import LLMCacheConfig
+from metagpt.provider.response_cache import (
+    LLMCacheMissError,
+    MemoryResponseCacheBackend,
+    ResponseCache,
+    SQLiteResponseCacheBackend,
+)
+from metagpt.utils.cost_manager import CostManager
+from tests.metagpt.provider.mock_llm_config import mock_llm_config
+from tests.metagpt.provider.test_base_llm import MockBaseLLM
+
+messages = [{"role": "user", "content": "hello"}]
+
+
+def test_make_key():
+    key = ResponseCache.make_key("gpt-4", messages, 0.0)
+    assert key == ResponseCache.make_key("gpt-4", [dict(messages[0])], 0.0)
+    assert key != ResponseCache.make_key("gpt-3.5-turbo", messages, 0.0)
+    assert key != ResponseCache.make_key("gpt-4", messages, 0.5)
+    assert key != ResponseCache.make_key("gpt-4", messages, 0.0, tools=[{"type": "function"}])
+
+
+def test_memory_backend_lru_and_ttl(mocker):
+    backend = MemoryResponseCacheBackend(max_size=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    assert backend.get("a") == "1"
+    backend.set("c", "3")
+    assert backend.get("b") is None
+    assert len(backend) == 2
+
+    backend = MemoryResponseCacheBackend(ttl=10)
+    mocker.patch("metagpt.provider.response_cache.time.time", return_value=100)
+    backend.set("a", "1")
+    mocker.patch("metagpt.provider.response_cache.time.time", return_value=111)
+    assert backend.get("a") is None
+
+
+def test_sqlite_backend(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    backend = SQLiteResponseCacheBackend(path=path, max_size=2)
+    backend.set("a", {"language": "python", "code": "print(1)"})
+    backend.set("b", "2")
+    assert backend.get("a") == {"language": "python", "code": "print(1)"}
+    backend.set("c", "3")
+    assert backend.get("b") is None
+    assert len(backend) == 2
+
+    reopened = SQLiteResponseCacheBackend(path=path, max_size=2)
+    assert reopened.get("c") == "3"
+    reopened.clear()
+    assert len(reopened) == 0
+
+
+@pytest.mark.asyncio
+async def test_record_and_replay(mocker):
+    backend = MemoryResponseCacheBackend()
+    cost_manager = CostManager()
+    call = mocker.AsyncMock(return_value="world")
+
+    cache = ResponseCache(LLMCacheConfig(mode="record"), backend=backend)
+    assert await cache.aget_or_call("key", call, cost_manager=cost_manager) == "world"
+    assert await cache.aget_or_call("key", call, cost_manager=cost_manager) == "world"
+    assert call.await_count == 1
+    assert (cost_manager.cache_hits, cost_manager.cache_misses) == (1, 1)
+
+    replay = ResponseCache(LLMCacheConfig(mode="replay"), backend=backend)
+    assert await replay.aget_or_call("key", call) == "world"
+    with pytest.raises(LLMCacheMissError):
+        await replay.aget_or_call("other key", call)
+    assert call.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_llm_with_cache(mocker):
+    config = mock_llm_config.model_copy(update={"cache": LLMCacheConfig(mode="record", max_size=8)})
+    llm = MockBaseLLM(config)
+    llm.cost_manager = CostManager()
+    spy = mocker.spy(llm, "acompletion_text")
+
+    rsp1 = await llm._acompletion_text_with_cache(messages)
+    rsp2 = await llm._acompletion_text_with_cache(messages)
+    assert rsp1 == rsp2
+    assert spy.call_count == 1
+    assert llm.cost_manager.cache_hits == 1
+
+    assert MockBaseLLM(mock_llm_config).response_cache is None
@@ -18,6 +18,7 @@ from metagpt.rag.schema import (
     ElasticsearchRetrieverConfig,
     ElasticsearchStoreConfig,
     FAISSRetrieverConfig,
+    RRFFusionConfig,
 )
 
 
@@ -81,6 +82,24 @@ class TestRetrieverFactory:
 
         assert isinstance(retriever, SimpleHybridRetriever)
 
+    def test_get_retriever_with_fusion_config(self, mocker, mock_nodes, mock_embedding):
+        fusion_config = RRFFusionConfig(top_k=3)
+        mocker.patch("rank_bm25.BM25Okapi.__init__", return_value=None)
+
+        retriever = self.retriever_factory.get_retriever(
+            configs=[FAISSRetrieverConfig(dimensions=1), BM25RetrieverConfig(), fusion_config],
+            nodes=mock_nodes,
+            embed_model=mock_embedding,
+        )
+
+        assert isinstance(retriever, SimpleHybridRetriever)
+        assert len(retriever.retrievers) == 2
+        assert retriever.fusion_config is fusion_config
+
+    def test_get_retriever_with_multiple_fusion_configs(self):
+        with pytest.raises(ValueError):
+            self.retriever_factory.get_retriever(configs=[BM25RetrieverConfig(), RRFFusionConfig(), RRFFusionConfig()])
+
     def test_get_retriever_with_chroma_config(self, mocker, mock_chroma_vector_store, mock_embedding):
         mock_config = ChromaRetrieverConfig(persist_path="/path/to/chroma", collection_name="test_collection")
         mock_chromadb = mocker.patch("metagpt.rag.factories.retriever.chromadb.PersistentClient")
@@ -0,0 +1,67 @@
+import pytest
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from metagpt.rag.retrievers.fusion import fuse
+from metagpt.rag.schema import (
+    BaseFusionConfig,
+    DedupFusionConfig,
+    RRFFusionConfig,
+    WeightedFusionConfig,
+)
+
+
+def nodes_with_scores(*pairs) -> list[NodeWithScore]:
+    return [NodeWithScore(node=TextNode(id_=node_id), score=score) for node_id, score in pairs]
+
+
+class TestFusion:
+    @pytest.fixture
+    def results(self):
+        # a vector retriever with similarities, and a keyword retriever with bm25 scores
+        return [
+            nodes_with_scores(("1", 0.9), ("2", 0.8), ("3", 0.5)),
+            nodes_with_scores(("3", 12.0), ("4", 10.0), ("1", 2.0)),
+        ]
+
+    def test_dedup_by_default(self, results):
+        fused = fuse(results)
+
+        assert [n.node.node_id for n in fused] == ["1", "2", "3", "4"]
+        assert [n.score for n in fused] == [0.9, 0.8, 0.5, 10.0]
+
+    def test_rrf(self, results):
+        fused = fuse(results, RRFFusionConfig(k=1))
+
+        scores = {n.node.node_id: n.score for n in fused}
+        assert scores == pytest.approx({"1": 1 / 2 + 1 / 4, "2": 1 / 3, "3": 1 / 4 + 1 / 2, "4": 1 / 3})
+        # ties kept in the order of the results
+        assert [n.node.node_id for n in fused] == ["1", "3", "2", "4"]
+
+    def test_weighted(self, results):
+        fused = fuse(results, WeightedFusionConfig(weights=[0.3, 0.7]))
+
+        scores = {n.node.node_id: n.score for n in fused}
+        assert scores == pytest.approx({"1": 0.3, "2": 0.3 * 0.75, "3": 0.7, "4": 0.7 * 0.8})
+        assert [n.node.node_id for n in fused] == ["3", "4", "1", "2"]
+
+    def test_weighted_with_equal_scores(self):
+        fused = fuse([nodes_with_scores(("1", 0.5), ("2", 0.5)), []], WeightedFusionConfig())
+
+        assert [n.score for n in fused] == [1.0, 1.0]
+
+    def test_weighted_with_wrong_weights(self, results):
+        with pytest.raises(ValueError):
+            fuse(results, WeightedFusionConfig(weights=[1.0]))
+
+    @pytest.mark.parametrize("config", [DedupFusionConfig(top_k=2), RRFFusionConfig(top_k=2)])
+    def test_top_k(self, results, config):
+        assert len(fuse(results, config)) == 2
+
+    def test_fuse_does_not_change_results(self, results):
+        fuse(results, RRFFusionConfig())
+
+        assert [n.score for n in results[0]] == [0.9, 0.8, 0.5]
+
+    def test_unknown_config(self, results):
+        with pytest.raises(ValueError):
+            fuse(results, BaseFusionConfig())
@@ -1,7 +1,25 @@
+import asyncio
+import threading
+
 import pytest
+from llama_index.core.retrievers import BaseRetriever
 from llama_index.core.schema import NodeWithScore, TextNode
 
 from metagpt.rag.retrievers import SimpleHybridRetriever
+from metagpt.rag.schema import RRFFusionConfig
+
+
+class SyncRetriever(BaseRetriever):
+    """A retriever without async implementation, recording the thread it runs in."""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.thread = None
+        super().__init__()
+
+    def _retrieve(self, query):
+        self.thread = threading.current_thread()
+        return self.nodes
 
 
 class TestSimpleHybridRetriever:
@@ -48,6 +66,62 @@ class TestSimpleHybridRetriever:
         node_scores = {node.node.node_id: node.score for node in results}
         assert node_scores["2"] == 0.95
 
+    @pytest.mark.asyncio
+    async def test_aretrieve_concurrently(self, mocker):
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def first(query, **kwargs):
+            started.set()
+            await release.wait()
+            return [NodeWithScore(node=TextNode(id_="1"), score=1.0)]
+
+        async def second(query, **kwargs):
+            # runs while the first retriever is still waiting
+            await started.wait()
+            release.set()
+            return [NodeWithScore(node=TextNode(id_="2"), score=1.0)]
+
+        mock_retriever1 = mocker.AsyncMock()
+        mock_retriever1.aretrieve.side_effect = first
+        mock_retriever2 = mocker.AsyncMock()
+        mock_retriever2.aretrieve.side_effect = second
+
+        hybrid_retriever = SimpleHybridRetriever(mock_retriever1, mock_retriever2)
+        results = await asyncio.wait_for(hybrid_retriever._aretrieve("test query"), timeout=5)
+
+        assert [node.node.node_id for node in results] == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_aretrieve_sync_retriever_in_thread(self, mock_node):
+        sync_retriever = SyncRetriever([mock_node])
+
+        results = await SimpleHybridRetriever(sync_retriever)._aretrieve("test query")
+
+        assert results == [mock_node]
+        assert sync_retriever.thread is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_aretrieve_with_fusion_config(self, mocker):
+        mock_retriever1 = mocker.AsyncMock()
+        mock_retriever1.aretrieve.return_value = [
+            NodeWithScore(node=TextNode(id_="1"), score=1.0),
+            NodeWithScore(node=TextNode(id_="2"), score=0.9),
+        ]
+        mock_retriever2 = mocker.AsyncMock()
+        mock_retriever2.aretrieve.return_value = [
+            NodeWithScore(node=TextNode(id_="2"), score=12.0),
+            NodeWithScore(node=TextNode(id_="3"), score=8.0),
+        ]
+
+        hybrid_retriever = SimpleHybridRetriever(
+            mock_retriever1, mock_retriever2, fusion_config=RRFFusionConfig(k=60, top_k=2)
+        )
+        results = await hybrid_retriever._aretrieve("test query")
+
+        assert [node.node.node_id for node in results] == ["2", "1"]
+        assert results[0].score == pytest.approx(1 / 62 + 1 / 61)
+
     def test_add_nodes(self, mock_hybrid_retriever: SimpleHybridRetriever, mock_node):
         mock_hybrid_retriever.add_nodes([mock_node])
         mock_hybrid_retriever.retrievers[0].add_nodes.assert_called_once()
@@ -25,6 +25,7 @@ async def test_interpreter(mocker, auto_run):
 @pytest.mark.asyncio
 async def test_interpreter_react_mode(mocker):
     mocker.patch("metagpt.actions.di.execute_nb_code.ExecuteNbCode.run", return_value=("a successful run", True))
+    terminate = mocker.patch("metagpt.actions.di.execute_nb_code.ExecuteNbCode.terminate")
 
     requirement = "Run data analysis on sklearn Wine recognition dataset, include a plot, and train a model to predict wine class (20% as validation), and show validation accuracy."
 
@@ -32,3 +33,4 @@ async def test_interpreter_react_mode(mocker):
     rsp = await di.run(requirement)
     logger.info(rsp)
     assert len(rsp.content) > 0
+    terminate.assert_awaited()  # the kernel is returned to the kernel pool
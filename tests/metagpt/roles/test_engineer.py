@@ -7,6 +7,7 @@
 @Modified By: mashenquan, 2023-11-1. In accordance with Chapter 2.2.1 and 2.2.2 of RFC 116, utilize the new message
         distribution feature for message handling.
 """
+import asyncio
 import json
 from pathlib import Path
 
@@ -16,7 +17,7 @@ from metagpt.actions import WriteCode, WriteTasks
 from metagpt.const import REQUIREMENT_FILENAME, SYSTEM_DESIGN_FILE_REPO, TASK_FILE_REPO
 from metagpt.logs import logger
 from metagpt.roles.engineer import Engineer
-from metagpt.schema import CodingContext, Message
+from metagpt.schema import CodingContext, Document, Message
 from metagpt.utils.common import CodeParser, any_to_name, any_to_str, aread, awrite
 from metagpt.utils.git_repository import ChangeType
 from tests.metagpt.roles.mock import STRS_FOR_PARSING, TASKS, MockMessages
@@ -147,5 +148,114 @@ async def test_new_coding_context(context):
         context.git_repo.delete_repository()
 
 
+@pytest.mark.asyncio
+async def test_new_summarize_actions(context):
+    rqno = "20231221155954.json"
+    await context.repo.docs.system_design.save(rqno, content="{}")
+    await context.repo.docs.task.save(rqno, content="{}", dependencies=[f"{SYSTEM_DESIGN_FILE_REPO}/{rqno}"])
+    context.src_workspace = Path(context.repo.workdir) / "game_2048"
+    srcs = context.repo.with_src_path(context.src_workspace).srcs
+    dependencies = [f"{TASK_FILE_REPO}/{rqno}", f"{SYSTEM_DESIGN_FILE_REPO}/{rqno}"]
+    await srcs.save("game.py", content="", dependencies=dependencies)
+    await srcs.save("main.py", content="", dependencies=dependencies)
+    await srcs.save("utils.py", content="")
+
+    try:
+        engineer = Engineer(context=context)
+        await engineer._new_summarize_actions()
+        summarizations = [engineer.rc.todo] + engineer.summarize_todos
+        contexts = {(i.i_context.design_filename, i.i_context.task_filename): i.i_context for i in summarizations}
+        ctx = contexts[(f"{SYSTEM_DESIGN_FILE_REPO}/{rqno}", f"{TASK_FILE_REPO}/{rqno}")]
+        assert sorted(ctx.codes_filenames) == ["game.py", "main.py"]
+        assert contexts[("", "")].codes_filenames == ["utils.py"]  # depending on no doc
+    finally:
+        context.git_repo.delete_repository()
+
+
+def _new_code_todos(context, task_list: list[str], logic_analysis: list[list[str]]) -> list[WriteCode]:
+    task_doc = Document(
+        root_path=TASK_FILE_REPO,
+        filename="20240101.json",
+        content=json.dumps({"Task list": task_list, "Logic Analysis": logic_analysis}),
+    )
+    design_doc = Document(root_path=SYSTEM_DESIGN_FILE_REPO, filename="20240101.json", content="{}")
+    todos = []
+    for filename in task_list:
+        coding_context = CodingContext(
+            filename=filename,
+            design_doc=design_doc,
+            task_doc=task_doc,
+            code_doc=Document(root_path="src", filename=filename, content=""),
+        )
+        i_context = Document(root_path="src", filename=filename, content=coding_context.model_dump_json())
+        todos.append(WriteCode(i_context=i_context, context=context))
+    return todos
+
+
+def test_build_code_todo_graph(context):
+    todos = _new_code_todos(
+        context,
+        task_list=["knowledge_base.py", "index.py", "ranking.py", "search.py", "main.py"],
+        logic_analysis=[
+            ["knowledge_base.py", "Contains KnowledgeBase class"],
+            ["index.py", "Contains Index class, from knowledge_base import KnowledgeBase"],
+            ["ranking.py", "Contains Ranking class"],
+            ["search.py", "Contains SearchEngine class, from index import Index; import ranking"],
+            ["main.py", "Contains main function, calls SearchEngine in search.py"],
+        ],
+    )
+    graph = Engineer._build_code_todo_graph(todos)
+    assert graph == {
+        "knowledge_base.py": [],
+        "index.py": ["knowledge_base.py"],
+        "ranking.py": [],
+        "search.py": ["index.py", "ranking.py"],
+        "main.py": ["search.py"],
+    }
+
+
+def test_build_code_todo_graph_by_whole_filenames(context):
+    todos = _new_code_todos(
+        context,
+        task_list=["a.py", "data.py", "utils/io.py", "main.py"],
+        logic_analysis=[["main.py", "Loads the records of data.py, with the helpers in utils/io.py."]],
+    )
+    graph = Engineer._build_code_todo_graph(todos)
+    assert graph["main.py"] == ["data.py", "utils/io.py"]
+
+
+@pytest.mark.asyncio
+async def test_act_sp_with_cr_parallel(context, mocker):
+    context.src_workspace = context.git_repo.workdir / "src"
+    todos = _new_code_todos(
+        context,
+        task_list=["a.py", "b.py", "c.py", "main.py"],
+        logic_analysis=[["main.py", "from a import A; from b import B; from c import C"]],
+    )
+    finished, in_flight, max_in_flight = [], 0, 0
+
+    async def mock_write_code(todo, review=False):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        coding_context = CodingContext.loads(todo.i_context.content)
+        coding_context.code_doc.content = f"# {coding_context.filename}"
+        finished.append(coding_context.filename)
+        return coding_context
+
+    engineer = Engineer(context=context, n_borg=2)
+    engineer.code_todos = todos
+    mocker.patch.object(engineer, "_write_code", mock_write_code)
+    changed_files = await engineer._act_sp_with_cr()
+
+    assert changed_files == {"a.py", "b.py", "c.py", "main.py"}
+    assert max_in_flight == 2
+    assert finished[-1] == "main.py"
+    assert [i.instruct_content.filename for i in engineer.rc.memory.get()] == ["a.py", "b.py", "c.py", "main.py"]
+    assert len(engineer.project_repo.srcs.all_files) == 4
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-s"])
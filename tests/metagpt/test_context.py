@@ -5,8 +5,14 @@
 @Author  : alexanderwu
 @File    : test_context.py
 """
+import asyncio
+
+import pytest
+
 from metagpt.configs.llm_config import LLMType
 from metagpt.context import AttrDict, Context
+from metagpt.provider.llm_provider_registry import LLM_REGISTRY
+from metagpt.utils.cost_manager import FireworksCostManager
 
 
 def test_attr_dict_1():
@@ -71,3 +77,51 @@ def test_context_3():
     # assert ctx.llm() is not None
     # assert "gpt" in ctx.llm().model
     pass
+
+
+def test_context_llm_shared_client():
+    ctx = Context()
+    llm1 = ctx.llm()
+    llm2 = ctx.llm_with_cost_manager_from_llm_config(ctx.config.llm)
+    assert llm1 is not llm2
+    assert llm1.aclient is llm2.aclient
+    assert llm1.config is not llm2.config
+
+    other_config = ctx.config.llm.model_copy(update={"model": "gpt-4-turbo"})
+    llm3 = ctx.llm_with_cost_manager_from_llm_config(other_config)
+    assert llm3.aclient is not llm1.aclient
+
+
+def test_context_llm_cost_attribution():
+    ctx = Context()
+    config = ctx.config.llm.model_copy(update={"api_type": LLMType.FIREWORKS})
+    llm1 = ctx.llm_with_cost_manager_from_llm_config(config)
+    llm2 = ctx.llm_with_cost_manager_from_llm_config(config)
+    assert llm1.aclient is llm2.aclient
+    assert isinstance(llm1.cost_manager, FireworksCostManager)
+    assert llm1.cost_manager is not llm2.cost_manager
+
+    llm1.cost_manager.update_cost(10, 10, "accounts/fireworks/models/llama-v2-13b-chat")
+    assert llm2.cost_manager.total_prompt_tokens == 0
+
+
+@pytest.mark.asyncio
+async def test_context_llm_aclose():
+    ctx = Context()
+    llm1 = ctx.llm()
+    await LLM_REGISTRY.aclose()
+    assert llm1.aclient.is_closed()
+    assert not LLM_REGISTRY.instances
+
+    llm2 = ctx.llm()
+    assert llm2.aclient is not llm1.aclient
+
+
+def test_context_llm_per_event_loop():
+    async def llm():
+        return Context().llm()
+
+    # the client of a loop is not reused by the next one, in which it could not work
+    llm1 = asyncio.run(llm())
+    llm2 = asyncio.run(llm())
+    assert llm1.aclient is not llm2.aclient
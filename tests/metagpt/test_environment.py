@@ -41,6 +41,45 @@ def test_get_roles(env: Environment):
     assert roles == {role1.profile: role1, role2.profile: role2}
 
 
+def test_publish_message_routing(env: Environment):
+    role1 = Role(name="Alice", profile="product manager")
+    role2 = Role(name="Bob", profile="engineer")
+    env.add_roles([role1, role2])
+
+    env.publish_message(Message(content="to Alice", send_to="Alice"))
+    assert [i.content for i in role1.rc.msg_buffer.pop_all()] == ["to Alice"]
+    assert role2.rc.msg_buffer.empty()
+
+    env.publish_message(Message(content="to all"))
+    assert len(role1.rc.msg_buffer.pop_all()) == len(role2.rc.msg_buffer.pop_all()) == 1
+
+    role2.set_addresses({"Bobby"})
+    env.publish_message(Message(content="to Bob", send_to="Bob"))
+    env.publish_message(Message(content="to Bobby", send_to={"Bobby", "Alice"}))
+    assert [i.content for i in role2.rc.msg_buffer.pop_all()] == ["to Bobby"]
+    assert [i.content for i in role1.rc.msg_buffer.pop_all()] == ["to Bobby"]
+
+
+def test_history_maxlen():
+    env = Environment(history_maxlen=2)
+    for i in range(3):
+        env.publish_message(Message(content=f"message {i}"))
+    assert [i.content for i in env.history_messages] == ["message 1", "message 2"]
+    assert env.history == "\nuser: message 1\nuser: message 2"
+
+    new_env = Environment(**env.model_dump())
+    assert new_env.history == env.history
+
+
+def test_add_listener(env: Environment):
+    env.add_role(Role(name="Alice", profile="product manager"))
+    messages = []
+    env.add_listener(messages.append)
+    env.publish_message(Message(content="to Alice", send_to="Alice"))
+    env.publish_message(Message(content="to nobody", send_to="Nobody"))
+    assert [i.content for i in messages] == ["to Alice", "to nobody"]
+
+
 @pytest.mark.asyncio
 async def test_publish_and_process_message(env: Environment):
     if env.context.git_repo:
@@ -1,9 +1,16 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import asyncio
+
 import pytest
 
 from metagpt.tools import web_browser_engine_playwright
+from metagpt.tools.web_browser_pool import (
+    BrowserPool,
+    close_browser_pool,
+    get_browser_pool,
+)
 from metagpt.utils.parse_html import WebPage
 
 
@@ -48,5 +55,51 @@ async def test_scrape_web_page(browser_type, use_proxy, kwagrs, proxy, capfd, ht
     await server.stop()
 
 
+@pytest.mark.asyncio
+async def test_scrape_web_page_pooled(http_server):
+    server, url = await http_server()
+    async with BrowserPool(max_pages=2, warm_contexts=1) as pool:
+        browser = web_browser_engine_playwright.PlaywrightWrapper(pool=pool)
+        await browser.run(url)
+        results = await browser.run(url, url, url)
+        assert all(("MetaGPT" in i.inner_text) for i in results)
+        assert pool.browser_count == 1
+        assert len(pool._contexts) == 1
+        assert all(len(i) <= 1 for i in pool._contexts.values())
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_scrape_web_page_fast_path(mocker, http_server):
+    server, url = await http_server()
+    async with BrowserPool() as pool:
+        browser = web_browser_engine_playwright.PlaywrightWrapper(pool=pool, fast_path=True, fast_path_min_text=1)
+        page = mocker.spy(pool, "page")
+        result = await browser.run(url)
+        assert "MetaGPT" in result.inner_text
+        assert "<h1>MetaGPT</h1>" in result.html
+        page.assert_not_called()
+
+        browser.fast_path_min_text = 1000  # too short, e.g. rendered by javascript
+        result = await browser.run(url)
+        assert "MetaGPT" in result.inner_text
+        page.assert_called_once()
+    await server.stop()
+
+
+def test_default_pool_closed_with_loop():
+    async def main():
+        pool = get_browser_pool()
+        assert get_browser_pool() is pool
+        await close_browser_pool()
+        assert pool.closed
+        assert get_browser_pool() is not pool
+        return get_browser_pool()
+
+    # the pool left open is closed when the loop shuts down, and not shared with the next loop
+    pool = asyncio.run(main())
+    assert pool.closed
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-s"])
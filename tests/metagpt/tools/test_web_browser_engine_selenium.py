@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import asyncio
 
 import browsers
 import pytest
@@ -55,5 +56,44 @@ async def test_scrape_web_page(browser_type, use_proxy, proxy, capfd, http_serve
     await server.stop()
 
 
+@pytest.mark.asyncio
+async def test_reuse_drivers(mocker):
+    drivers = []
+
+    def get_driver():
+        driver = mocker.MagicMock(page_source="<html></html>")
+        driver.execute_script.return_value = "MetaGPT"
+        drivers.append(driver)
+        return driver
+
+    mocker.patch.object(web_browser_engine_selenium, "WebDriverWait")
+    browser = web_browser_engine_selenium.SeleniumWrapper(max_idle_drivers=2)
+    browser.loop = asyncio.get_running_loop()
+    browser._has_run_precheck = True
+    browser._get_driver = get_driver
+
+    for _ in range(3):
+        results = await browser.run("https://a.com", "https://b.com")
+        assert [i.inner_text for i in results] == ["MetaGPT", "MetaGPT"]
+    assert len(drivers) <= 2
+
+    await browser.close()
+    assert all(i.quit.called for i in drivers)
+
+
+def test_quit_drivers_on_loop_shutdown(mocker):
+    driver = mocker.MagicMock(page_source="<html></html>")
+    driver.execute_script.return_value = "MetaGPT"
+    mocker.patch.object(web_browser_engine_selenium, "WebDriverWait")
+    mocker.patch.object(web_browser_engine_selenium, "_gen_get_driver_func", return_value=lambda: driver)
+
+    async def main():
+        await web_browser_engine_selenium.SeleniumWrapper().run("https://a.com")
+        assert not driver.quit.called  # kept idle for the next runs
+
+    asyncio.run(main())
+    driver.quit.assert_called_once()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-s"])
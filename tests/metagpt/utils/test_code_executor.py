@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : unittest of code_executor
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from metagpt.utils.code_executor import CodeExecutor, ExecJob
+
+
+@pytest.mark.asyncio
+async def test_run_timeout_and_output_cap(tmp_path):
+    executor = CodeExecutor(timeout=1, max_output_size=10, venv_root=tmp_path)
+
+    result = await executor.run([sys.executable, "-c", "print('x' * 100)"], cwd=str(tmp_path))
+    assert result.returncode == 0
+    assert result.stdout.startswith("x" * 10)
+    assert "91 bytes truncated" in result.stdout
+
+    start = time.time()
+    # the background child is killed, too
+    result = await executor.run(["bash", "-c", "echo started; sleep 10 & sleep 10"], cwd=str(tmp_path))
+    assert time.time() - start < 5
+    assert result.timed_out
+    assert result.stdout == "started\n"
+
+
+@pytest.mark.asyncio
+async def test_run_many(tmp_path):
+    executor = CodeExecutor(max_workers=2, venv_root=tmp_path)
+    jobs = [
+        ExecJob(command=[sys.executable, "-c", f"import time; time.sleep({delay}); print({delay})"], cwd=str(tmp_path))
+        for delay in (0.6, 0.1, 0.3)
+    ]
+    results = [(job, result) async for job, result in executor.run_many(jobs)]
+    assert [result.stdout.strip() for _, result in results] == ["0.1", "0.3", "0.6"]
+    assert [job for job, _ in results] == [jobs[1], jobs[2], jobs[0]]
+
+
+@pytest.mark.asyncio
+async def test_run_many_cancel_on_error(tmp_path):
+    executor = CodeExecutor(max_workers=2, venv_root=tmp_path)
+    jobs = [
+        ExecJob(command=[sys.executable, "-c", "import time; time.sleep(10)"], cwd=str(tmp_path)),
+        ExecJob(command=[str(tmp_path / "not_found")], cwd=str(tmp_path)),
+    ]
+    start = time.time()
+    with pytest.raises(FileNotFoundError):
+        async for _ in executor.run_many(jobs):
+            pass
+    # the sleeping job is killed instead of running on
+    assert time.time() - start < 5
+
+
+@pytest.mark.asyncio
+async def test_venv_cache(tmp_path, mocker):
+    workdir = tmp_path / "project"
+    workdir.mkdir()
+    (workdir / "requirements.txt").write_text("pytest\n")
+    executor = CodeExecutor(venv_root=tmp_path / "venvs")
+
+    async def mock_check_call(command, cwd, env):
+        if "venv" in command:
+            Path(command[-1]).mkdir(parents=True)
+        return True
+
+    check_call = mocker.patch.object(executor, "_check_call", side_effect=mock_check_call)
+
+    env = await executor.prepare_env(str(workdir), {"PATH": "/usr/bin"})
+    venv = Path(env["VIRTUAL_ENV"])
+    assert env["PATH"].startswith(str(venv / "bin"))
+    assert (venv / ".installed").exists()
+    assert check_call.call_count == 2  # create the venv, then install requirements.txt and pytest
+    assert check_call.call_args_list[1].args[0][-3:] == ["-r", str(workdir / "requirements.txt"), "pytest"]
+
+    await executor.prepare_env(str(workdir), {})
+    assert await CodeExecutor(venv_root=tmp_path / "venvs").get_venv(str(workdir), {}) == venv
+    assert check_call.call_count == 2
+
+    (workdir / "requirements.txt").write_text("pytest\nrequests\n")
+    assert await executor.get_venv(str(workdir), {}) != venv
+    assert check_call.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_venv_not_cached_if_install_failed(tmp_path, mocker):
+    workdir = tmp_path / "project"
+    workdir.mkdir()
+    (workdir / "requirements.txt").write_text("pytest\n")
+    executor = CodeExecutor(venv_root=tmp_path / "venvs")
+    installs = iter([False, True])
+
+    async def mock_check_call(command, cwd, env):
+        if "venv" in command:
+            Path(command[-1]).mkdir(parents=True, exist_ok=True)
+            return True
+        return next(installs)
+
+    check_call = mocker.patch.object(executor, "_check_call", side_effect=mock_check_call)
+
+    venv = await executor.get_venv(str(workdir), {})
+    assert not (venv / ".installed").exists()
+    assert await executor.get_venv(str(workdir), {}) == venv
+    assert (venv / ".installed").exists()
+    assert check_call.call_count == 4  # created and installed again
@@ -6,6 +6,7 @@
 @File    : test_common.py
 @Modified by: mashenquan, 2023/11/21. Add unit tests.
 """
+import asyncio
 import importlib
 import os
 import platform
@@ -28,6 +29,7 @@ from metagpt.utils.common import (
     aread,
     awrite,
     check_cmd_exists,
+    close_on_loop_shutdown,
     concat_namespace,
     import_class_inst,
     parse_recipient,
@@ -215,5 +217,21 @@ class TestGetProjectRoot:
         assert data == content
 
 
+def test_close_on_loop_shutdown():
+    closed = []
+
+    async def main():
+        async def aclose():
+            closed.append(asyncio.get_running_loop())
+
+        close_on_loop_shutdown(aclose)
+        await asyncio.sleep(0)
+        assert not closed
+        return asyncio.get_running_loop()
+
+    loop = asyncio.run(main())
+    assert closed == [loop]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-s"])
@@ -8,6 +8,8 @@
 """
 from __future__ import annotations
 
+import asyncio
+import json
 from pathlib import Path
 from typing import Optional, Set, Union
 
@@ -61,5 +63,48 @@ async def test_dependency_file():
     assert not file.exists
 
 
+@pytest.mark.asyncio
+async def test_dependency_file_write_behind(tmp_path):
+    file = DependencyFile(workdir=tmp_path)
+    async with file.write_behind():
+        await file.update(filename="a.py", dependencies={"docs/task/1.json", "docs/system_design/1.json"})
+        await file.update(filename="b.py", dependencies={"docs/task/1.json"})
+        assert not file.exists
+        assert await file.get("a.py") == {"docs/task/1.json", "docs/system_design/1.json"}
+        assert await file.get_dependents("docs/task/1.json") == {"a.py", "b.py"}
+    assert file.exists
+    assert not list(tmp_path.glob("*.tmp"))
+
+    file2 = DependencyFile(workdir=tmp_path)
+    assert await file2.get_dependents(tmp_path / "docs/task/1.json") == {"a.py", "b.py"}
+    await file2.update(filename="b.py", dependencies=None)
+    assert await file2.get_dependents("docs/task/1.json") == {"a.py"}
+    assert await file.get_dependents("docs/task/1.json") == {"a.py"}  # reloaded as the file changed
+
+
+@pytest.mark.asyncio
+async def test_dependency_file_flush_interval(tmp_path):
+    file = DependencyFile(workdir=tmp_path, flush_interval=0.01)
+    async with file.write_behind():
+        await file.update(filename="a.py", dependencies={"b.py"})
+        assert not file.exists
+        await asyncio.sleep(0.05)
+        assert file.exists
+
+
+@pytest.mark.asyncio
+async def test_dependency_file_concurrent_save(tmp_path, mocker):
+    file = DependencyFile(workdir=tmp_path)
+    to_thread = mocker.spy(asyncio, "to_thread")
+    await asyncio.gather(*[file.update(filename=f"{i}.py", dependencies={"main.py"}) for i in range(10)])
+    assert len([i for i in to_thread.call_args_list if i.args[0] == file._write]) == 10  # off the event loop
+    assert not list(tmp_path.glob("*.tmp"))
+    file._write(json.dumps({"0.py": []}), version=1)  # taken before the last flush but written after it
+    file.flush()
+
+    file2 = DependencyFile(workdir=tmp_path)
+    assert await file2.get_dependents("main.py") == {f"{i}.py" for i in range(10)}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-s"])
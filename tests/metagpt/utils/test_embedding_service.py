@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : unittest of embedding_service
+
+import asyncio
+
+import pytest
+from tenacity import wait_none
+
+from metagpt.configs.embedding_config import EmbeddingConfig
+from metagpt.provider.response_cache import MemoryResponseCacheBackend
+from metagpt.utils import embedding_service
+from metagpt.utils.embedding_service import (
+    EmbeddingService,
+    create_embedding_cache,
+    get_embedding_service,
+)
+
+
+class FakeEmbedder:
+    def __init__(self, failures: int = 0):
+        self.calls = []
+        self.failures = failures
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("rate limited")
+        await asyncio.sleep(0.01)
+        return [[float(len(i)), 1.0] for i in texts]
+
+
+@pytest.mark.asyncio
+async def test_embedding_service_coalesce():
+    embedder = FakeEmbedder()
+    service = EmbeddingService(embedder, model="m", cache=MemoryResponseCacheBackend(), batch_size=4)
+
+    texts = ["a", "bb", "a", "ccc", "dddd", "eeeee"]
+    embeddings = await asyncio.gather(*(service.aembed(i) for i in texts))
+    assert embeddings == [[float(len(i)), 1.0] for i in texts]
+    # 5 distinct texts in 2 calls: one full batch, and the rest after the batch window
+    assert sorted(len(i) for i in embedder.calls) == [1, 4]
+
+    # served from the cache
+    assert await service.aembed_batch(["a", "bb"]) == [[1.0, 1.0], [2.0, 1.0]]
+    assert len(embedder.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_embedding_service_retry_and_error(mocker):
+    mocker.patch.object(EmbeddingService._call.retry, "wait", wait_none())
+    embedder = FakeEmbedder(failures=1)
+    service = EmbeddingService(embedder, model="m")
+    assert await service.aembed("abc") == [3.0, 1.0]
+    assert len(embedder.calls) == 2
+
+    embedder.failures = 3
+    with pytest.raises(ConnectionError):
+        await asyncio.gather(service.aembed("x"), service.aembed("y"))
+    assert not service._pending
+
+
+def test_embedding_cache_sqlite(tmp_path):
+    cache = create_embedding_cache(EmbeddingConfig(cache_backend="sqlite", cache_path=str(tmp_path / "cache.db")))
+    service = EmbeddingService(FakeEmbedder(), model="m", cache=cache)
+    service.set_cached(["hello"], [[0.5, 0.25]])
+
+    # another process, or another model
+    cache = create_embedding_cache(EmbeddingConfig(cache_backend="sqlite", cache_path=str(tmp_path / "cache.db")))
+    assert EmbeddingService(FakeEmbedder(), model="m", cache=cache).get_cached(["hello", "world"]) == [
+        [0.5, 0.25],
+        None,
+    ]
+    assert EmbeddingService(FakeEmbedder(), model="other", cache=cache).get_cached(["hello"]) == [None]
+    assert create_embedding_cache(EmbeddingConfig(cache_backend="off")) is None
+
+
+def test_embedding_cache_packed():
+    cache = MemoryResponseCacheBackend()
+    service = EmbeddingService(FakeEmbedder(), model="m", cache=cache)
+    service.set_cached(["hello"], [[0.1, 0.2]])
+    assert isinstance(cache.get(service.make_key("hello")), str)
+    assert service.get_cached(["hello"]) == [[0.1, 0.2]]
+    assert EmbeddingService(FakeEmbedder(), model="m", cache=cache, dimensions=256).get_cached(["hello"]) == [None]
+
+
+def test_get_embedding_service(mocker):
+    mocker.patch.dict(embedding_service._EMBEDDING_SERVICES, clear=True)
+    embedding_config = EmbeddingConfig(cache_backend="off")
+
+    def get(api_key: str, dimensions: int = None) -> EmbeddingService:
+        return get_embedding_service(
+            "m", FakeEmbedder(), endpoint="e", embedding_config=embedding_config, api_key=api_key, dimensions=dimensions
+        )
+
+    service = get("k1")
+    assert get("k1") is service
+    assert get("k2") is not service
+    assert get("k1", dimensions=256) is not service
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-s"])
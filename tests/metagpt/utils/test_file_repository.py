@@ -11,6 +11,7 @@ from pathlib import Path
 
 import pytest
 
+from metagpt.utils import file_repository as file_repo_module
 from metagpt.utils.git_repository import ChangeType, GitRepository
 from tests.metagpt.utils.test_git_repository import mock_file
 
@@ -41,6 +42,7 @@ async def test_file_repo():
     assert {f"{file_repo_path}/a.txt", f"{file_repo_path}/c.txt"} == await file_repo.get_dependency("b.txt")
     assert {"a.txt": ChangeType.UNTRACTED, "b.txt": ChangeType.UNTRACTED} == file_repo.changed_files
     assert {f"{file_repo_path}/a.txt"} == await file_repo.get_changed_dependency("b.txt")
+    assert {f"{file_repo_path}/b.txt"} == await file_repo.get_dependents("a.txt")
     await file_repo.save("d/e.txt", "EEE")
     assert ["d/e.txt"] == file_repo.get_change_dir_files("d")
     assert set(file_repo.all_files) == {"a.txt", "b.txt", "d/e.txt"}
@@ -53,5 +55,42 @@ async def test_file_repo():
     git_repo.delete_repository()
 
 
+@pytest.mark.asyncio
+async def test_file_repo_get_many(mocker):
+    local_path = Path(__file__).parent / "file_repo_git2"
+    if local_path.exists():
+        shutil.rmtree(local_path)
+    git_repo = GitRepository(local_path=local_path, auto_init=True)
+    file_repo = git_repo.new_file_repository("src")
+    for i in range(5):
+        await file_repo.save(f"{i}.py", f"print({i})")
+
+    docs = await file_repo.get_many(["3.py", "none.py", "1.py"])
+    assert [doc.content if doc else None for doc in docs] == ["print(3)", None, "print(1)"]
+    assert sorted(doc.content for doc in await file_repo.get_all()) == [f"print({i})" for i in range(5)]
+
+    spy = mocker.spy(file_repo_module, "aread")
+    with git_repo.cache_session():
+        await file_repo.get_many(["0.py", "1.py"])
+        await file_repo.get_many(["0.py", "1.py"])
+        assert spy.call_count == 2
+        await mock_file(local_path / "src/1.py", "print(100)")  # changed outside, detected by mtime and size
+        doc = await file_repo.get("1.py")
+        assert doc.content == "print(100)"
+        await file_repo.save("0.py", "print(0, 0)")
+        doc = await file_repo.get("0.py")
+        assert doc.content == "print(0, 0)"
+        assert spy.call_count == 3
+    await file_repo.get("1.py")
+    assert spy.call_count == 4
+
+    file_repo.mmap_min_size = 1
+    await mock_file(local_path / "src/crlf.py", "a\r\nb")
+    doc = await file_repo.get("crlf.py")
+    assert doc.content == "a\nb"
+
+    git_repo.delete_repository()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-s"])
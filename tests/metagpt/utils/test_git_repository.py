@@ -13,7 +13,7 @@ from pathlib import Path
 import pytest
 
 from metagpt.utils.common import awrite
-from metagpt.utils.git_repository import GitRepository
+from metagpt.utils.git_repository import ChangeType, GitRepository
 
 
 async def mock_file(filename, content=""):
@@ -106,6 +106,67 @@ async def test_dependency_file():
     assert not dependancy_file.exists
 
 
+@pytest.mark.asyncio
+async def test_git_cache():
+    local_path = Path(__file__).parent / "git5"
+    repo, subdir = await mock_repo(local_path)
+    ignored = subdir / "x.pyc"
+    await mock_file(ignored)
+
+    with repo.cache_session():
+        assert set(repo.changed_files) == {"a.txt", "b.txt", "subdir/c.txt"}
+        assert set(repo.get_files("subdir")) == {"c.txt"}
+        assert set(repo.get_files("subdir", filter_ignored=False)) == {"c.txt", "x.pyc"}
+
+        await mock_file(subdir / "d.txt")  # changed outside, not seen until invalidated
+        assert "subdir/d.txt" not in repo.changed_files
+        assert set(repo.get_files("subdir")) == {"c.txt"}
+        repo.invalidate_cache()
+        assert "subdir/d.txt" in repo.changed_files
+        assert set(repo.get_files("subdir")) == {"c.txt", "d.txt"}
+
+        file_repo = repo.new_file_repository("subdir")
+        await file_repo.save("e.txt", "E")
+        assert "e.txt" in file_repo.changed_files
+        assert "e.txt" in file_repo.all_files
+        await file_repo.delete("e.txt")
+        assert "e.txt" not in file_repo.all_files
+
+        await mock_file(local_path / ".gitignore", "*.txt")
+        assert repo.get_files("subdir") == ["x.pyc"]
+
+        repo.add_change(repo.changed_files)
+        repo.commit("commit")
+        assert not repo.changed_files
+
+    await mock_file(subdir / "f.md")  # not cached out of sessions
+    assert repo.changed_files == {"subdir/f.md": ChangeType.UNTRACTED}
+
+    repo.delete_repository()
+
+
+@pytest.mark.asyncio
+async def test_git_cache_owners():
+    local_path = Path(__file__).parent / "git6"
+    repo, subdir = await mock_repo(local_path)
+    role_a, role_b = object(), object()
+
+    with repo.cache_session(owner=role_a):
+        assert repo.caching
+        assert "subdir/d.txt" not in repo.changed_files  # cached
+        with repo.cache_session(owner=role_b):
+            assert not repo.caching  # overlapping sessions of different owners
+            await mock_file(subdir / "d.txt")  # written by role_b outside FileRepository
+            assert "subdir/d.txt" in repo.changed_files
+            with repo.cache_session(owner=role_a):
+                assert not repo.caching
+        assert repo.caching
+        assert "subdir/d.txt" in repo.changed_files
+
+    assert not repo.caching
+    repo.delete_repository()
+
+
 @pytest.mark.asyncio
 async def test_git_open():
     local_path = Path(__file__).parent / "git3"
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Desc   : unittest of kernel_pool
+
+import asyncio
+import os
+import signal
+
+import pytest
+
+from metagpt.utils.kernel_pool import KernelPool, get_kernel_pool
+
+
+async def execute(kernel, code: str) -> dict:
+    return await kernel.kc.execute_interactive(code, timeout=30, output_hook=lambda msg: None)
+
+
+@pytest.mark.asyncio
+async def test_kernel_pool_lease_and_reset():
+    async with KernelPool(size=1, max_kernels=2, warmup_code="import json") as pool:
+        assert pool.idle_count == 1
+        kernel = await pool.acquire()
+        assert kernel.leases == 1
+        reply = await execute(kernel, "x = json.dumps(1)")
+        assert reply["content"]["status"] == "ok"
+        await pool.release(kernel)
+        assert pool.idle_count == 1
+
+        # the same kernel is leased again, with the user namespace reset and warmup imports kept in sys.modules
+        kernel_again = await pool.acquire()
+        assert kernel_again is kernel
+        assert kernel.leases == 2
+        reply = await execute(kernel, "x")
+        assert reply["content"]["ename"] == "NameError"
+        await pool.release(kernel)
+
+
+@pytest.mark.asyncio
+async def test_kernel_pool_max_kernels_and_dead_kernel():
+    async with KernelPool(size=0, max_kernels=1, warmup_code="") as pool:
+        kernel = await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0.5)
+        assert not waiter.done()  # the only kernel is leased
+
+        os.kill(kernel.pid, signal.SIGKILL)
+        await pool.release(kernel)  # a dead kernel is shut down instead of being kept
+        new_kernel = await asyncio.wait_for(waiter, timeout=60)
+        assert new_kernel is not kernel
+        assert await pool.is_healthy(new_kernel)
+        await pool.release(new_kernel)
+        assert pool.idle_count == 0
+
+
+@pytest.mark.asyncio
+async def test_kernel_pool_acquire_timeout():
+    async with KernelPool(size=0, max_kernels=1, warmup_code="", acquire_timeout=0.5) as pool:
+        kernel = await pool.acquire()
+        with pytest.raises(TimeoutError):
+            await pool.acquire()  # the only kernel is never released
+        await pool.release(kernel)
+
+
+def test_default_kernel_pool_per_loop():
+    async def default_pool():
+        return get_kernel_pool()
+
+    pool = asyncio.run(default_pool())
+    assert pool.max_kernels is None
+    assert pool.size == 1
+    assert pool.warmup_code
+
+    # the pool of a closed loop is killed when replaced
+    assert asyncio.run(default_pool()) is not pool
+    assert pool._closed
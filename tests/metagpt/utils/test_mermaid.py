@@ -6,10 +6,18 @@
 @File    : test_mermaid.py
 """
 
+import asyncio
+
 import pytest
 
+from metagpt.config2 import config
 from metagpt.utils.common import check_cmd_exists
-from metagpt.utils.mermaid import MMC1, mermaid_to_file
+from metagpt.utils.mermaid import MMC1, MMC2, mermaid_to_file
+from metagpt.utils.mermaid_renderer import (
+    FakeMermaidRenderer,
+    MermaidCache,
+    get_mermaid_renderer,
+)
 
 
 @pytest.mark.asyncio
@@ -34,5 +42,74 @@ async def test_mermaid(engine, context, mermaid_mocker):
             save_to.with_suffix(ext).unlink(missing_ok=True)
 
 
+@pytest.mark.asyncio
+async def test_mermaid_cache(tmp_path, mocker):
+    mocker.patch.object(config.mermaid, "cache", True)
+    mocker.patch.object(config.mermaid, "cache_dir", str(tmp_path / "cache"))
+    renderer = get_mermaid_renderer("fake")
+    render_count = renderer.render_count
+
+    # rendered once to all the formats, then copied from the cache
+    for i in range(2):
+        assert await mermaid_to_file("fake", MMC1, tmp_path / f"out/{i}") == 0
+    assert renderer.render_count == render_count + 1
+    for ext in [".pdf", ".svg", ".png"]:
+        assert (tmp_path / "out/0").with_suffix(ext).read_bytes() == (tmp_path / "out/1").with_suffix(ext).read_bytes()
+
+    # a different diagram or size is rendered again
+    assert await mermaid_to_file("fake", MMC2, tmp_path / "out/2") == 0
+    assert await mermaid_to_file("fake", MMC1, tmp_path / "out/3", width=1024) == 0
+    assert renderer.render_count == render_count + 3
+    assert len(list((tmp_path / "cache").glob("*.svg"))) == 3
+
+    mocker.patch.object(config.mermaid, "cache", False)
+    assert await mermaid_to_file("fake", MMC1, tmp_path / "out/4") == 0
+    assert renderer.render_count == render_count + 4
+
+
+def test_mermaid_cache_key(tmp_path):
+    key = MermaidCache.make_key("playwright", MMC1, 2048, 2048)
+    assert key == MermaidCache.make_key("playwright", MMC1, 2048, 2048, {})
+    assert key != MermaidCache.make_key("pyppeteer", MMC1, 2048, 2048)
+    assert key != MermaidCache.make_key("playwright", MMC1, 2048, 2048, {"puppeteer_config": "p.json"})
+
+    cache = MermaidCache(tmp_path)
+    cache.set(key, {"svg": b"<svg/>", "png": b"png"})
+    assert cache.get(key, ["svg", "png"]) == {"svg": b"<svg/>", "png": b"png"}
+    assert cache.get(key, ["svg", "png", "pdf"]) is None  # all or nothing
+
+
+@pytest.mark.asyncio
+async def test_mermaid_failed_render_not_cached(tmp_path, mocker):
+    mocker.patch.object(config.mermaid, "cache", True)
+    mocker.patch.object(config.mermaid, "cache_dir", str(tmp_path / "cache"))
+    mocker.patch("metagpt.utils.mermaid.check_cmd_exists", return_value=0)
+    mocker.patch("metagpt.utils.mermaid._mmdc", return_value=1)
+    # the outputs of the previous diagram at the same path
+    save_to = tmp_path / "out/0"
+    save_to.parent.mkdir()
+    for ext in [".pdf", ".svg", ".png"]:
+        save_to.with_suffix(ext).write_bytes(b"stale")
+
+    assert await mermaid_to_file("nodejs", MMC1, save_to) == -1
+    assert not any(save_to.with_suffix(ext).exists() for ext in [".pdf", ".svg", ".png"])
+    assert not list((tmp_path / "cache").glob("*"))
+
+
+def test_mermaid_renderer_closed_with_loop(mocker):
+    close = mocker.patch.object(FakeMermaidRenderer, "close")
+
+    async def get_renderer():
+        renderer = get_mermaid_renderer("fake")
+        assert get_mermaid_renderer("fake") is renderer
+        return renderer
+
+    # one renderer per loop, each closed when its loop shuts down
+    first = asyncio.run(get_renderer())
+    assert close.await_count == 1
+    assert asyncio.run(get_renderer()) is not first
+    assert close.await_count == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-s"])
@@ -1,6 +1,7 @@
 import pytest
 
 from metagpt.utils.text import (
+    TokenChunker,
     decode_unicode_escape,
     generate_prompt_chunk,
     reduce_message_length,
@@ -20,7 +21,7 @@ def _paragraphs(n):
 
 
 @pytest.mark.parametrize(
-    "msgs, model, system_text, reserved, expected",
+    "msgs, model_name, system_text, reserved, expected",
     [
         (_msgs(), "gpt-3.5-turbo-0613", "System", 1500, 1),
         (_msgs(), "gpt-3.5-turbo-16k", "System", 3000, 6),
@@ -37,13 +38,13 @@ def test_reduce_message_length(msgs, model_name, system_text, reserved, expected
 
 
 @pytest.mark.parametrize(
-    "text, prompt_template, model, system_text, reserved, expected",
+    "text, prompt_template, model_name, system_text, reserved, expected",
     [
         (" ".join("Hello World." for _ in range(1000)), "Prompt: {}", "gpt-3.5-turbo-0613", "System", 1500, 2),
         (" ".join("Hello World." for _ in range(1000)), "Prompt: {}", "gpt-3.5-turbo-16k", "System", 3000, 1),
         (" ".join("Hello World." for _ in range(4000)), "Prompt: {}", "gpt-4", "System", 2000, 2),
         (" ".join("Hello World." for _ in range(8000)), "Prompt: {}", "gpt-4-32k", "System", 4000, 1),
-        (" ".join("Hello World" for _ in range(8000)), "Prompt: {}", "gpt-3.5-turbo-0613", "System", 1000, 8),
+        (" ".join("Hello World" for _ in range(8000)), "Prompt: {}", "gpt-3.5-turbo-0613", "System", 1000, 6),
     ],
 )
 def test_generate_prompt_chunk(text, prompt_template, model_name, system_text, reserved, expected):
@@ -51,6 +52,34 @@ def test_generate_prompt_chunk(text, prompt_template, model_name, system_text, r
     assert chunk == expected
 
 
+@pytest.mark.parametrize("overlap", [0, 50])
+def test_token_chunker(overlap):
+    chunker = TokenChunker("gpt-3.5-turbo", chunk_size=200, overlap=overlap)
+    text = "\n".join([_paragraphs(10), _paragraphs(300), "Hello World" * 500, _paragraphs(20)])
+    chunks = list(chunker.split(text))
+    assert len(chunks) > 1
+    assert all(chunker.count(i) <= 200 for i in chunks)
+    if not overlap:
+        assert "".join(chunks) == text
+    else:
+        assert sum(len(i) for i in chunks) > len(text)
+
+
+def test_token_chunker_split_file(tmp_path):
+    chunker = TokenChunker("gpt-3.5-turbo", chunk_size=100)
+    text = "\n".join(_paragraphs(i) for i in range(100))
+    path = tmp_path / "text.txt"
+    path.write_text(text)
+    assert list(chunker.split_file(path)) == list(chunker.split(text))
+
+
+def test_token_chunker_invalid():
+    with pytest.raises(ValueError):
+        TokenChunker("gpt-3.5-turbo", chunk_size=0)
+    with pytest.raises(ValueError):
+        TokenChunker("gpt-3.5-turbo", chunk_size=10, overlap=10)
+
+
 @pytest.mark.parametrize(
     "paragraph, sep, count, expected",
     [